@@ -0,0 +1,49 @@
+"""
+Runs the benchmark suite under the SDL dummy drivers.
+
+    python -m benchmarks [--baseline FILE] [--output FILE] [--threshold 0.1] [NAME ...]
+
+The results are written as JSON. With a baseline, the benchmarks whose
+ops/sec dropped, or whose allocations grew, more than the threshold are
+flagged and the exit code is 1.
+"""
+import argparse
+import sys
+from pathlib import Path
+from benchmarks.harness import (RESULTS_PATH, REGRESSION_THRESHOLD, compare,
+    load_results, measure, report, save_results)
+from benchmarks.suite import blur_report, build_benchmarks
+from src.utils.headless import init_headless
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH / "latest.json")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline) if args.baseline else None
+    init_headless()
+    benchmarks = build_benchmarks()
+    results = {}
+    for name, (operation, operations_per_call) in benchmarks.items():
+        if args.names and name not in args.names:
+            continue
+        results[name] = measure(operation, operations_per_call)
+    print(report(results, baseline))
+    if any(name.startswith("blur_") for name in results):
+        print(blur_report())
+    print(f"results: {save_results(results, args.output)}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
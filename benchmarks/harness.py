@@ -0,0 +1,219 @@
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+RESULTS_PATH = Path(__file__).parent / 'results'
+# Minimum seconds spent timing every benchmark
+MIN_TIME = 0.5
+# Operations run under tracemalloc to count the allocations
+ALLOCATION_RUNS = 20
+# Relative loss of ops/sec over which a benchmark is a regression
+REGRESSION_THRESHOLD = 0.1
+# Allocations per operation tolerated over the threshold, so that a
+# benchmark allocating almost nothing is not flagged for one more block
+ALLOCATION_SLACK = 1
+
+
+class AllocationCounter:
+    """
+    Counts the memory blocks allocated while it is installed, even the
+    ones freed right after.
+    sys.getallocatedblocks only gives the blocks alive, so it is sampled
+    at every call, return and bytecode of the traced code and the
+    increases between two samples are summed. The blocks allocated and
+    freed within the same C call cancel out: the count is a lower bound.
+    """
+    def __init__(self):
+        self.allocations = 0
+        self.blocks = 0
+
+    def sample(self, frame, event, arg):
+        """
+        Hook of sys.setprofile and sys.settrace.
+        """
+        if event == "call":
+            frame.f_trace_opcodes = True
+        blocks = sys.getallocatedblocks()
+        if blocks > self.blocks:
+            self.allocations += blocks - self.blocks
+        self.blocks = blocks
+        return self.sample
+
+    def count(self, operation, runs: int) -> int:
+        """
+        Parameters
+        ----------
+        operation: Callable
+            function to run, called without arguments.
+        runs: int
+            number of calls.
+
+        Returns
+        -------
+        int
+            the blocks allocated by the calls.
+        """
+        self.allocations = 0
+        self.blocks = sys.getallocatedblocks()
+        sys.setprofile(self.sample)
+        sys.settrace(self.sample)
+        try:
+            for _ in range(runs):
+                operation()
+        finally:
+            sys.settrace(None)
+            sys.setprofile(None)
+        return self.allocations
+
+
+def measure(operation, operations_per_call: int = 1) -> dict:
+    """
+    Times the operation and counts its allocations.
+
+    Parameters
+    ----------
+    operation: Callable
+        function to benchmark, called without arguments.
+    operations_per_call: int
+        number of operations performed by a single call
+        (e.g. physics ticks).
+
+    Returns
+    -------
+    dict
+        ops_per_sec, allocations (memory blocks allocated by one
+        operation, freed or not) and peak_kib (peak of the traced
+        memory during one operation).
+    """
+    operation()
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0
+    while elapsed < MIN_TIME:
+        operation()
+        calls += 1
+        elapsed = time.perf_counter() - start
+
+    allocations = AllocationCounter().count(operation, ALLOCATION_RUNS)
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    for _ in range(ALLOCATION_RUNS):
+        operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": calls * operations_per_call / elapsed,
+        "allocations": allocations / (ALLOCATION_RUNS * operations_per_call),
+        "peak_kib": (peak - base) / 1024,
+    }
+
+
+def use_default_settings(directory: Path):
+    """
+    Points the settings of the game at a file of the given directory,
+    so that a game built afterwards starts from the default settings
+    (frame rate, vsync, resolution, blur...) whatever the local
+    config/settings.json holds, and never writes over it.
+    To be called before the settings are first loaded.
+
+    Parameters
+    ----------
+    directory: Path
+        directory of the settings file, e.g. a temporary one.
+    """
+    from src.settings import SETTINGS_SERVICE
+    if SETTINGS_SERVICE.settings is not None:
+        raise RuntimeError("the settings are already loaded")
+    SETTINGS_SERVICE.path = directory / "settings.json"
+
+
+def save_results(results: dict, path: Path) -> Path:
+    """
+    Writes the results as JSON.
+
+    Parameters
+    ----------
+    results: dict
+        results of the benchmarks, by name.
+    path: Path
+        file to write.
+
+    Returns
+    -------
+    Path
+        the written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"time": time.time(), "benchmarks": results}, f, indent=2)
+    return path
+
+
+def load_results(path: Path) -> dict:
+    """
+    Parameters
+    ----------
+    path: Path
+        file written by save_results.
+
+    Returns
+    -------
+    dict
+        results of the benchmarks, by name.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)["benchmarks"]
+
+
+def compare(results: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """
+    Compares the results against a baseline.
+
+    Parameters
+    ----------
+    results: dict
+        current results of the benchmarks.
+    baseline: dict
+        previous results of the benchmarks.
+    threshold: float
+        relative loss of ops/sec, or relative increase of the
+        allocations, over which a benchmark regressed.
+
+    Returns
+    -------
+    list[str]
+        names of the benchmarks that regressed, with the metric.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if result["ops_per_sec"] < baseline[name]["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name} (ops/sec)")
+        # results saved before the allocations were counted have none
+        allocations = baseline[name].get("allocations")
+        if allocations is not None and (result["allocations"]
+            > allocations * (1 + threshold) + ALLOCATION_SLACK):
+            regressions.append(f"{name} (allocations)")
+    return regressions
+
+
+def report(results: dict, baseline: dict | None = None) -> str:
+    """
+    Returns
+    -------
+    str
+        a table of the results, with the change against the baseline.
+    """
+    lines = [f"{'benchmark':<24}{'ops/sec':>14}{'allocs':>10}{'peak KiB':>10}{'change':>10}"]
+    for name, result in results.items():
+        change = ""
+        if baseline is not None and name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        lines.append(f"{name:<24}{result['ops_per_sec']:>14.1f}"
+            f"{result['allocations']:>10.1f}{result['peak_kib']:>10.1f}{change:>10}")
+    return "\n".join(lines)
@@ -0,0 +1,296 @@
+"""
+Reports the memory of the game by subsystem, at the start menu, in game,
+at pause and at the end of a game, then checks for leaks across cycles
+of end game, start menu and new game.
+
+    python -m benchmarks.memory [--cycles 5] [--top 8]
+
+The pixels of the surfaces and the samples of the sounds are allocated by
+SDL, out of the sight of tracemalloc: they are attributed to the class of
+the object holding them by walking the objects reachable from the game.
+Surfaces with the same pixels are duplicate loads, a shared load would
+save their bytes. The Python objects are attributed to the module that
+allocated them through tracemalloc snapshots.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from src.utils.headless import ROOT_PATH, init_headless
+
+# Frames run after every change of scene, so the scene reaches its steady state
+SETTLE_FRAMES = 30
+# Frames of a game, long enough for the automatic serve
+GAME_FRAMES = 200
+
+
+class Accounting:
+    """
+    Memory attributed to every class holding surfaces, sounds or fonts.
+    """
+    def __init__(self):
+        self.surfaces = {}
+        self.duplicates = {}
+        self.sounds = {}
+        self.fonts = {}
+        self.pixels = {}
+
+    def add(self, table: dict, owner: str, size: int):
+        count, total = table.get(owner, (0, 0))
+        table[owner] = (count + 1, total + size)
+
+    def total(self, table: dict) -> int:
+        return sum(size for _, size in table.values())
+
+
+def account(roots: list) -> Accounting:
+    """
+    Walks the objects reachable from the roots and attributes every
+    surface, sound and font to the nearest object of the game holding it.
+    An object reached twice is counted once, for its first holder.
+
+    Parameters
+    ----------
+    roots: list
+        pairs (object, name of its holder) where the walk starts.
+
+    Returns
+    -------
+    Accounting
+        the memory by holder.
+    """
+    import pygame
+    accounting = Accounting()
+    seen = set()
+    stack = list(reversed(roots))
+    while stack:
+        obj, owner = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, pygame.Surface):
+            size = obj.get_pitch() * obj.get_height()
+            accounting.add(accounting.surfaces, owner, size)
+            key = (obj.get_size(), pygame.image.tobytes(obj, "RGBA"))
+            if key in accounting.pixels:
+                accounting.add(accounting.duplicates, owner, size)
+            else:
+                accounting.pixels[key] = owner
+        elif isinstance(obj, pygame.mixer.Sound):
+            accounting.add(accounting.sounds, owner, len(obj.get_raw()))
+        elif isinstance(obj, pygame.font.Font):
+            accounting.add(accounting.fonts, owner, 0)
+        elif isinstance(obj, dict):
+            stack.extend((value, owner) for value in obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend((item, owner) for item in obj)
+        elif type(obj).__module__.startswith("src.") and hasattr(obj, "__dict__"):
+            stack.extend((value, type(obj).__name__) for value in vars(obj).values())
+    accounting.pixels.clear()
+    return accounting
+
+
+def resident_kib() -> int:
+    """
+    Returns
+    -------
+    int
+        resident memory of the process in KiB, the peak where the
+        current one is not available.
+    """
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            pages = int(f.read().split()[1])
+        import os
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def python_by_module(snapshot: tracemalloc.Snapshot) -> dict:
+    """
+    Parameters
+    ----------
+    snapshot: tracemalloc.Snapshot
+        snapshot of the Python allocations.
+
+    Returns
+    -------
+    dict
+        bytes allocated by every file of the repository and by every
+        installed package, the standard library together.
+    """
+    root = str(ROOT_PATH)
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, __file__)])
+    modules = {}
+    for stat in snapshot.statistics("filename"):
+        path = Path(stat.traceback[0].filename)
+        if str(path).startswith(root) and "site-packages" not in path.parts:
+            name = str(path.relative_to(root))
+        elif "site-packages" in path.parts:
+            name = path.parts[path.parts.index("site-packages") + 1]
+        else:
+            name = "python"
+        modules[name] = modules.get(name, 0) + stat.size
+    return modules
+
+
+class MemoryReport:
+    """
+    Drives a headless game through its scenes and takes the snapshots.
+    """
+    def __init__(self, top: int):
+        """
+        Builds the game, tracemalloc has to be started already.
+
+        Parameters
+        ----------
+        top: int
+            number of holders and modules listed for every snapshot.
+        """
+        import pygame
+        import src.entities.ui as ui
+        from src import game_status as status
+        from src.game import Game
+        from src.utils.images import IMAGES
+        from src.utils.surface_pool import SCRATCH
+        self.pygame = pygame
+        self.ui = ui
+        self.status = status
+        self.top = top
+        self.game = Game()
+        self.roots = [(self.game, "Game"), (IMAGES, "load_image"), (SCRATCH, "SurfacePool")]
+
+    def frames(self, count: int):
+        """
+        Runs frames of the game.
+
+        Parameters
+        ----------
+        count: int
+            number of frames.
+        """
+        for _ in range(count):
+            self.game.handle_events()
+            self.game.update()
+            self.game.render()
+
+    def new_game(self):
+        """
+        Goes from the start menu to a game and plays until the serve.
+        """
+        self.game.menu_actions(self.ui.START_GAME)
+        self.frames(SETTLE_FRAMES)
+        self.game.menu_actions(self.ui.GAME_SETTINGS)
+        self.frames(GAME_FRAMES)
+
+    def end_game(self):
+        """
+        Shows the end game menu, as at the end of a match.
+        """
+        self.game.scenes.push(self.status.END_GAME)
+        self.frames(SETTLE_FRAMES)
+
+    def snapshot(self, name: str) -> tuple:
+        """
+        Prints the memory of the current scene.
+
+        Parameters
+        ----------
+        name: str
+            name of the scene.
+
+        Returns
+        -------
+        tuple
+            Python bytes traced and surface bytes, to compare the cycles.
+        """
+        gc.collect()
+        accounting = account(self.roots)
+        modules = python_by_module(tracemalloc.take_snapshot())
+        python_total = sum(modules.values())
+        surfaces_total = accounting.total(accounting.surfaces)
+        print(f"== {name}: resident {resident_kib() / 1024:.1f} MiB"
+            f" - surfaces {surfaces_total / 2**20:.1f} MiB"
+            f" ({accounting.total(accounting.duplicates) / 2**20:.1f} MiB duplicate)"
+            f" - sounds {accounting.total(accounting.sounds) / 2**20:.1f} MiB"
+            f" - fonts {sum(count for count, _ in accounting.fonts.values())}"
+            f" - python {python_total / 2**20:.1f} MiB")
+        print(f"{'holder':<24}{'surfaces':>10}{'KiB':>10}{'dup KiB':>10}{'sounds':>8}{'KiB':>10}{'fonts':>7}")
+        holders = sorted(accounting.surfaces.keys() | accounting.sounds.keys() | accounting.fonts.keys(),
+            key=lambda owner: -(accounting.surfaces.get(owner, (0, 0))[1] + accounting.sounds.get(owner, (0, 0))[1]))
+        for owner in holders[:self.top]:
+            surfaces, surface_bytes = accounting.surfaces.get(owner, (0, 0))
+            sounds, sound_bytes = accounting.sounds.get(owner, (0, 0))
+            print(f"{owner:<24}{surfaces:>10}{surface_bytes / 1024:>10.0f}"
+                f"{accounting.duplicates.get(owner, (0, 0))[1] / 1024:>10.0f}"
+                f"{sounds:>8}{sound_bytes / 1024:>10.0f}{accounting.fonts.get(owner, (0, 0))[0]:>7}")
+        print(f"{'python module':<48}{'KiB':>10}")
+        for module, size in sorted(modules.items(), key=lambda item: -item[1])[:self.top]:
+            print(f"{module:<48}{size / 1024:>10.0f}")
+        return tracemalloc.get_traced_memory()[0], surfaces_total
+
+    def run(self, cycles: int) -> bool:
+        """
+        Takes the snapshots of the scenes, then repeats the cycle
+        end game, start menu, new game and reports the growth.
+
+        Parameters
+        ----------
+        cycles: int
+            number of cycles after the first game.
+
+        Returns
+        -------
+        bool
+            True if the memory grew at every cycle (likely a leak).
+        """
+        self.frames(SETTLE_FRAMES)
+        self.snapshot("start menu")
+        self.new_game()
+        self.snapshot("in game")
+        self.game.menu_actions(self.ui.PAUSE)
+        self.frames(SETTLE_FRAMES)
+        self.snapshot("pause")
+        self.game.menu_actions(self.ui.PAUSE)
+        self.frames(SETTLE_FRAMES)
+        self.end_game()
+        totals = [self.snapshot("end game")]
+
+        print(f"== {cycles} cycles of end game, start menu and new game")
+        for cycle in range(cycles):
+            self.game.menu_actions(self.ui.EXIT_GAME)
+            self.frames(SETTLE_FRAMES)
+            self.new_game()
+            self.end_game()
+            gc.collect()
+            accounting = account(self.roots)
+            python_total = tracemalloc.get_traced_memory()[0]
+            totals.append((python_total, accounting.total(accounting.surfaces)))
+            print(f"cycle {cycle + 1}: python {python_total / 1024:.0f} KiB"
+                f" ({(python_total - totals[-2][0]) / 1024:+.0f})"
+                f" - surfaces {totals[-1][1] / 1024:.0f} KiB"
+                f" ({(totals[-1][1] - totals[-2][1]) / 1024:+.0f})")
+        growths = [after[0] > before[0] for before, after in zip(totals[1:], totals[2:])]
+        leaking = len(growths) > 1 and all(growths)
+        if leaking:
+            print("python memory grew at every cycle: likely a leak")
+        return leaking
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory")
+    parser.add_argument("--cycles", type=int, default=5, help="end game/new game cycles checked for leaks")
+    parser.add_argument("--top", type=int, default=8, help="holders and modules listed per snapshot")
+    args = parser.parse_args()
+    # started before pygame and the game are imported, to trace their modules too
+    tracemalloc.start()
+    init_headless()
+    return 1 if MemoryReport(args.top).run(args.cycles) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Simulates matches with the rally log enabled, then loads the log and
+summarises it, as an analysis of real play would.
+
+    python -m benchmarks.rallies [--steps 200000] [--path DIR]
+
+The environment steps are timed with and without the log, to show what
+the recording costs the frame thread, and the load of the columns is
+timed too. The agent plays random actions against the NPC.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from src.env.pong_env import PongEnv
+from src.utils.rally_log import EVENTS, RallyLog, load_rallies
+
+
+def simulate(steps: int, rally_log: RallyLog | None) -> float:
+    """
+    Runs the environment with random actions.
+
+    Parameters
+    ----------
+    steps: int
+        number of steps.
+    rally_log: RallyLog | None
+        log of the rallies, if any.
+
+    Returns
+    -------
+    float
+        seconds taken by the steps.
+    """
+    env = PongEnv(rally_log=rally_log)
+    env.reset(seed=0)
+    actions = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, terminated, truncated, _ = env.advance(actions.randrange(3))
+        if terminated or truncated:
+            env.reset()
+    return time.perf_counter() - start
+
+
+def summary(rallies: dict, contacts: dict) -> list[str]:
+    """
+    Parameters
+    ----------
+    rallies: dict
+        columns of the rallies table.
+    contacts: dict
+        columns of the contacts table.
+
+    Returns
+    -------
+    list[str]
+        lines of the summary, computed on whole columns.
+    """
+    count = len(rallies["rally"])
+    if count == 0:
+        return ["no rallies"]
+    events = np.bincount(rallies["event"], minlength=len(EVENTS))
+    server_wins = np.mean(rallies["server"] == rallies["scorer"])
+    returns = contacts["player"] != rallies["server"][contacts["rally"]]
+    degrees = np.degrees(np.abs(contacts["direction"]))
+    return [
+        f"rallies: {count} - contacts: {len(contacts['rally'])}",
+        "events: " + " - ".join(f"{name} {n}" for name, n in zip(EVENTS, events)),
+        f"hits per rally: mean {rallies['hits'].mean():.2f} - max {rallies['hits'].max()}",
+        f"frames per rally: p50 {np.percentile(rallies['frames'], 50):.0f}"
+        f" - p95 {np.percentile(rallies['frames'], 95):.0f}",
+        f"points won by the server: {server_wins:.1%}",
+        f"paddle speed at contact: mean |{np.abs(contacts['speed']).mean():.1f}| px/frame",
+        f"return directions: mean {degrees[returns].mean():.1f} deg from the x axis" if returns.any()
+            else "return directions: no returns",
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.rallies")
+    parser.add_argument("--steps", type=int, default=200000, help="environment steps simulated")
+    parser.add_argument("--path", type=Path, help="session directory, a temporary one if not given")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary:
+        path = args.path if args.path is not None else Path(temporary) / "session"
+        baseline = simulate(args.steps, None)
+        rally_log = RallyLog(path)
+        logged = simulate(args.steps, rally_log)
+        start = time.perf_counter()
+        rally_log.close()
+        closed = time.perf_counter() - start
+        start = time.perf_counter()
+        rallies, contacts = load_rallies(path)
+        loaded = time.perf_counter() - start
+        print(f"steps/s without log: {args.steps / baseline:,.0f} - with log: {args.steps / logged:,.0f}")
+        print(f"close (last chunks): {closed * 1000:.1f} ms - load: {loaded * 1000:.1f} ms -> {path}")
+        for line in summary(rallies, contacts):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
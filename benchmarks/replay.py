@@ -0,0 +1,218 @@
+"""
+Drives the game through recorded matches and checks the frame times.
+
+    python -m benchmarks.replay [SCENARIO.json ...]
+
+Every scenario is a JSON file with:
+    - name: name of the scenario
+    - seed: seed of the random generator
+    - budget_ms: maximum p95 and p99 frame times
+    - reaches: statuses the game must go through (optional)
+    - steps: list of steps, each one of
+        {"frames": n}           runs n frames
+        {"menu": action}        performs a menu action (e.g. "Start Game")
+        {"key": name}           presses a key (e.g. "space", "p")
+        {"point": player, "hits": n}
+                                ends the rally with a point for the player
+                                after n hits (1 is an ace)
+        {"until": status, "max_frames": n}
+                                runs frames until the game reaches the status
+The per-frame timeline of every scenario is written as CSV, so that two
+builds can be diffed; it also counts the scratch surfaces allocated so
+far, which stop growing once every transform has run once. The games
+run with the default settings, not the local config/settings.json, so
+the budgets hold on every machine. The exit code is 1 if a budget is
+exceeded or a status is not reached.
+"""
+import csv
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.harness import RESULTS_PATH, use_default_settings
+from src.utils.headless import init_headless
+
+REPLAYS_PATH = Path(__file__).parent / 'replays'
+MAX_FRAMES = 600
+
+
+class Replay:
+    """
+    Replays a scenario over a new headless game.
+    """
+    def __init__(self, scenario: dict):
+        """
+        Initialise the replay, building the game.
+
+        Parameters
+        ----------
+        scenario: dict
+            the scenario to replay.
+        """
+        import pygame
+        from src import game_status as status
+        from src.game import Game
+        from src.utils.surface_pool import SCRATCH
+        self.scratch = SCRATCH
+        self.pygame = pygame
+        self.status = status
+        self.scenario = scenario
+        random.seed(scenario["seed"])
+        self.game = Game()
+        self.timeline = []
+        self.step_index = 0
+
+    def frame(self):
+        """
+        Runs and times a single frame.
+        """
+        start = time.perf_counter()
+        self.game.handle_events()
+        self.game.update()
+        self.game.render()
+        if self.game.gc_control is not None:
+            self.game.gc_control.end_frame(self.game.game_status, self.game.scenes.is_idle_point())
+        elapsed = (time.perf_counter() - start) * 1000
+        self.timeline.append((len(self.timeline), self.step_index,
+            self.game.game_status, elapsed, self.scratch.allocations))
+
+    def press(self, key_name: str):
+        """
+        Posts the pressure of the given key.
+
+        Parameters
+        ----------
+        key_name: str
+            name of the key, as in pygame.key.name.
+        """
+        key = self.pygame.key.key_code(key_name)
+        self.pygame.event.post(self.pygame.event.Event(self.pygame.KEYDOWN, key=key,
+            mod=0, unicode="", scancode=0))
+
+    def point(self, player: int, hits: int):
+        """
+        Ends the rally in progress with a point for the given player.
+
+        Parameters
+        ----------
+        player: int
+            player who scores.
+        hits: int
+            number of hits of the rally.
+        """
+        from src.entities.ball import OUT_STATE
+        playing = self.game.scenes.get(self.status.PLAYING)
+        playing.match.last_hit = player
+        playing.scoreboard.hit_counter = hits
+        playing.ball.state = OUT_STATE
+
+    def run(self) -> list[tuple]:
+        """
+        Replays all the steps of the scenario.
+
+        Returns
+        -------
+        list[tuple]
+            the timeline as (frame, step, status, milliseconds,
+            scratch surfaces allocated).
+        """
+        for self.step_index, step in enumerate(self.scenario["steps"]):
+            if "frames" in step:
+                for _ in range(step["frames"]):
+                    self.frame()
+            elif "menu" in step:
+                self.game.menu_actions(step["menu"])
+                self.frame()
+            elif "key" in step:
+                self.press(step["key"])
+                self.frame()
+            elif "point" in step:
+                self.point(step["point"], step.get("hits", 2))
+                self.frame()
+            elif "until" in step:
+                target = getattr(self.status, step["until"])
+                for _ in range(step.get("max_frames", MAX_FRAMES)):
+                    self.frame()
+                    if self.game.game_status == target:
+                        break
+                else:
+                    raise RuntimeError(f"{self.scenario['name']}: {step['until']} not reached")
+        return self.timeline
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Parameters
+    ----------
+    values: list[float]
+        values to analyse.
+    percent: float
+        percentile to compute, between 0 and 100.
+
+    Returns
+    -------
+    float
+        the nearest-rank percentile of the values.
+    """
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def write_timeline(name: str, timeline: list[tuple]) -> Path:
+    """
+    Writes the timeline of a scenario as CSV.
+
+    Returns
+    -------
+    Path
+        the written file.
+    """
+    RESULTS_PATH.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_PATH / f"timeline_{name}.csv"
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "step", "status", "ms", "surfaces"])
+        writer.writerows((frame, step, status, f"{ms:.3f}", surfaces)
+            for frame, step, status, ms, surfaces in timeline)
+    return path
+
+
+def main() -> int:
+    paths = [Path(arg) for arg in sys.argv[1:]] or sorted(REPLAYS_PATH.glob("*.json"))
+    init_headless()
+    from src import game_status as status_names
+    from src.settings import SETTINGS_SERVICE
+    failed = False
+    with tempfile.TemporaryDirectory() as settings_directory:
+        use_default_settings(Path(settings_directory))
+        for path in paths:
+            with path.open("r", encoding="utf-8") as f:
+                scenario = json.load(f)
+            timeline = Replay(scenario).run()
+            frame_times = [ms for _, _, _, ms, _ in timeline]
+            # the pool is shared by the scenarios, the first one fills it
+            surfaces = timeline[-1][4] - timeline[0][4]
+            p95 = percentile(frame_times, 95)
+            p99 = percentile(frame_times, 99)
+            budget = scenario["budget_ms"]
+            passed = p95 <= budget["p95"] and p99 <= budget["p99"]
+            reached = {status for _, _, status, _, _ in timeline}
+            missed = [name for name in scenario.get("reaches", [])
+                if getattr(status_names, name) not in reached]
+            failed = failed or not passed or bool(missed)
+            result = "ok" if passed else "OVER BUDGET"
+            if missed:
+                result += f" - {', '.join(missed)} not reached"
+            print(f"{scenario['name']:<20} frames: {len(timeline):>5}"
+                f"  p95: {p95:6.2f}/{budget['p95']} ms  p99: {p99:6.2f}/{budget['p99']} ms"
+                f"  new surfaces: {surfaces:>2}  {result}"
+                f"  -> {write_timeline(scenario['name'], timeline)}")
+        # the saves of the settings are written before their directory goes
+        SETTINGS_SERVICE.flush()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
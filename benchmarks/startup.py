@@ -0,0 +1,159 @@
+"""
+Measures the cold start of the game: new interpreters run main() up to
+the first frame under the SDL dummy drivers.
+
+    python -m benchmarks.startup [--runs 5] [--top 12] [--archive dist/pong.pyz]
+
+Every run reports the time of the imports, of the initialisation up to
+the built Game and of the first frame; the process time also counts the
+start and the exit of the interpreter. A last run under -X importtime
+lists the modules imported at startup by cumulative time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from src.utils.headless import ROOT_PATH
+
+# Runs main() with the game loop replaced by a single frame
+CHILD = """
+import sys
+import time
+opened = set()
+sys.addaudithook(lambda event, args: event == "open" and opened.add(args[0]))
+start = time.perf_counter()
+import main
+from src.game import Game
+imported = time.perf_counter()
+built = imported
+def first_frame(game):
+    global built
+    built = time.perf_counter()
+    game.handle_events()
+    game.update()
+    game.render()
+Game.run = first_frame
+main.main()
+end = time.perf_counter()
+print(len(opened), imported - start, built - imported, end - built)
+"""
+
+
+def run_child(importtime: bool = False, archive: Path | None = None) -> subprocess.CompletedProcess:
+    """
+    Starts a new interpreter running the first frame of the game.
+
+    Parameters
+    ----------
+    importtime: bool
+        True to run it under -X importtime.
+    archive: Path | None
+        zipapp to import the game from, the source tree if None.
+
+    Returns
+    -------
+    subprocess.CompletedProcess
+        the finished process, with its output.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+        PYGAME_HIDE_SUPPORT_PROMPT="1")
+    cwd = ROOT_PATH
+    if archive is not None:
+        # away from the source tree, so that only the archive is importable
+        env["PYTHONPATH"] = str(archive.resolve())
+        cwd = archive.resolve().parent
+    options = ["-X", "importtime"] if importtime else []
+    return subprocess.run([sys.executable, *options, "-c", CHILD], cwd=cwd, env=env,
+        capture_output=True, text=True, check=True)
+
+
+def measure(runs: int, archive: Path | None = None) -> dict:
+    """
+    Parameters
+    ----------
+    runs: int
+        number of cold starts.
+    archive: Path | None
+        zipapp to import the game from, the source tree if None.
+
+    Returns
+    -------
+    dict
+        median seconds of every phase over the runs and number of
+        files opened by Python (modules, settings; not the assets
+        opened by SDL).
+    """
+    phases = {"imports": [], "init and Game()": [], "first frame": [], "process": [], "files opened": []}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_child(archive=archive)
+        phases["process"].append(time.perf_counter() - start)
+        opened, imports, init, frame = map(float, result.stdout.split()[-4:])
+        phases["files opened"].append(opened)
+        phases["imports"].append(imports)
+        phases["init and Game()"].append(init)
+        phases["first frame"].append(frame)
+    return {name: median(values) for name, values in phases.items()}
+
+
+def format_value(name: str, value: float) -> str:
+    """
+    Returns
+    -------
+    str
+        the measure, in milliseconds if it is a time.
+    """
+    return f"{value:.0f}" if name == "files opened" else f"{value * 1000:.1f} ms"
+
+
+def import_profile(top: int, archive: Path | None = None) -> list[tuple]:
+    """
+    Parameters
+    ----------
+    top: int
+        number of modules returned.
+    archive: Path | None
+        zipapp to import the game from, the source tree if None.
+
+    Returns
+    -------
+    list[tuple]
+        (cumulative microseconds, self microseconds, module) of the
+        slowest imports, a module counting the ones it imports.
+    """
+    modules = []
+    for line in run_child(True, archive).stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts measured")
+    parser.add_argument("--top", type=int, default=12, help="modules listed by import time")
+    parser.add_argument("--archive", type=Path, help="zipapp compared against the source tree")
+    args = parser.parse_args()
+
+    source = measure(args.runs)
+    if args.archive is None:
+        for name, seconds in source.items():
+            print(f"{name:<24}{format_value(name, seconds):>13}")
+    else:
+        archive = measure(args.runs, args.archive)
+        print(f"{'':<24}{'source':>10}{'archive':>13}")
+        for name, seconds in source.items():
+            print(f"{name:<24}{format_value(name, seconds):>10}{format_value(name, archive[name]):>13}")
+    print(f"{'import':<48}{'cumulative':>12}{'self':>10}")
+    for cumulative, own, name in import_profile(args.top, args.archive):
+        print(f"{name:<48}{cumulative / 1000:>9.1f} ms{own / 1000:>7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# Ticks of physics run by a single call of the physics benchmark
+PHYSICS_TICKS = 100
+# Environments stepped by a single call of the vector environment benchmark
+VECTOR_ENVS = 16
+# Hidden layers of the perceptron and paddles of the batched policy benchmark
+POLICY_HIDDEN = [32, 32]
+POLICY_BATCH = 256
+# Balls of the multi-ball benchmarks
+MULTIBALL_COUNT = 500
+
+
+def build_benchmarks() -> dict:
+    """
+    Builds the benchmarks over a headless game.
+
+    Returns
+    -------
+    dict
+        maps the name of every benchmark to the tuple
+        (operation, operations per call).
+    """
+    import pygame
+    from src import game_status as status
+    from src.game import Game
+    from src.entities.ball import HOLDING_STATE, Ball
+    from src.entities.player import PlayerNPC
+    from src.entities.scoreboard import Digit, MessageEvent, Scoreboard, SCORE
+    from src.env.pong_env import PongEnv
+    from src.env.vector_env import SyncVectorEnv
+    from src.env.pixels import PixelPongEnv
+    from src.ai.policy import FEATURES, DecisionBatch, MLPPolicy, PolicyController
+    from src.ai.lookahead import LookaheadController
+    from src.entities.ball_swarm import BallSwarm
+    from src.utils.blur import blur
+    import numpy as np
+
+    game = Game()
+    surface = pygame.Surface(game.screen.get_size())
+    surface.blit(game.field, (0, 0))
+
+    digit = Digit((0, 0))
+    flip = digit.flip_frames[len(digit.flip_frames) // 2]
+
+    scoreboard = Scoreboard(3, 5, game.settings["field_dimensions"])
+
+    message = MessageEvent((400, 300))
+    message.reset()
+    message.set_visibility(True)
+    message.set_message(SCORE, 0)
+    message.pixel_size = 5
+
+    # the menu scenes keep the backdrop blurred when they were entered
+    start_menu = game.scenes.top()
+    game.scenes.push(status.SETTINGS)
+    settings_scene = game.scenes.top()
+
+    playing = game.scenes.get(status.PLAYING)
+    playing.start({"players": 1, "best_of": 3, "set_points": 5})
+    game.scenes.switch(status.PLAYING)
+
+    def pause_open():
+        # entering the pause menu renders and blurs the match below
+        game.scenes.push(status.PAUSED)
+        game.scenes.pop()
+
+    def physics():
+        for _ in range(PHYSICS_TICKS):
+            if playing.status != status.PLAYING:
+                playing.match.soft_reset()
+                playing.status = status.PLAYING
+            if playing.ball.state == HOLDING_STATE:
+                playing.serve()
+            playing.update()
+
+    env = PongEnv()
+    env.reset(0)
+
+    def env_step():
+        if any(env.advance(1)[1:3]):
+            env.reset()
+
+    vector_env = SyncVectorEnv(VECTOR_ENVS)
+    vector_env.reset(0)
+    vector_actions = [0] * VECTOR_ENVS
+
+    pixel_env = PixelPongEnv()
+    pixel_env.reset(0)
+
+    def pixel_env_step():
+        if any(pixel_env.step(1)[2:4]):
+            pixel_env.reset()
+
+    generator = np.random.default_rng(0)
+    sizes = [FEATURES] + POLICY_HIDDEN + [3]
+    policy = MLPPolicy([generator.normal(size=(sizes[i], sizes[i + 1])) for i in range(len(sizes) - 1)],
+        [np.zeros(size) for size in sizes[1:]])
+    controller = PolicyController(policy)
+    npc = PlayerNPC(True, game.settings["field_dimensions"])
+    batch = DecisionBatch(policy, POLICY_BATCH)
+    for _ in range(POLICY_BATCH):
+        PolicyController(policy, batch)
+
+    # a ball served from the left, halfway towards the NPC
+    lookahead_ball = Ball(game.settings["field_dimensions"], sound_effects=False)
+    lookahead_ball.serve_positioning((400, 200))
+    lookahead_ball.hit((-20, -6))
+    lookahead_npc = PlayerNPC(True, game.settings["field_dimensions"])
+    lookahead = LookaheadController(lookahead_ball, game.settings["field_dimensions"])
+
+    swarm = BallSwarm(MULTIBALL_COUNT, game.settings["field_dimensions"], seed=0)
+    swarm_players = playing.match.players
+
+    return {
+        "digit_split": (lambda: digit.create_split_digit(digit.digits[0], digit.digits[1], flip), 1),
+        "digit_boundary": (lambda: digit.extract_first_boundary(flip), 1),
+        "scoreboard_draw": (lambda: scoreboard.draw(surface), 1),
+        "message_render": (lambda: message.render(surface), 1),
+        "menu_render": (lambda: start_menu.render(surface), 1),
+        "settings_render": (lambda: settings_scene.render(surface), 1),
+        "pause_open": (pause_open, 1),
+        "box_blur": (lambda: pygame.transform.box_blur(surface, 10), 1),
+        "blur_low": (lambda: blur(surface, 10, "low"), 1),
+        "blur_high": (lambda: blur(surface, 10, "high"), 1),
+        "game_render": (game.render, 1),
+        "physics_ticks": (physics, PHYSICS_TICKS),
+        "env_step": (env_step, 1),
+        "vector_env_step": (lambda: vector_env.step(vector_actions), VECTOR_ENVS),
+        "pixel_env_step": (pixel_env_step, 1),
+        "policy_decision": (lambda: controller.decide(npc, (400, 300)), 1),
+        "policy_batch": (batch.flush, POLICY_BATCH),
+        "multiball_update": (lambda: swarm.update(swarm_players), 1),
+        "multiball_draw": (lambda: swarm.draw(surface), 1),
+        "lookahead_decision": (lambda: lookahead.decide(lookahead_npc, lookahead_ball.rect.center), 1),
+    }
+
+
+def blur_report(radius: int = 10) -> str:
+    """
+    Compares the output of the blur presets with box_blur over the field.
+
+    Parameters
+    ----------
+    radius: int
+        radius of the blurs.
+
+    Returns
+    -------
+    str
+        the mean absolute difference of every preset, from 0 to 255.
+    """
+    import pygame
+    from src.utils.assets import asset
+    from src.utils.blur import BLUR_PRESETS, blur_difference
+
+    field = pygame.image.load(asset('assets/graphics/field.png')).convert()
+    lines = [f"{'blur preset':<24}{'difference':>14}"]
+    for preset, factor in BLUR_PRESETS.items():
+        if factor is not None:
+            lines.append(f"{preset:<24}{blur_difference(field, radius, preset):>14.2f}")
+    return "\n".join(lines)
@@ -1,9 +1,9 @@
-import pygame
 from src.game import Game
+from src.utils.startup import init_pygame
 
 
 def main():
-    pygame.init()
+    init_pygame()
     game = Game()
     game.run()
     #pygame.quit()
@@ -0,0 +1,93 @@
+"""
+Packs the game in a single zipapp, for machines where the game starts
+from slow storage.
+
+    python make_zipapp.py [--output dist/pong.pyz]
+    python dist/pong.pyz
+
+The archive holds the bytecode of the game, compiled for the Python
+running this script (the same version must run the archive), and the
+assets. The game reads the assets from the archive without extracting
+them; config/settings.json is kept next to the archive.
+"""
+import argparse
+import importlib.util
+import marshal
+import time
+import zipfile
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).parent
+OUTPUT_PATH = ROOT_PATH / 'dist' / 'pong.pyz'
+# Runs the game when the archive is executed
+MAIN_SOURCE = "from main import main\nmain()\n"
+INTERPRETER = "/usr/bin/env python3"
+
+
+def bytecode(source: str, filename: str) -> bytes:
+    """
+    Compiles a module to the content of its .pyc file.
+    The modules are imported from the archive without their sources,
+    so the header holds no timestamp to check.
+
+    Parameters
+    ----------
+    source: str
+        source of the module.
+    filename: str
+        name of the module file shown in the tracebacks.
+
+    Returns
+    -------
+    bytes
+        the .pyc file.
+    """
+    code = compile(source, filename, "exec", dont_inherit=True)
+    # flags 0b01: hash based pyc, not checked against a source
+    header = importlib.util.MAGIC_NUMBER + (1).to_bytes(4, "little") + bytes(8)
+    return header + marshal.dumps(code)
+
+
+def build(output: Path) -> Path:
+    """
+    Writes the zipapp.
+
+    Parameters
+    ----------
+    output: Path
+        path of the archive.
+
+    Returns
+    -------
+    Path
+        the written archive.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("wb") as f:
+        f.write(f"#!{INTERPRETER}\n".encode())
+        with zipfile.ZipFile(f, "w") as archive:
+            archive.writestr("__main__.pyc", bytecode(MAIN_SOURCE, "__main__.py"), zipfile.ZIP_DEFLATED)
+            sources = [ROOT_PATH / 'main.py'] + sorted((ROOT_PATH / 'src').rglob('*.py'))
+            for path in sources:
+                name = path.relative_to(ROOT_PATH).as_posix()
+                archive.writestr(name[:-len(".py")] + ".pyc",
+                    bytecode(path.read_text(encoding="utf-8"), name), zipfile.ZIP_STORED)
+            # images, sounds and fonts are compressed already
+            for path in sorted((ROOT_PATH / 'assets').rglob('*')):
+                if path.is_file():
+                    archive.write(path, path.relative_to(ROOT_PATH).as_posix(), zipfile.ZIP_STORED)
+    output.chmod(0o755)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python make_zipapp.py")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    output = build(args.output)
+    print(f"{output}: {output.stat().st_size / 2**20:.1f} MiB in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import time
+from src.entities.ball import Ball, PLAYING_STATE
+from src.entities.player import Player
+from src.utils.constants import UP, DOWN, STAY
+
+ACTIONS = [STAY, UP, DOWN]
+# Seconds of search allowed in every tick
+SEARCH_BUDGET = 0.002
+BEAM_WIDTH = 6
+# Ticks simulated by every node, with the same action
+ACTION_REPEAT = 4
+MAX_DEPTH = 40
+HIT_VALUE = 10000
+MISS_VALUE = -10000
+
+
+class LookaheadController:
+    """
+    Controls an NPC paddle searching the moves that lead to hit the ball.
+    Every tick it runs a beam search over STAY/UP/DOWN, deepening it one
+    level at a time until the time budget runs out, and plays the first
+    move of the best sequence of the deepest completed level.
+    The future is simulated on a private ball and paddle, restored from
+    cheap snapshots of the real ones, using the same rules of the match.
+    The opponent is not simulated: the search only runs while the ball
+    comes towards the NPC, otherwise it follows the ball.
+    """
+    def __init__(self, ball: Ball, field_dimensions: tuple, budget: float = SEARCH_BUDGET,
+        beam_width: int = BEAM_WIDTH):
+        """
+        Initialise the controller.
+
+        Parameters
+        ----------
+        ball: Ball
+            the ball of the match.
+        field_dimensions: tuple
+            dimension of the playing field.
+        budget: float
+            seconds of search allowed in every tick.
+        beam_width: int
+            number of sequences kept at every level.
+        """
+        self.ball = ball
+        self.field_dimensions = field_dimensions
+        self.budget = budget
+        self.beam_width = beam_width
+        self.sim_ball = Ball(field_dimensions, sound_effects=False)
+        self.sim_ball.serve_positioning((0, 0))
+        self.sim_paddles = {}
+        self.searches = 0
+        self.nodes = 0
+        self.search_time = 0.0
+        self.depth_total = 0
+        self.last_depth = 0
+        self.max_depth = 0
+
+    def decide(self, player, ball_center: tuple) -> str:
+        """
+        Parameters
+        ----------
+        player: PlayerNPC
+            the controlled player.
+        ball_center: tuple
+            the center of the ball.
+
+        Returns
+        -------
+        str
+            UP, DOWN or STAY.
+        """
+        ball_vector = self.ball.get_ball_vector()
+        approaching = ball_vector[0] > 0 if player.is_player2 else ball_vector[0] < 0
+        if self.ball.state != PLAYING_STATE or not approaching:
+            return player.follow_ball(ball_center)
+        action = self.search(player)
+        return player.follow_ball(ball_center) if action is None else action
+
+    def search(self, player) -> str | None:
+        """
+        Runs the beam search until the budget runs out.
+
+        Parameters
+        ----------
+        player: PlayerNPC
+            the controlled player.
+
+        Returns
+        -------
+        str | None
+            the best first move, None if not even the
+            first level was completed in time.
+        """
+        start = time.perf_counter()
+        deadline = start + self.budget
+        paddle = self.sim_paddle(player)
+        # (value, first move, (ball state, paddle state), terminal)
+        beam = [(0, None, (self.ball.get_state(), player.get_state()), False)]
+        best = None
+        depth = 0
+        nodes = 0
+        timed_out = False
+        while depth < MAX_DEPTH and not timed_out and not all(entry[3] for entry in beam):
+            candidates = []
+            for entry in beam:
+                if entry[3]:
+                    candidates.append(entry)
+                    continue
+                for action in ACTIONS:
+                    if time.perf_counter() >= deadline:
+                        timed_out = True
+                        break
+                    state, value, terminal = self.simulate(paddle, entry[2], action)
+                    nodes += 1
+                    candidates.append((value, entry[1] or action, state, terminal))
+                if timed_out:
+                    break
+            if not timed_out:
+                # only completed levels are used
+                candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+                beam = candidates[:self.beam_width]
+                best = beam[0][1]
+                depth += 1
+        self.searches += 1
+        self.nodes += nodes
+        self.search_time += time.perf_counter() - start
+        self.last_depth = depth
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        return best
+
+    def sim_paddle(self, player) -> Player:
+        """
+        Parameters
+        ----------
+        player: PlayerNPC
+            the controlled player.
+
+        Returns
+        -------
+        Player
+            the private paddle simulating the player.
+        """
+        if player.is_player2 not in self.sim_paddles:
+            self.sim_paddles[player.is_player2] = Player(player.is_player2,
+                {UP: 0, DOWN: 0}, self.field_dimensions)
+        return self.sim_paddles[player.is_player2]
+
+    def simulate(self, paddle: Player, state: tuple, action: str) -> tuple[tuple, float, bool]:
+        """
+        Simulates ACTION_REPEAT ticks of the rally, moving the paddle
+        like PlayerNPC does during the rally.
+
+        Parameters
+        ----------
+        paddle: Player
+            the private paddle.
+        state: tuple
+            snapshots of the ball and of the paddle.
+        action: str
+            UP, DOWN or STAY.
+
+        Returns
+        -------
+        tuple[tuple, float, bool]
+            the snapshots after the ticks, the value of the
+            resulting state and True if the rally is decided.
+        """
+        ball = self.sim_ball
+        ball.set_state(state[0])
+        paddle.set_state(state[1])
+        for _ in range(ACTION_REPEAT):
+            if action == DOWN:
+                paddle.speed += 2
+            elif action == UP:
+                paddle.speed -= 2
+            else:
+                paddle.speed = 0
+            paddle.apply_speed()
+            ball.movement()
+            ball.is_over_player(paddle)
+            if ball.state != PLAYING_STATE:
+                return (ball.get_state(), paddle.get_state()), MISS_VALUE, True
+            if ball.is_player_collision(paddle):
+                offset = abs(ball.rect.centery - paddle.rect.centery)
+                return (ball.get_state(), paddle.get_state()), HIT_VALUE - offset, True
+        offset = abs(ball.rect.centery - paddle.rect.centery)
+        return (ball.get_state(), paddle.get_state()), -offset, False
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            nodes per second and depth reached by the searches.
+        """
+        if self.searches == 0:
+            return "lookahead: no searches"
+        return (f"lookahead: {self.searches} searches, "
+            f"{self.nodes / max(self.search_time, 1e-9):.0f} nodes/s, "
+            f"depth mean {self.depth_total / self.searches:.1f} max {self.max_depth}")
@@ -0,0 +1,234 @@
+import numpy as np
+from src.utils.constants import UP, DOWN, STAY
+
+# Decisions of a policy, by index
+ACTIONS = [STAY, UP, DOWN]
+FEATURES = 5
+# Pixels travelled by the ball in a tick at the serve speed
+BALL_SPEED = 10
+
+
+def paddle_features(ball_center: tuple, previous_center: tuple, paddle_center: tuple,
+    is_player2: bool, field_x: tuple, field_y: tuple, out: np.ndarray):
+    """
+    Writes the features seen by a paddle, mirrored so that they
+    do not depend on the side of the paddle:
+        - distance of the ball from the paddle, along x
+        - distance of the ball from the paddle, along y
+        - speed of the ball towards the paddle
+        - vertical speed of the ball
+        - position of the paddle from the center of the field
+
+    Parameters
+    ----------
+    ball_center: tuple
+        current center of the ball.
+    previous_center: tuple
+        center of the ball at the previous tick.
+    paddle_center: tuple
+        center of the paddle.
+    is_player2: bool
+        True if the paddle is on the right side.
+    field_x: tuple
+        horizontal borders of the field.
+    field_y: tuple
+        vertical borders of the field.
+    out: np.ndarray
+        float32 array of FEATURES elements.
+    """
+    side = 1 if is_player2 else -1
+    width = field_x[1] - field_x[0]
+    height = field_y[1] - field_y[0]
+    out[0] = (paddle_center[0] - ball_center[0]) * side / width
+    out[1] = (ball_center[1] - paddle_center[1]) / height
+    out[2] = (ball_center[0] - previous_center[0]) * side / BALL_SPEED
+    out[3] = (ball_center[1] - previous_center[1]) / BALL_SPEED
+    out[4] = (paddle_center[1] - (field_y[0] + field_y[1]) / 2) / height
+
+
+class LookupTablePolicy:
+    """
+    Policy that discretizes the features and reads the
+    action from a table.
+    """
+    def __init__(self, table: np.ndarray, low: np.ndarray, high: np.ndarray):
+        """
+        Initialise the policy.
+
+        Parameters
+        ----------
+        table: np.ndarray
+            index of the action for every cell, with one
+            dimension per feature.
+        low: np.ndarray
+            lower bound of every feature.
+        high: np.ndarray
+            upper bound of every feature.
+        """
+        self.table = table
+        self.low = low.astype(np.float32)
+        self.bins = np.array(table.shape, dtype=np.float32)
+        self.bin_size = (high.astype(np.float32) - self.low) / self.bins
+        self.last_bin = np.array(table.shape) - 1
+
+    def decide(self, features: np.ndarray) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        features: np.ndarray
+            features of N paddles, shaped (N, FEATURES).
+
+        Returns
+        -------
+        np.ndarray
+            index of the action of every paddle.
+        """
+        cells = ((features - self.low) / self.bin_size).astype(np.intp)
+        np.clip(cells, 0, self.last_bin, out=cells)
+        return self.table[tuple(cells.T)]
+
+
+class MLPPolicy:
+    """
+    Policy evaluated by a small multilayer perceptron with ReLU
+    hidden layers, choosing the action with the highest output.
+    """
+    def __init__(self, weights: list[np.ndarray], biases: list[np.ndarray]):
+        """
+        Initialise the policy.
+
+        Parameters
+        ----------
+        weights: list[np.ndarray]
+            weights of every layer, shaped (inputs, outputs).
+        biases: list[np.ndarray]
+            biases of every layer.
+        """
+        self.weights = [weight.astype(np.float32) for weight in weights]
+        self.biases = [bias.astype(np.float32) for bias in biases]
+
+    def decide(self, features: np.ndarray) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        features: np.ndarray
+            features of N paddles, shaped (N, FEATURES).
+
+        Returns
+        -------
+        np.ndarray
+            index of the action of every paddle.
+        """
+        activations = features
+        for weight, bias in zip(self.weights[:-1], self.biases[:-1]):
+            activations = np.maximum(activations @ weight + bias, 0)
+        return np.argmax(activations @ self.weights[-1] + self.biases[-1], axis=1)
+
+
+def load_policy(path: str) -> LookupTablePolicy | MLPPolicy:
+    """
+    Loads a policy saved with numpy.savez.
+    A lookup table is stored with the arrays table, low and high.
+    A perceptron is stored with the arrays W0, b0, W1, b1...
+
+    Parameters
+    ----------
+    path: str
+        path of the .npz file.
+
+    Returns
+    -------
+    LookupTablePolicy | MLPPolicy
+        the loaded policy.
+    """
+    with np.load(path) as data:
+        if "table" in data:
+            return LookupTablePolicy(data["table"], data["low"], data["high"])
+        layers = len([name for name in data.files if name.startswith("W")])
+        return MLPPolicy([data[f"W{i}"] for i in range(layers)],
+            [data[f"b{i}"] for i in range(layers)])
+
+
+class DecisionBatch:
+    """
+    Collects the features of many paddles and evaluates the policy
+    once for all of them. Every controller owns a row of the
+    preallocated arrays. The decisions computed by flush are read by
+    the controllers on the following tick.
+    """
+    def __init__(self, policy: LookupTablePolicy | MLPPolicy, capacity: int):
+        """
+        Initialise the batch.
+
+        Parameters
+        ----------
+        policy: LookupTablePolicy | MLPPolicy
+            policy shared by the paddles.
+        capacity: int
+            maximum number of paddles.
+        """
+        self.policy = policy
+        self.features = np.zeros((capacity, FEATURES), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.intp)
+        self.count = 0
+
+    def register(self) -> int:
+        """
+        Returns
+        -------
+        int
+            the row reserved to a new paddle.
+        """
+        self.count += 1
+        return self.count - 1
+
+    def flush(self):
+        """
+        Evaluates the policy over the features of all the paddles.
+        """
+        self.actions[:self.count] = self.policy.decide(self.features[:self.count])
+
+
+class PolicyController:
+    """
+    Controls an NPC paddle with a policy, alone or inside a batch.
+    """
+    def __init__(self, policy: LookupTablePolicy | MLPPolicy, batch: DecisionBatch | None = None):
+        """
+        Initialise the controller.
+
+        Parameters
+        ----------
+        policy: LookupTablePolicy | MLPPolicy
+            the policy deciding the moves.
+        batch: DecisionBatch | None
+            batch where the decision is evaluated. If None, the policy
+            is evaluated immediately for this paddle only.
+        """
+        self.policy = policy
+        self.batch = batch
+        if batch is None:
+            self.features = np.zeros((1, FEATURES), dtype=np.float32)
+        else:
+            self.row = batch.register()
+            self.features = batch.features[self.row:self.row + 1]
+
+    def decide(self, player, ball_center: tuple) -> str:
+        """
+        Parameters
+        ----------
+        player: PlayerNPC
+            the controlled player.
+        ball_center: tuple
+            the center of the ball.
+
+        Returns
+        -------
+        str
+            UP, DOWN or STAY.
+        """
+        paddle_features(ball_center, player.last_ball_center, player.rect.center,
+            player.is_player2, player.field_x, player.field_y, self.features[0])
+        if self.batch is None:
+            return ACTIONS[self.policy.decide(self.features)[0]]
+        return ACTIONS[self.batch.actions[self.row]]
@@ -0,0 +1,294 @@
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from src.utils.constants import STAY, UP, DOWN
+from src.utils.frame_pacer import FrameHistogram
+from src.utils.headless import init_headless
+
+ACTIONS = [STAY, UP, DOWN]
+# Seconds after which a decision is too old to be used
+DECISION_DEADLINE = 0.04
+WAKEUP_TIMEOUT = 0.5
+READ_ATTEMPTS = 3
+# Publications remembered to measure the latency of the decisions
+RING_SIZE = 64
+
+# Slots of the shared memory, float64 each.
+# The request is written by the game under a sequence lock:
+# SEQUENCE is -1 while the fields are being written.
+SEQUENCE = 0
+BALL_X = 1
+BALL_Y = 2
+MAGNITUDE = 3
+DIRECTION = 4
+BALL_STATE = 5
+PADDLE_Y = 6
+SPEED = 7
+CAN_MOVE = 8
+LAST_X = 9
+LAST_Y = 10
+# The response is written by the worker with a single store:
+# sequence of the request * len(ACTIONS) + index of the action.
+RESPONSE = 11
+# time.monotonic when the worker decided, written before the response
+COMPLETED = 12
+SLOTS = 13
+
+
+def read_request(state: np.ndarray) -> tuple[int, list] | None:
+    """
+    Reads the last request without waiting for the writer.
+
+    Parameters
+    ----------
+    state: np.ndarray
+        view of the shared memory.
+
+    Returns
+    -------
+    tuple[int, list] | None
+        the sequence of the request and its fields,
+        None if nothing consistent could be read.
+    """
+    for _ in range(READ_ATTEMPTS):
+        sequence = state[SEQUENCE]
+        if sequence > 0:
+            fields = state[BALL_X:RESPONSE].tolist()
+            if state[SEQUENCE] == sequence:
+                return int(sequence), fields
+    return None
+
+
+def npc_worker(name: str, wakeup, stop, is_player2: bool, field_dimensions: tuple,
+    policy_path: str | None, search_budget: float | None):
+    """
+    Decides the moves of the NPC in a separate process.
+    It wakes up at every request, restores the ball and the paddle
+    from the shared memory and writes back the decision of the controller.
+
+    Parameters
+    ----------
+    name: str
+        name of the shared memory.
+    wakeup: multiprocessing.Event
+        set by the game after every request.
+    stop: multiprocessing.Event
+        set by the game to stop the worker.
+    is_player2: bool
+        side of the NPC.
+    field_dimensions: tuple
+        dimension of the playing field.
+    policy_path: str | None
+        policy deciding the moves, if any.
+    search_budget: float | None
+        seconds of lookahead search per decision, if any.
+        Without policy and search, the NPC follows the ball.
+    """
+    init_headless()
+    from src.entities.ball import Ball
+    from src.entities.player import PlayerNPC
+    memory = shared_memory.SharedMemory(name=name)
+    state = np.ndarray((SLOTS,), dtype=np.float64, buffer=memory.buf)
+    ball = Ball(field_dimensions, sound_effects=False)
+    ball.serve_positioning((0, 0))
+    controller = None
+    if policy_path is not None:
+        from src.ai.policy import PolicyController, load_policy
+        controller = PolicyController(load_policy(policy_path))
+    elif search_budget is not None:
+        from src.ai.lookahead import LookaheadController
+        controller = LookaheadController(ball, field_dimensions, search_budget)
+    player = PlayerNPC(is_player2, field_dimensions, controller)
+    last_sequence = 0
+    while not stop.is_set():
+        if not wakeup.wait(WAKEUP_TIMEOUT):
+            continue
+        # cleared before reading, so a later request wakes the worker again
+        wakeup.clear()
+        request = read_request(state)
+        if request is None or request[0] == last_sequence:
+            continue
+        sequence, fields = request
+        ball.set_state((int(fields[BALL_X - 1]), int(fields[BALL_Y - 1]), fields[MAGNITUDE - 1],
+            fields[DIRECTION - 1], int(fields[BALL_STATE - 1])))
+        player.set_state((int(fields[PADDLE_Y - 1]), int(fields[SPEED - 1]), bool(fields[CAN_MOVE - 1])))
+        player.last_ball_center = (int(fields[LAST_X - 1]), int(fields[LAST_Y - 1]))
+        action = player.decision(ball.rect.center)
+        state[COMPLETED] = time.monotonic()
+        state[RESPONSE] = sequence * len(ACTIONS) + ACTIONS.index(action)
+        last_sequence = sequence
+    del state
+    memory.close()
+
+
+class WorkerController:
+    """
+    Controls an NPC paddle with decisions taken in a worker process.
+    Every tick the state of the ball and of the paddle is published in
+    shared memory and the latest decision of the worker is read, without
+    waiting for it. The latency of a decision goes from the publication
+    of its state to the moment the worker wrote it; a decision later than
+    the deadline is a miss. When the latest decision was a miss, or the
+    worker has not decided on a state published within the deadline,
+    the NPC follows the ball.
+    """
+    def __init__(self, ball, is_player2: bool, field_dimensions: tuple, policy_path: str | None = None,
+        search_budget: float | None = None, deadline: float = DECISION_DEADLINE):
+        """
+        Starts the worker.
+
+        Parameters
+        ----------
+        ball: Ball
+            the ball of the match.
+        is_player2: bool
+            side of the NPC.
+        field_dimensions: tuple
+            dimension of the playing field.
+        policy_path: str | None
+            policy deciding the moves, if any.
+        search_budget: float | None
+            seconds of lookahead search per decision, if any.
+        deadline: float
+            seconds after which a decision is too old to be used.
+        """
+        self.ball = ball
+        self.deadline = deadline
+        self.memory = shared_memory.SharedMemory(create=True, size=SLOTS * 8)
+        self.state = np.ndarray((SLOTS,), dtype=np.float64, buffer=self.memory.buf)
+        self.state[:] = 0
+        self.state[RESPONSE] = -1
+        self.sequence = 0
+        self.published_sequences = [0] * RING_SIZE
+        self.published_times = [0.0] * RING_SIZE
+        self.observed = 0
+        self.observed_latency = 0.0
+        self.decisions = 0
+        self.fallbacks = 0
+        # decisions of the worker seen, and the ones later than the deadline
+        self.responses = 0
+        self.misses = 0
+        self.latencies = FrameHistogram()
+        # SDL does not survive a fork, the worker starts a fresh interpreter
+        context = multiprocessing.get_context("spawn")
+        self.wakeup = context.Event()
+        self.stop = context.Event()
+        self.process = context.Process(target=npc_worker, args=(self.memory.name, self.wakeup,
+            self.stop, is_player2, field_dimensions, policy_path, search_budget), daemon=True)
+        self.process.start()
+
+    def decide(self, player, ball_center: tuple) -> str:
+        """
+        Parameters
+        ----------
+        player: PlayerNPC
+            the controlled player.
+        ball_center: tuple
+            the center of the ball.
+
+        Returns
+        -------
+        str
+            the latest decision of the worker, or the default
+            one of the player if it missed the deadline.
+        """
+        now = time.monotonic()
+        action = self.latest_decision(now)
+        self.publish(player, now)
+        self.decisions += 1
+        if action is None:
+            self.fallbacks += 1
+            return player.follow_ball(ball_center)
+        return action
+
+    def latest_decision(self, now: float) -> str | None:
+        """
+        Parameters
+        ----------
+        now: float
+            current time, from time.monotonic.
+
+        Returns
+        -------
+        str | None
+            the last decision of the worker, None if there is none,
+            if it missed the deadline or if its state was published
+            more than the deadline ago.
+        """
+        response = self.state[RESPONSE]
+        completed = self.state[COMPLETED]
+        if response < 0:
+            return None
+        sequence, index = divmod(int(response), len(ACTIONS))
+        slot = sequence % RING_SIZE
+        if self.published_sequences[slot] != sequence:
+            return None
+        published = self.published_times[slot]
+        latency = completed - published
+        if sequence != self.observed:
+            # the worker answered again between the two reads
+            if self.state[RESPONSE] != response:
+                return None
+            self.observed = sequence
+            self.observed_latency = latency
+            self.responses += 1
+            self.latencies.add(latency * 1000)
+            if latency > self.deadline:
+                self.misses += 1
+        if self.observed_latency > self.deadline or now - published > self.deadline:
+            return None
+        return ACTIONS[index]
+
+    def publish(self, player, now: float):
+        """
+        Writes the state of the ball and of the paddle
+        in the shared memory and wakes up the worker.
+
+        Parameters
+        ----------
+        player: PlayerNPC
+            the controlled player.
+        now: float
+            current time, from time.monotonic.
+        """
+        self.sequence += 1
+        state = self.state
+        state[SEQUENCE] = -1
+        state[BALL_X:BALL_STATE + 1] = self.ball.get_state()
+        state[PADDLE_Y:CAN_MOVE + 1] = player.get_state()
+        state[LAST_X:LAST_Y + 1] = player.last_ball_center
+        state[SEQUENCE] = self.sequence
+        slot = self.sequence % RING_SIZE
+        self.published_sequences[slot] = self.sequence
+        self.published_times[slot] = now
+        self.wakeup.set()
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the decisions, the deadline misses and
+            the latency percentiles of the worker.
+        """
+        misses = self.misses / self.responses if self.responses else 0
+        fallbacks = self.fallbacks / self.decisions if self.decisions else 0
+        return (f"npc worker: {self.decisions} decisions - "
+            f"followed the ball: {self.fallbacks} ({fallbacks:.1%})\n"
+            f"worker decisions: {self.responses} - "
+            f"deadline misses: {self.misses} ({misses:.1%})\n"
+            f"latency p50: {self.latencies.percentile(50):.2f} ms"
+            f" - p99: {self.latencies.percentile(99):.2f} ms")
+
+    def close(self):
+        """
+        Stops the worker and releases the shared memory.
+        """
+        self.stop.set()
+        self.wakeup.set()
+        self.process.join(WAKEUP_TIMEOUT)
+        # the view must go before the memory is closed
+        self.state = None
+        self.memory.close()
+        self.memory.unlink()
@@ -1,6 +1,8 @@
 import pygame
 from math import cos, sin, atan2, pi
 from .player import Player
+from src.utils.images import load_image
+from src.utils.sounds import load_sound
 from random import randint
 
 HOLDING_STATE = 0
@@ -10,7 +12,7 @@ OUT_STATE = 3
 
 BALL_STATES = [HOLDING_STATE, PLAYING_STATE, GOING_OUT_STATE, OUT_STATE]
 
-class Ball(pygame.sprite.Sprite):
+class Ball:
     """
     Ball of the pong game.
     Controls:
@@ -19,7 +21,7 @@ class Ball(pygame.sprite.Sprite):
     - The status of the ball.
     """
 
-    def __init__(self, field_dimensions: tuple):
+    def __init__(self, field_dimensions: tuple, sound_effects=True):
         """
         Initialise the ball object.
 
@@ -31,11 +33,15 @@ class Ball(pygame.sprite.Sprite):
             where the first element represents the starting and ending
             line of the horizontal border, instead the second of the vertical
             border.
+        sound_effects: bool
+            True if the ball plays a sound when hit.
+            False otherwise (e.g. headless simulations).
         """
-        super().__init__()
-        self.sounds = [pygame.mixer.Sound(f'assets/audio/ping_pong_sound_{i}.mp3')
-            for i in range(8)]
-        self.image = pygame.image.load('assets/graphics/ball.png').convert_alpha()
+        self.sounds = []
+        if sound_effects:
+            self.sounds = [load_sound(f'assets/audio/ping_pong_sound_{i}.mp3')
+                for i in range(8)]
+        self.image = load_image('assets/graphics/ball.png')
         self.state = HOLDING_STATE
         self.magnitude = 10
         self.direction = 0
@@ -140,8 +146,9 @@ class Ball(pygame.sprite.Sprite):
         """
         Generates the sound of the ball hitting a wall or a player.
         """
-        i = randint(0, len(self.sounds)-1)
-        self.sounds[i].play()
+        if self.sounds:
+            i = randint(0, len(self.sounds)-1)
+            self.sounds[i].play()
 
     @staticmethod
     def adjust_direction(radians: float) -> float:
@@ -233,6 +240,27 @@ class Ball(pygame.sprite.Sprite):
         self.magnitude = 10
         self.direction = 0
 
+    def get_state(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            a cheap snapshot of the ball:
+            (left, top, magnitude, direction, state).
+        """
+        return (self.rect.x, self.rect.y, self.magnitude, self.direction, self.state)
+
+    def set_state(self, state: tuple):
+        """
+        Restores a snapshot taken by get_state.
+
+        Parameters
+        ----------
+        state: tuple
+            the snapshot to restore.
+        """
+        self.rect.x, self.rect.y, self.magnitude, self.direction, self.state = state
+
     def serve_positioning(self, position: tuple):
         """
         Puts the ball in a serve position
@@ -0,0 +1,319 @@
+from math import ceil, pi
+import numpy as np
+import pygame
+from src.entities.entity_store import EntityStore
+from src.utils.images import load_image
+
+BALL_SPEED = 10
+# Directions closer than this to the vertical are bent by DIRECTION_ADJUSTMENT,
+# as Ball.adjust_direction does for the single ball
+VERTICAL_CONE = 20 * pi / 180
+DIRECTION_ADJUSTMENT = pi / 6
+# Maximum angle from the horizontal of a new ball
+SPAWN_ANGLE = pi / 4
+# Neighbour cells visited from every cell, so that every pair is found once
+NEIGHBOUR_CELLS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+class SpatialGrid:
+    """
+    Uniform grid over the field used as broadphase for the collisions.
+    Every build sorts the balls by cell, so the balls of a cell are
+    contiguous and the candidate pairs are generated with array operations,
+    one pass for every possible position inside the fullest cell.
+    """
+    def __init__(self, bounds: tuple, cell_size: float):
+        """
+        Initialise the grid.
+
+        Parameters
+        ----------
+        bounds: tuple
+            (left, top, right, bottom) of the covered area.
+        cell_size: float
+            side of the cells, at least the diameter of the balls.
+        """
+        self.left, self.top = bounds[0], bounds[1]
+        self.cell_size = cell_size
+        self.columns = max(ceil((bounds[2] - bounds[0]) / cell_size), 1)
+        self.rows = max(ceil((bounds[3] - bounds[1]) / cell_size), 1)
+        self.cells = np.zeros(0, dtype=np.int64)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(self.columns * self.rows, dtype=np.int64)
+        self.starts = np.zeros(self.columns * self.rows, dtype=np.int64)
+
+    def cell_of(self, x, y) -> tuple:
+        """
+        Parameters
+        ----------
+        x, y: np.ndarray | float
+            coordinates of the points.
+
+        Returns
+        -------
+        tuple
+            columns and rows of the cells containing the points,
+            clamped to the grid.
+        """
+        column = np.clip(np.asarray((x - self.left) // self.cell_size, dtype=np.int64), 0, self.columns - 1)
+        row = np.clip(np.asarray((y - self.top) // self.cell_size, dtype=np.int64), 0, self.rows - 1)
+        return column, row
+
+    def build(self, positions: np.ndarray):
+        """
+        Assigns the balls to the cells.
+
+        Parameters
+        ----------
+        positions: np.ndarray
+            centers of the balls, shaped (N, 2).
+        """
+        column, row = self.cell_of(positions[:, 0], positions[:, 1])
+        self.cells = row * self.columns + column
+        self.order = np.argsort(self.cells, kind="stable")
+        self.counts = np.bincount(self.cells, minlength=self.columns * self.rows)
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    def candidate_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            indices of the balls of every pair sharing a cell
+            or lying in neighbour cells.
+        """
+        sorted_cells = self.cells[self.order]
+        fullest = int(self.counts.max()) if len(self.order) else 0
+        first, second = [], []
+        # pairs in the same cell: the balls are contiguous in the sorted order
+        for distance in range(1, fullest):
+            same = np.flatnonzero(sorted_cells[:-distance] == sorted_cells[distance:])
+            first.append(self.order[same])
+            second.append(self.order[same + distance])
+        column = sorted_cells % self.columns
+        row = sorted_cells // self.columns
+        for row_offset, column_offset in NEIGHBOUR_CELLS:
+            neighbour_row = row + row_offset
+            neighbour_column = column + column_offset
+            valid = np.flatnonzero((neighbour_row < self.rows) & (neighbour_column >= 0)
+                & (neighbour_column < self.columns))
+            neighbour = neighbour_row[valid] * self.columns + neighbour_column[valid]
+            starts = self.starts[neighbour]
+            counts = self.counts[neighbour]
+            for k in range(fullest):
+                present = np.flatnonzero(counts > k)
+                first.append(self.order[valid[present]])
+                second.append(self.order[starts[present] + k])
+        if not first:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(first), np.concatenate(second)
+
+    def query(self, rect: pygame.Rect, margin: float = 0) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        rect: pygame.Rect
+            area to look up.
+        margin: float
+            distance around the rect also looked up.
+
+        Returns
+        -------
+        np.ndarray
+            indices of the balls in the cells overlapping the area.
+        """
+        first_column, first_row = self.cell_of(rect.left - margin, rect.top - margin)
+        last_column, last_row = self.cell_of(rect.right + margin, rect.bottom + margin)
+        found = []
+        for row in range(int(first_row), int(last_row) + 1):
+            start = self.starts[row * self.columns + int(first_column)]
+            end_cell = row * self.columns + int(last_column)
+            found.append(self.order[start:self.starts[end_cell] + self.counts[end_cell]])
+        return np.concatenate(found)
+
+
+def adjust_directions(velocity: np.ndarray, speed: float):
+    """
+    Bends the directions too close to the vertical, like
+    Ball.adjust_direction, and restores the speed of every ball.
+
+    Parameters
+    ----------
+    velocity: np.ndarray
+        velocities of the balls, shaped (N, 2), modified in place.
+    speed: float
+        speed of every ball.
+    """
+    angle = np.arctan2(velocity[:, 1], velocity[:, 0])
+    upwards = np.abs(angle - pi / 2) <= VERTICAL_CONE
+    downwards = np.abs(angle + pi / 2) <= VERTICAL_CONE
+    angle[upwards] += np.where(angle[upwards] >= pi / 2, DIRECTION_ADJUSTMENT, -DIRECTION_ADJUSTMENT)
+    angle[downwards] += np.where(angle[downwards] <= -pi / 2, -DIRECTION_ADJUSTMENT, DIRECTION_ADJUSTMENT)
+    velocity[:, 0] = speed * np.cos(angle)
+    velocity[:, 1] = speed * np.sin(angle)
+
+
+class BallSwarm:
+    """
+    Many balls stored as rows of an EntityStore instead of Sprites.
+    The balls bounce on the borders, on the paddles and on each other,
+    the collisions between balls are found through a SpatialGrid.
+    A ball leaving the field scores a point and respawns in the middle.
+    """
+    def __init__(self, count: int, field_dimensions: tuple, speed: float = BALL_SPEED, seed: int | None = None):
+        """
+        Initialise the balls.
+
+        Parameters
+        ----------
+        count: int
+            number of balls.
+        field_dimensions: tuple
+            dimension of the playing field.
+        speed: float
+            speed of every ball, in pixels per tick.
+        seed: int | None
+            seed of the positions and directions of the balls.
+        """
+        self.count = count
+        self.field_x = field_dimensions[0]
+        self.field_y = field_dimensions[1]
+        self.speed = speed
+        image = load_image('assets/graphics/ball.png')
+        self.radius = image.get_width() / 2
+        self.random = np.random.default_rng(seed)
+        self.entities = EntityStore(count)
+        for _ in range(count):
+            self.entities.add(image, (0, 0))
+        # views of the tables, which do not grow after this point
+        self.positions = self.entities.positions[:count]
+        self.velocities = self.entities.velocities[:count]
+        self.grid = SpatialGrid((self.field_x[0], self.field_y[0], self.field_x[1], self.field_y[1]),
+            2 * self.radius)
+        self.reset()
+
+    def reset(self):
+        """
+        Spreads all the balls in the middle third of the field.
+        """
+        self.spawn(np.arange(self.count), spread=True)
+
+    def spawn(self, indices: np.ndarray, spread: bool = False):
+        """
+        Puts the given balls in the middle of the field,
+        with a random direction towards one of the players.
+
+        Parameters
+        ----------
+        indices: np.ndarray
+            balls to respawn.
+        spread: bool
+            True to spread them over the middle third of the field,
+            False to put them on the middle line.
+        """
+        width = self.field_x[1] - self.field_x[0]
+        center_x = self.field_x[0] + width / 2
+        if spread:
+            x = self.random.uniform(center_x - width / 6, center_x + width / 6, len(indices))
+        else:
+            x = np.full(len(indices), center_x)
+        y = self.random.uniform(self.field_y[0] + self.radius, self.field_y[1] - self.radius, len(indices))
+        angle = self.random.uniform(-SPAWN_ANGLE, SPAWN_ANGLE, len(indices))
+        angle += np.where(self.random.random(len(indices)) < 0.5, 0, pi)
+        self.positions[indices, 0] = x
+        self.positions[indices, 1] = y
+        self.velocities[indices, 0] = self.speed * np.cos(angle)
+        self.velocities[indices, 1] = self.speed * np.sin(angle)
+
+    def update(self, players: list) -> tuple[int, int]:
+        """
+        Moves the balls one tick and resolves the collisions.
+
+        Parameters
+        ----------
+        players: list[Player]
+            the two players, the first one on the left.
+
+        Returns
+        -------
+        tuple[int, int]
+            points scored by the first and by the second player.
+        """
+        positions, velocities = self.positions, self.velocities
+        self.entities.integrate()
+        top = self.field_y[0] + self.radius
+        bottom = self.field_y[1] - self.radius
+        over = positions[:, 1] < top
+        positions[over, 1] = top
+        velocities[over, 1] = np.abs(velocities[over, 1])
+        under = positions[:, 1] > bottom
+        positions[under, 1] = bottom
+        velocities[under, 1] = -np.abs(velocities[under, 1])
+
+        self.grid.build(positions)
+        self.collide_balls()
+        for player in players:
+            self.collide_paddle(player)
+        adjust_directions(velocities, self.speed)
+
+        left_out = np.flatnonzero(positions[:, 0] < self.field_x[0] - self.radius)
+        right_out = np.flatnonzero(positions[:, 0] > self.field_x[1] + self.radius)
+        if len(left_out) or len(right_out):
+            self.spawn(np.concatenate([left_out, right_out]))
+        return len(right_out), len(left_out)
+
+    def collide_balls(self):
+        """
+        Bounces the touching balls on each other, exchanging the
+        velocity along the line between their centers and separating them.
+        """
+        first, second = self.grid.candidate_pairs()
+        offset = self.positions[second] - self.positions[first]
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        touching = np.flatnonzero((distance < 2 * self.radius) & (distance > 0))
+        if len(touching) == 0:
+            return
+        first, second = first[touching], second[touching]
+        distance = distance[touching]
+        normal = offset[touching] / distance[:, None]
+        closing = np.einsum("ij,ij->i", self.velocities[first] - self.velocities[second], normal)
+        impulse = normal * np.maximum(closing, 0)[:, None]
+        np.add.at(self.velocities, first, -impulse)
+        np.add.at(self.velocities, second, impulse)
+        separation = normal * ((2 * self.radius - distance) / 2)[:, None]
+        np.add.at(self.positions, first, -separation)
+        np.add.at(self.positions, second, separation)
+
+    def collide_paddle(self, player):
+        """
+        Bounces the balls hitting the paddle back, adding the paddle
+        speed to their vertical direction like Ball.hit does.
+
+        Parameters
+        ----------
+        player: Player
+            the paddle.
+        """
+        rect = player.rect
+        candidates = self.grid.query(rect, self.radius)
+        if len(candidates) == 0:
+            return
+        x = self.positions[candidates, 0]
+        y = self.positions[candidates, 1]
+        direction = -1 if player.is_player2 else 1
+        hits = candidates[(x + self.radius >= rect.left) & (x - self.radius <= rect.right)
+            & (y + self.radius >= rect.top) & (y - self.radius <= rect.bottom)
+            & (self.velocities[candidates, 0] * direction < 0)]
+        self.velocities[hits, 0] *= -1
+        self.velocities[hits, 1] += player.speed
+
+    def draw(self, surface: pygame.Surface):
+        """
+        Draws all the balls.
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface where to draw.
+        """
+        self.entities.draw(surface)
@@ -0,0 +1,111 @@
+import numpy as np
+import pygame
+
+INITIAL_CAPACITY = 16
+
+
+class EntityStore:
+    """
+    Struct of arrays holding the drawable entities: one table per
+    component (position, velocity, size, sprite id) and one row per entity.
+    The rows are kept dense, so the systems run over contiguous slices
+    instead of walking one object per entity.
+    Positions are the centers of the entities, sprite ids index the
+    images registered with register_sprite.
+    """
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        """
+        Initialise an empty store.
+
+        Parameters
+        ----------
+        capacity: int
+            rows allocated up front, the tables grow when they are full.
+        """
+        self.count = 0
+        self.positions = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.sizes = np.zeros((capacity, 2), dtype=np.int32)
+        self.sprite_ids = np.zeros(capacity, dtype=np.int32)
+        self.images = []
+        self.image_ids = {}
+
+    def register_sprite(self, image: pygame.Surface) -> int:
+        """
+        Adds an image to the sprite table, once.
+
+        Parameters
+        ----------
+        image: pygame.Surface
+            the image.
+
+        Returns
+        -------
+        int
+            the sprite id of the image.
+        """
+        key = id(image)
+        if key not in self.image_ids:
+            self.image_ids[key] = len(self.images)
+            self.images.append(image)
+        return self.image_ids[key]
+
+    def add(self, image: pygame.Surface, position: tuple, velocity: tuple = (0, 0)) -> int:
+        """
+        Adds an entity.
+
+        Parameters
+        ----------
+        image: pygame.Surface
+            image of the entity, also giving its size.
+        position: tuple
+            center of the entity.
+        velocity: tuple
+            pixels moved at every integration.
+
+        Returns
+        -------
+        int
+            the row of the entity.
+        """
+        if self.count == len(self.sprite_ids):
+            self.grow()
+        row = self.count
+        self.positions[row] = position
+        self.velocities[row] = velocity
+        self.sizes[row] = image.get_size()
+        self.sprite_ids[row] = self.register_sprite(image)
+        self.count += 1
+        return row
+
+    def grow(self):
+        """
+        Doubles the capacity of the tables.
+        """
+        capacity = 2 * max(len(self.sprite_ids), 1)
+        for name in ("positions", "velocities", "sizes", "sprite_ids"):
+            table = getattr(self, name)
+            grown = np.zeros((capacity,) + table.shape[1:], dtype=table.dtype)
+            grown[:len(table)] = table
+            setattr(self, name, grown)
+
+    def integrate(self):
+        """
+        Movement system: moves every entity by its velocity.
+        """
+        self.positions[:self.count] += self.velocities[:self.count]
+
+    def draw(self, surface: pygame.Surface):
+        """
+        Render system: draws every entity with a single blit call.
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface where to draw.
+        """
+        count = self.count
+        topleft = (self.positions[:count] - self.sizes[:count] // 2).astype(np.int32).tolist()
+        images = self.images
+        surface.fblits([(images[sprite], position)
+            for sprite, position in zip(self.sprite_ids[:count].tolist(), topleft)])
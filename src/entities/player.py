@@ -1,12 +1,13 @@
 import random
-import pygame
 from src.utils.constants import UP, DOWN, STAY
+from src.utils.images import load_image
+from src.utils.input_queue import INPUT
 
 MAX_SPEED = 30
 PLAYER_1 = "player_1"
 PLAYER_2 = "player_2"
 
-class Player(pygame.sprite.Sprite):
+class Player:
     """
     Defines the player visualisation and movement.
     """
@@ -33,10 +34,9 @@ class Player(pygame.sprite.Sprite):
             border.
 
         """
-        super().__init__()
         self.field_x = field_dimensions[0]
         self.field_y = field_dimensions[1]
-        self.image = pygame.image.load('assets/graphics/padel.png').convert_alpha()
+        self.image = load_image('assets/graphics/padel.png')
         self.is_player2 = is_player2
         if self.is_player2:
             self.name = PLAYER_2
@@ -61,11 +61,28 @@ class Player(pygame.sprite.Sprite):
     def movement(self):
         """
         Controls the movement of the player based on the pressed key.
+        With both keys held, the one pressed last wins.
         """
-        keys = pygame.key.get_pressed()
-        if keys[self.up] and self.speed >= -MAX_SPEED:
+        key = INPUT.latest((self.up, self.down))
+        if key == self.up:
+            self.move(UP)
+        elif key == self.down:
+            self.move(DOWN)
+        else:
+            self.move(STAY)
+
+    def move(self, direction: str):
+        """
+        Accelerates the player in the given direction.
+
+        Parameters
+        ----------
+        direction: str
+            UP, DOWN or STAY.
+        """
+        if direction == UP and self.speed >= -MAX_SPEED:
             self.speed -= 2
-        elif keys[self.down] and self.speed <= MAX_SPEED:
+        elif direction == DOWN and self.speed <= MAX_SPEED:
             self.speed += 2
         else:
             self.speed = 0
@@ -106,6 +123,26 @@ class Player(pygame.sprite.Sprite):
         )
         self.speed = 0
 
+    def get_state(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            a cheap snapshot of the player: (y, speed, can_move).
+        """
+        return (self.rect.y, self.speed, self.can_move)
+
+    def set_state(self, state: tuple):
+        """
+        Restores a snapshot taken by get_state.
+
+        Parameters
+        ----------
+        state: tuple
+            the snapshot to restore.
+        """
+        self.rect.y, self.speed, self.can_move = state
+
     def serve_position(self, ball_width: int) -> tuple:
         """
         Parameters
@@ -129,7 +166,7 @@ class PlayerNPC(Player):
     """
     Defines an NPC player.
     """
-    def __init__(self, is_player2: bool, field_dimentions: tuple):
+    def __init__(self, is_player2: bool, field_dimentions: tuple, controller=None):
         """
         Initialise the NPC player.
 
@@ -146,10 +183,16 @@ class PlayerNPC(Player):
             line of the horizontal border, instead the second of the vertical
             border.
 
+        controller: PolicyController | LookaheadController | None
+            decides the moves of the player during the rally.
+            If None, the player follows the ball.
+
         """
         super().__init__(is_player2, {UP: 0, DOWN:0}, field_dimentions)
         self.name = "NPC - " + super().__str__()
         self.is_serving = False
+        self.controller = controller
+        self.last_ball_center = self.rect.center
 
     def NPCmovement(self, ball_center: tuple):
         """
@@ -172,14 +215,54 @@ class PlayerNPC(Player):
             elif movement == DOWN:
                 self.speed +=3
         elif self.can_move:
-            if ball_center[1] > self.rect.bottom:
+            movement = self.decision(ball_center)
+            if movement == DOWN:
                 self.speed +=2
-            elif ball_center[1] < self.rect.top:
+            elif movement == UP:
                 self.speed -=2
             else:
                 self.speed = 0
         else:
             self.speed = 0
+        self.last_ball_center = ball_center
+
+    def decision(self, ball_center: tuple) -> str:
+        """
+        Decides where to move during the rally.
+
+        Parameters
+        ----------
+        ball_center: tuple
+            the center of the ball.
+
+        Returns
+        -------
+        str
+            UP, DOWN or STAY.
+        """
+        if self.controller is not None:
+            return self.controller.decide(self, ball_center)
+        return self.follow_ball(ball_center)
+
+    def follow_ball(self, ball_center: tuple) -> str:
+        """
+        Default decision: moves towards the ball.
+
+        Parameters
+        ----------
+        ball_center: tuple
+            the center of the ball.
+
+        Returns
+        -------
+        str
+            UP, DOWN or STAY.
+        """
+        if ball_center[1] > self.rect.bottom:
+            return DOWN
+        elif ball_center[1] < self.rect.top:
+            return UP
+        return STAY
 
     def serving(self, is_serving: bool):
         """
@@ -1,6 +1,9 @@
-import os
 import pygame
+import src.utils.blur as blur
+from src.utils.animation import FRAME_DURATION, Animation, Timeline
 from src.utils.constants import FILE_NAME_SEPARATOR
+from src.utils.surface_pool import SCRATCH
+from src.utils.assets import asset, list_assets
 BEST_OF_THREE = 3
 BEST_OF_FIVE = 5
 BEST_OF_SEVEN = 7
@@ -9,16 +12,20 @@ ACE = "ace"
 SCORE = "score"
 WIN = "win"
 MESSAGES = [ACE, SCORE, WIN]
+# Durations of the animations, as long as they were at 60 fps
+DIGIT_FLIP_DURATION = 45 * FRAME_DURATION
+MESSAGE_DURATION = 100 * FRAME_DURATION
+MESSAGE_PIXEL_SIZE = 10
 
-class Scoreboard:
+class Score:
     """
-    Defines the Scoreboard of a game.
-    It controls the set and match score and score animation.
+    Defines the rules of the score of a game:
+    the set and match score and the hit counter.
     """
 
-    def __init__(self, best_of: int, set_points: int, field_dimensions: tuple):
+    def __init__(self, best_of: int, set_points: int):
         """
-        Initialise the scoreboard.
+        Initialise the score.
 
         Parameters
         ----------
@@ -26,27 +33,12 @@ class Scoreboard:
             maximum number of matches to play.
         set_points: int
             maximum number of set per match.
-        field_dimensions:
-
-            dimension of the playing field as ((0, 500), (100, 200))
-            where the first element represents the starting and ending
-            line of the horizontal border, instead the second of the vertical
-            border.
         """
         self.set_score = [0, 0]
         self.match_score = [0, 0]
         self.matches = best_of
         self.max_set_points = set_points
-        self.set_numbers = [Number([(215, 9), (290, 9)], 2), Number([(424, 9), (499, 9)], 2)]
-        self.match_numbers = [Number([(360, 20)], 1, 1/2), Number([(395, 20)], 1, 1/2)]
-        self.background = pygame.image.load("assets/graphics/scoreboard_back_v2.png").convert_alpha()
-        self.match_score_background = pygame.transform.scale_by(
-            pygame.image.load("assets/graphics/scoreboard_back.png").convert_alpha(),
-            1/2)
-        self.last_hit = 0
         self.hit_counter = 0
-        self.message = MessageEvent((field_dimensions[0][1]//2,
-            field_dimensions[1][1]//2))
 
     def increase_hit_counter(self):
         """
@@ -88,25 +80,110 @@ class Scoreboard:
             return 1
         return -1
 
+    def update_score(self, player: int) -> int:
+        """
+        Updates the score of the given player
+
+        Parameters
+        ----------
+        player: int
+            player who scored
+
+        Returns
+        -------
+        int
+            the player who won the set
+            -1 if the set is not over.
+        """
+        self.set_score[player] += 1
+        set_win_state = self.set_win_state()
+        if set_win_state != -1:
+            self.match_score[set_win_state] += 1
+            self.reset_set()
+        return set_win_state
+
+    def reset_set(self):
+        """
+        Resets the set score.
+        """
+        self.set_score = [0, 0]
+
+    def reset(self):
+        """
+        Resets the set and match score and hit counter.
+        """
+        self.reset_set()
+        self.match_score = [0, 0]
+        self.hit_counter = 0
+
+    def __str__(self):
+        return f"set: {self.set_score[0]} - {self.set_score[1]}\nmatch: {self.match_score[0]} - {self.match_score[1]}"
+
+
+class Scoreboard(Score):
+    """
+    Defines the Scoreboard of a game.
+    It controls the set and match score and score animation.
+    """
+
+    def __init__(self, best_of: int, set_points: int, field_dimensions: tuple):
+        """
+        Initialise the scoreboard.
+
+        Parameters
+        ----------
+        best_of: int
+            maximum number of matches to play.
+        set_points: int
+            maximum number of set per match.
+        field_dimensions:
+
+            dimension of the playing field as ((0, 500), (100, 200))
+            where the first element represents the starting and ending
+            line of the horizontal border, instead the second of the vertical
+            border.
+        """
+        super().__init__(best_of, set_points)
+        self.timeline = Timeline()
+        self.set_numbers = [Number([(215, 9), (290, 9)], 2, timeline=self.timeline),
+            Number([(424, 9), (499, 9)], 2, timeline=self.timeline)]
+        self.match_numbers = [Number([(360, 20)], 1, 1/2, self.timeline),
+            Number([(395, 20)], 1, 1/2, self.timeline)]
+        self.background = pygame.image.load(asset("assets/graphics/scoreboard_back_v2.png")).convert_alpha()
+        self.match_score_background = pygame.transform.scale_by(
+            pygame.image.load(asset("assets/graphics/scoreboard_back.png")).convert_alpha(),
+            1/2)
+        self.last_hit = 0
+        self.message = MessageEvent((field_dimensions[0][1]//2,
+            field_dimensions[1][1]//2), self.timeline)
+
     def is_animating(self) -> bool:
         """
         Verifies if the score event message is animating.
+        The win message stays visible once its animation ends.
         Returns
         -------
         bool
          True if it is animating
          False otherwise.
         """
-        return self.message.visible
+        return self.message.visible and self.message.message_animation_status()
 
-    def update_score(self, player: int):
+    def update_score(self, player: int) -> int:
         """
-        Updates the score of the given player
+        Updates the score of the given player and starts
+        the score animation.
 
         Parameters
         ----------
         player: int
             player who scored
+
+        Returns
+        -------
+        int
+            the player who won the set
+            -1 if the set is not over.
         """
         self.message.reset()
         self.message.set_visibility(True)
@@ -114,34 +191,33 @@ class Scoreboard:
             self.message.set_message(ACE)
         else:
             self.message.set_message(SCORE, player)
-        self.set_score[player] += 1
         self.set_numbers[player].next()
-        set_win_state = self.set_win_state()
+        set_win_state = super().update_score(player)
         if set_win_state != -1:
-            self.match_score[set_win_state] += 1
             self.match_numbers[player].next()
-            self.reset_set()
             if self.match_win_state() != -1:
                 self.message.set_message(WIN, player)
+        return set_win_state
 
-    def update(self):
+    def update(self, seconds: float = FRAME_DURATION):
         """
         Updates the scoreboard.
+
+        Parameters
+        ----------
+        seconds: float
+            time elapsed since the last update.
         """
-        for number in self.set_numbers:
-            number.update()
-        for number in self.match_numbers:
-            number.update()
+        self.timeline.advance(seconds)
         if (not self.message.message_animation_status()
             and self.message.current != WIN):
             self.message.set_visibility(False)
-        self.message.update()
 
     def reset_set(self):
         """
         Resets the set score.
         """
-        self.set_score = [0, 0]
+        super().reset_set()
         for number in self.set_numbers:
             number.reset()
 
@@ -149,12 +225,10 @@ class Scoreboard:
         """
         Resets the set and match score and hit counter.
         """
-        self.reset_set()
-        self.match_score = [0, 0]
+        super().reset()
         for number in self.match_numbers:
             number.reset()
         self.message.reset()
-        self.hit_counter = 0
 
     def draw(self, screen: pygame.Surface):
         """
@@ -173,15 +247,12 @@ class Scoreboard:
             screen.blit(self.match_score_background, number.get_position())
             number.render(screen)
 
-    def __str__(self):
-        return f"set: {self.set_score[0]} - {self.set_score[1]}\nmatch: {self.match_score[0]} - {self.match_score[1]}"
-
 
 class Number():
     """
     Defines the number with various possible digits.
     """
-    def __init__(self, positions: list[tuple], number_of_digits: int, scale_factor=1):
+    def __init__(self, positions: list[tuple], number_of_digits: int, scale_factor=1, timeline: Timeline | None = None):
         """
         Initialise the number.
 
@@ -193,9 +264,11 @@ class Number():
             number of digits.
         scale_factor: int
             the factor for scale the digits.
+        timeline: Timeline | None
+            timeline running the animations of the digits.
         """
         self.digits = [
-            Digit(positions[digit], scale_factor)
+            Digit(positions[digit], scale_factor, timeline)
             for digit in range(number_of_digits)
         ]
 
@@ -252,13 +325,6 @@ class Number():
             number += self.digits[i].current_digit * ((i * 10) if i != 0 else 1)
         return number
 
-    def update(self):
-        """
-        Updates the number
-        """
-        for digit in self.digits:
-            digit.update()
-
     def reset(self):
         """
         Reset the numbers.
@@ -282,7 +348,7 @@ class Digit(pygame.sprite.Sprite):
     """
     Digit of a number
     """
-    def __init__(self, position: tuple, scale_factor=1):
+    def __init__(self, position: tuple, scale_factor=1, timeline: Timeline | None = None):
         """
         Initialise the digit
 
@@ -292,13 +358,16 @@ class Digit(pygame.sprite.Sprite):
             position of the digit
         scale_factor: int
             the factor for scale the digits.
+        timeline: Timeline | None
+            timeline running the flip animation.
+            If None, the digit has its own.
         """
         super().__init__()
         self.current_digit = 0
         self.previous_digit = 0
         self.digits = [
             pygame.transform.scale_by(
-                pygame.image.load(f'assets/graphics/numbers/{digit}.png').convert_alpha(), scale_factor)
+                pygame.image.load(asset(f'assets/graphics/numbers/{digit}.png')).convert_alpha(), scale_factor)
             for digit in range(10)
         ]
         self.image = self.digits[self.current_digit]
@@ -307,9 +376,11 @@ class Digit(pygame.sprite.Sprite):
         self.current_frame = 0
         self.flip_frames = [
             pygame.transform.scale_by(
-                pygame.image.load(f"assets/graphics/scoreboard_animation/scoreboard_animation{frame}.png").convert_alpha(), scale_factor)
+                pygame.image.load(asset(f"assets/graphics/scoreboard_animation/scoreboard_animation{frame}.png")).convert_alpha(), scale_factor)
             for frame in range(1, 10)
         ]
+        self.timeline = Timeline() if timeline is None else timeline
+        self.flip_animation = Animation(DIGIT_FLIP_DURATION, self.animate_flip, self.end_flip)
 
     def get_position(self) -> tuple:
         """
@@ -355,6 +426,25 @@ class Digit(pygame.sprite.Sprite):
         """
         self.is_animating = True
         self.current_frame = 0
+        self.timeline.play(self.flip_animation)
+
+    def animate_flip(self, progress: float):
+        """
+        Moves to the flip frame of the given progress.
+
+        Parameters
+        ----------
+        progress: float
+            progress of the animation, from 0 to 1.
+        """
+        self.current_frame = min(progress * len(self.flip_frames), len(self.flip_frames) - 1)
+
+    def end_flip(self):
+        """
+        Shows the new digit.
+        """
+        self.is_animating = False
+        self.current_frame = 0
 
     def add(self, to_add: int):
         """
@@ -370,16 +460,6 @@ class Digit(pygame.sprite.Sprite):
         self.current_digit %= 10
         return carry_over
 
-    def update(self):
-        """
-        Updates the digits.
-        """
-        if self.is_animating:
-            self.current_frame += 0.2
-            if self.current_frame >= len(self.flip_frames):
-                self.is_animating = False
-                self.current_frame = 0
-
     def render(self, surface: pygame.Surface):
         """
         Draws the digits over the given surface.
@@ -417,10 +497,11 @@ class Digit(pygame.sprite.Sprite):
         Returns
         -------
         Surface
-            Resulting image from the transition.
+            Resulting image from the transition, a scratch surface
+            valid until the next split of a digit of the same size.
         """
         width, height = previous.get_size()
-        result = pygame.Surface((width, height), pygame.SRCALPHA)
+        result = SCRATCH.get((width, height), previous)
         boundary_y = self.extract_first_boundary(flip)
         for x in range(width):
             split_y = boundary_y[x]
@@ -462,6 +543,7 @@ class Digit(pygame.sprite.Sprite):
         """
         Resets the Digit.
         """
+        self.timeline.stop(self.flip_animation)
         self.current_digit = 0
         self.is_animating = False
         self.current_frame = 0
@@ -476,7 +558,7 @@ class MessageEvent(pygame.sprite.Sprite):
     Represents a message caused by an event in game.
     Manages the sprite and the animation.
     """
-    def __init__(self, position: tuple):
+    def __init__(self, position: tuple, timeline: Timeline | None = None):
         """
         Constructs the MessageEvent.
 
@@ -484,18 +566,25 @@ class MessageEvent(pygame.sprite.Sprite):
         ----------
         position: tuple
             position of the message.
+        timeline: Timeline | None
+            timeline running the animation of the message.
+            If None, the message has its own.
         """
         self.visible = False
-        self.pixel_size = -10
+        self.pixel_size = -MESSAGE_PIXEL_SIZE
+        self.timeline = Timeline() if timeline is None else timeline
+        self.animation = Animation(MESSAGE_DURATION, self.animate)
         self.position = position
         self.messages = {}
         self.current = ""
         path = "assets/graphics/event_messages/"
-        event_messages = os.listdir(path)
+        event_messages = list_assets(path)
         for message in event_messages:
             name = message.split(FILE_NAME_SEPARATOR)[0]
             if name in MESSAGES:
-                self.messages[name] = pygame.image.load(path + message).convert_alpha()
+                self.messages[name] = pygame.image.load(asset(path + message)).convert_alpha()
+        # one buffer per size, the message shown is copied there
+        self.buffers = {image.get_size(): image.copy() for image in self.messages.values()}
 
         self.player_numbers = [Digit((400, 230)), Digit((400, 230))]
         self.player_numbers[0].set_number(1)
@@ -511,8 +600,23 @@ class MessageEvent(pygame.sprite.Sprite):
             True if the message should be visible
             False otherwise.
         """
+        if is_visible and not self.visible:
+            self.timeline.play(self.animation)
+        elif not is_visible:
+            self.timeline.stop(self.animation)
         self.visible = is_visible
 
+    def animate(self, progress: float):
+        """
+        Sharpens the message from pixelated to clear.
+
+        Parameters
+        ----------
+        progress: float
+            progress of the animation, from 0 to 1.
+        """
+        self.pixel_size = MESSAGE_PIXEL_SIZE * (1 - 2 * progress)
+
     def message_animation_status(self) -> bool:
         """
         Determines if the message is still animating.
@@ -523,7 +627,7 @@ class MessageEvent(pygame.sprite.Sprite):
             True if the message is still animating
             False otherwise.
         """
-        return self.pixel_size > -10
+        return self.pixel_size > -MESSAGE_PIXEL_SIZE
 
     def set_message(self, message: str, player_number: int=-1):
         """
@@ -538,7 +642,10 @@ class MessageEvent(pygame.sprite.Sprite):
             Player to dedicate the message.
         """
         self.current = message
-        self.image = self.messages[message].copy()
+        # adding to the cleared pixels keeps the alpha of the original
+        self.image = self.buffers[self.messages[message].get_size()]
+        self.image.fill((0, 0, 0, 0))
+        self.image.blit(self.messages[message], (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
         if player_number != -1:
             self.player_numbers[player_number].render(self.image)
         self.rect = self.image.get_rect(center=self.position)
@@ -555,26 +662,19 @@ class MessageEvent(pygame.sprite.Sprite):
             surface where the message will be drawn.
         """
         if self.visible:
-            background = pygame.transform.box_blur(surface, 5)
+            blur.blur(surface, 5, dest=surface)
             if self.pixel_size >= 1:
-                pixelated_message = pygame.transform.pixelate(self.image, int(self.pixel_size))
-                surface.blit(background, (0,0))
+                pixelated_message = pygame.transform.pixelate(self.image, int(self.pixel_size),
+                    SCRATCH.get(self.image.get_size(), self.image))
                 surface.blit(pixelated_message, self.rect.topleft)
             else:
-                surface.blit(background, (0,0))
                 surface.blit(self.image, self.rect.topleft)
 
     def reset(self):
         """
         Resets the message.
         """
-        self.pixel_size = 10
+        self.timeline.stop(self.animation)
+        self.pixel_size = MESSAGE_PIXEL_SIZE
         self.current = ""
         self.visible = False
-
-    def update(self):
-        """
-        Updates the message.
-        """
-        if self.visible:
-            self.pixel_size -= 0.2
@@ -1,11 +1,19 @@
 import pygame
+from src.utils.animation import FRAME_DURATION, Animation, Timeline
 from src.utils.constants import UP, DOWN
+from src.utils.input_queue import INPUT
+from src.utils.sounds import load_sound
+from src.utils.assets import asset
 
 START_GAME = "Start Game"
 PAUSE = "Pause Game"
 RESTART_GAME = "Reset Game"
 GAME_SETTINGS = "Confirm"
 EXIT_GAME = "Leave"
+MULTI_BALL = "Multi Ball"
+# Durations of the press animations, as long as they were at 60 fps
+BUTTON_PRESS_DURATION = 16 * FRAME_DURATION
+PAUSE_PRESS_DURATION = 15 * FRAME_DURATION
 
 
 class Menu():
@@ -23,20 +31,21 @@ class Menu():
         button_names: list[str]
             names of the buttons to display.
         """
+        self.timeline = Timeline()
         self.buttons = []
         y_position = 220
         for name in button_names:
-            self.buttons.append(Button((400, y_position), name))
+            self.buttons.append(Button((400, y_position), name, self.timeline))
             y_position += 80
-        self.logo = pygame.image.load('assets/graphics/logo.png')
+        self.logo = pygame.image.load(asset('assets/graphics/logo.png'))
         self.logo_position = (220, 30)
         self.is_visible = False
         self.cursor = 0
         self.keybindings = keybindings
         self.mouse_last_pos = (0, 0)
         self.mouse_control = False
-        self.hover_sound = pygame.mixer.Sound("assets/audio/hover_sound.mp3")
-        self.confirm_sound = pygame.mixer.Sound("assets/audio/selection_sound.mp3")
+        self.hover_sound = load_sound("assets/audio/hover_sound.mp3")
+        self.confirm_sound = load_sound("assets/audio/selection_sound.mp3")
 
     def check_highlight(self, mouse_pos:tuple):
         """
@@ -122,11 +131,10 @@ class Menu():
         int
          the new cursor.
         """
-        keys = pygame.key.get_just_pressed()
-        if keys[self.keybindings[UP]]:
+        if INPUT.just_pressed(self.keybindings[UP]):
             self.mouse_control = False
             return (self.cursor - 1)%len(self.buttons)
-        elif keys[self.keybindings[DOWN]]:
+        elif INPUT.just_pressed(self.keybindings[DOWN]):
             self.mouse_control = False
             return (self.cursor + 1)%len(self.buttons)
 
@@ -178,20 +186,50 @@ class Menu():
         """
         self.is_visible = visibility
 
-    def render(self, surface: pygame.Surface):
-        if self.is_visible:
-            background = pygame.transform.box_blur(surface, 10)
-            if self.logo != None:
-                background.blit(self.logo, self.logo_position)
-            for button in self.buttons:
-                button.draw(background)
-            surface.blit(background, (0,0))
+    def draw(self, surface: pygame.Surface):
+        """
+        Draws the logo and the buttons of the menu over the given
+        surface, without blurring it.
 
-    def update(self):
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface to be drawn over.
+        """
+        if self.logo != None:
+            surface.blit(self.logo, self.logo_position)
+        for button in self.buttons:
+            button.draw(surface)
+
+    def update(self, mouse_pos: tuple | None = None, seconds: float = FRAME_DURATION):
+        """
+        Updates the highlight and the animations of the menu.
+
+        Parameters
+        ----------
+        mouse_pos: tuple | None
+            position of the mouse pointer on the game canvas.
+            If None, the window position is used.
+        seconds: float
+            time elapsed since the last update.
+        """
         if self.is_visible:
-            self.check_highlight(pygame.mouse.get_pos())
-            for button in self.buttons:
-                button.update()
+            if mouse_pos is None:
+                mouse_pos = pygame.mouse.get_pos()
+            self.check_highlight(mouse_pos)
+            self.timeline.advance(seconds)
+
+    def is_animating(self) -> bool:
+        """
+        Verifies if one of the buttons is animating.
+
+        Returns
+        -------
+        bool
+            True if a button is animating
+            False otherwise.
+        """
+        return bool(self.timeline)
 
     def reset(self):
         self.cursor = 0
@@ -214,7 +252,7 @@ class InGameMenu(Menu):
             names of the buttons to display.
         """
         super().__init__(keybindings, button_names)
-        self.pause_button = PauseButton((765, 40))
+        self.pause_button = PauseButton((765, 40), self.timeline)
 
     def check_press(self, point: tuple) -> str:
         """
@@ -237,20 +275,16 @@ class InGameMenu(Menu):
         return super().check_press(point)
 
 
-    def render(self, surface: pygame.Surface):
+    def draw(self, surface: pygame.Surface):
+        self.pause_button.draw(surface)
+        super().draw(surface)
+
+    def update(self, mouse_pos: tuple | None = None, seconds: float = FRAME_DURATION):
         if self.is_visible:
-            background = pygame.transform.box_blur(surface, 10)
-            self.pause_button.draw(background)
-            background.blit(self.logo, self.logo_position)
-            for button in self.buttons:
-                button.draw(background)
-            surface.blit(background, (0,0))
+            super().update(mouse_pos, seconds)
         else:
-            self.pause_button.draw(surface)
-
-    def update(self):
-        super().update()
-        self.pause_button.update()
+            # the pause button animates during the match too
+            self.timeline.advance(seconds)
 
     def reset(self):
         super().reset()
@@ -260,7 +294,7 @@ class Button(pygame.sprite.Sprite):
     """
     Represent a button in the menu.
     """
-    def __init__(self, position: tuple, text: str):
+    def __init__(self, position: tuple, text: str, timeline: Timeline | None = None):
         """
         Construct the button sprite.
 
@@ -270,21 +304,25 @@ class Button(pygame.sprite.Sprite):
             position of the button
         text: str
             text to display on the button
+        timeline: Timeline | None
+            timeline running the animations of the button.
+            If None, the button has its own.
         """
         super().__init__()
-        font = pygame.font.Font("assets/fonts/Jersey15-Regular.ttf", 40)
+        font = pygame.font.Font(asset("assets/fonts/Jersey15-Regular.ttf"), 40)
         self.text = font.render(text, False, "White")
         self.action = text
         self.position = position
         self.images = [
-            pygame.image.load(f"assets/graphics/standard_button/button{i}.png")
+            pygame.image.load(asset(f"assets/graphics/standard_button/button{i}.png"))
             for i in range(4)
         ]
         self.image = self.images[0].copy()
         self.rect = self.image.get_rect(center=self.position)
         self.frame_index = 0
         self.is_animating = False
-        self.animation_direction = +1
+        self.timeline = Timeline() if timeline is None else timeline
+        self.press_animation = Animation(BUTTON_PRESS_DURATION, self.animate_press, self.end_press)
 
     def check_position(self, point: tuple) -> bool:
         """
@@ -324,26 +362,28 @@ class Button(pygame.sprite.Sprite):
         Presses the button.
         """
         self.is_animating = True
+        self.timeline.play(self.press_animation)
 
-    def control_animation_status(self):
+    def animate_press(self, progress: float):
         """
-        Updates the direction of the animation.
+        Goes through the frames up to the last one and back.
+
+        Parameters
+        ----------
+        progress: float
+            progress of the animation, from 0 to 1.
         """
-        if self.frame_index >= len(self.images):
-            self.frame_index = len(self.images) -1
-            self.animation_direction = -1
-        if self.animation_direction == -1 and self.frame_index <= 0:
-            self.frame_index = 1
-            self.is_animating = False
-            self.animation_direction = +1
+        self.frame_index = (len(self.images) - 1) * (1 - abs(2 * progress - 1))
 
-    def update(self):
-        if self.is_animating:
-            self.frame_index += 0.4 * self.animation_direction
-            self.control_animation_status()
+    def end_press(self):
+        """
+        Leaves the button highlighted at the end of the press.
+        """
+        self.frame_index = 1
+        self.is_animating = False
 
     def draw(self, surface: pygame.Surface):
-        self.image = self.images[int(self.frame_index)].copy()
+        self.image = self.images[int(self.frame_index)]
         self.rect = self.image.get_rect(center=self.position)
         text_rect = self.text.get_rect(center=self.position)
         surface.blit(self.image, self.rect.topleft)
@@ -353,7 +393,7 @@ class SettingButton(Button):
     """
     Button dedicated for settings operations.
     """
-    def __init__(self, position: tuple, is_left=True):
+    def __init__(self, position: tuple, is_left=True, timeline: Timeline | None = None):
         """
         Constructs the setting button.
 
@@ -364,28 +404,32 @@ class SettingButton(Button):
         is_left: bool
             True if the button should be left oriented.
             False otherwise.
+        timeline: Timeline | None
+            timeline running the animations of the button.
+            If None, the button has its own.
         """
         self.position = position
         if is_left:
             self.images = [
-                pygame.image.load(f"assets/graphics/settings_button/settings_button{i}.png")
+                pygame.image.load(asset(f"assets/graphics/settings_button/settings_button{i}.png"))
                 for i in range(5)
             ]
         else:
             self.images = [
                 pygame.transform.flip(
-                    pygame.image.load(f"assets/graphics/settings_button/settings_button{i}.png"), True, False)
+                    pygame.image.load(asset(f"assets/graphics/settings_button/settings_button{i}.png")), True, False)
                 for i in range(5)
             ]
         self.image = self.images[0].copy()
         self.rect = self.image.get_rect(topleft=position)
         self.frame_index = 0
         self.is_animating = False
-        self.animation_direction = +1
+        self.timeline = Timeline() if timeline is None else timeline
+        self.press_animation = Animation(BUTTON_PRESS_DURATION, self.animate_press, self.end_press)
         self.is_visible = False
 
     def draw(self, surface: pygame.Surface):
-        self.image = self.images[int(self.frame_index)].copy()
+        self.image = self.images[int(self.frame_index)]
         self.rect = self.image.get_rect(topleft=self.position)
         surface.blit(self.image, self.rect.topleft)
 
@@ -394,7 +438,7 @@ class PauseButton(Button):
     """
     Button dedicated to pause or restore the game.
     """
-    def __init__(self, position):
+    def __init__(self, position, timeline: Timeline | None = None):
         """
         Constructs the pause button.
 
@@ -402,10 +446,13 @@ class PauseButton(Button):
         ----------
         position: tuple
             position of the button
+        timeline: Timeline | None
+            timeline running the animations of the button.
+            If None, the button has its own.
         """
         self.position = position
         self.images = [
-            pygame.image.load(f"assets/graphics/pause_button/pause{i}.png")
+            pygame.image.load(asset(f"assets/graphics/pause_button/pause{i}.png"))
             for i in range(6)
         ]
         self.image = self.images[0].copy()
@@ -413,20 +460,30 @@ class PauseButton(Button):
         self.frame_index = 0
         self.is_animating = False
         self.animation_direction = +1
-        self.press_sound = pygame.mixer.Sound("assets/audio/pause_sound.mp3")
+        self.timeline = Timeline() if timeline is None else timeline
+        self.press_animation = Animation(PAUSE_PRESS_DURATION, self.animate_press, self.end_press)
+        self.press_sound = load_sound("assets/audio/pause_sound.mp3")
+
+    def animate_press(self, progress: float):
+        """
+        Goes to the last frame, or back to the first one
+        if the button was already pressed.
 
-    def control_animation_status(self):
+        Parameters
+        ----------
+        progress: float
+            progress of the animation, from 0 to 1.
         """
-        Updates the direction of the animation.
+        if self.animation_direction == -1:
+            progress = 1 - progress
+        self.frame_index = (len(self.images) - 1) * progress
+
+    def end_press(self):
         """
-        if self.animation_direction == 1 and self.frame_index >= len(self.images):
-            self.frame_index = len(self.images) -1
-            self.animation_direction = -1
-            self.is_animating = False
-        if self.animation_direction == -1 and self.frame_index <= 0:
-            self.frame_index = 0
-            self.animation_direction = +1
-            self.is_animating = False
+        Inverts the direction of the next press.
+        """
+        self.is_animating = False
+        self.animation_direction = -self.animation_direction
 
     def press(self):
         """
@@ -436,11 +493,12 @@ class PauseButton(Button):
         self.press_sound.play()
 
     def draw(self, surface: pygame.Surface):
-        self.image = self.images[int(self.frame_index)].copy()
+        self.image = self.images[int(self.frame_index)]
         self.rect = self.image.get_rect(center=self.position)
         surface.blit(self.image, self.rect.topleft)
 
     def reset(self):
+        self.timeline.stop(self.press_animation)
         self.frame_index = 0
         self.is_animating = False
         self.animation_direction = +1
@@ -0,0 +1,195 @@
+import numpy as np
+import pygame
+from src.env.pong_env import PongEnv
+from src.utils.assets import asset
+
+OBSERVATION_RESOLUTION = (84, 84)
+FRAME_STACK = 4
+PADDLE_COLOR = 255
+BALL_COLOR = 255
+# Weights of the red, green and blue channels in the grayscale conversion
+LUMINANCE = (0.299, 0.587, 0.114)
+
+
+class PixelRenderer:
+    """
+    Draws the field, the paddles and the ball of an environment into a
+    small off-screen surface, without any display.
+    The pixels are exposed as a NumPy view of the surface, obtained once
+    through pygame.surfarray, so rendering does not copy or allocate.
+    The view keeps the surface locked, so everything is drawn through it.
+    """
+    def __init__(self, env: PongEnv, resolution: tuple = OBSERVATION_RESOLUTION, grayscale: bool = True):
+        """
+        Initialise the renderer.
+
+        Parameters
+        ----------
+        env: PongEnv
+            environment to render.
+        resolution: tuple
+            width and height of the observation.
+        grayscale: bool
+            True for a single channel 8 bit observation,
+            False for an RGB one.
+        """
+        self.env = env
+        self.width, self.height = resolution
+        self.grayscale = grayscale
+        field_x, field_y = env.ball.field_x, env.ball.field_y
+        self.origin = (field_x[0], field_y[0])
+        self.scale = (self.width / (field_x[1] - field_x[0]),
+            self.height / (field_y[1] - field_y[0]))
+
+        field = pygame.image.load(asset('assets/graphics/field.png'))
+        field = field.subsurface((field_x[0], field_y[0],
+            field_x[1] - field_x[0], field_y[1] - field_y[0]))
+        field = pygame.transform.smoothscale(field.convert(), resolution)
+        field_rgb = pygame.surfarray.array3d(field)
+        if grayscale:
+            self.surface = pygame.Surface(resolution, depth=8)
+            self.surface.set_palette([(i, i, i) for i in range(256)])
+            # pixels2d is indexed (x, y), the transpose is a (y, x) view
+            self.pixels = pygame.surfarray.pixels2d(self.surface).T
+            self.background = (field_rgb @ np.array(LUMINANCE)).astype(np.uint8).T
+        else:
+            self.surface = pygame.Surface(resolution, depth=32)
+            self.pixels = pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+            self.background = field_rgb.transpose(1, 0, 2).copy()
+
+    def to_pixels(self, rect: pygame.Rect) -> tuple[slice, slice]:
+        """
+        Converts a rect of the field into the slices of the observation,
+        at least one pixel wide and high.
+
+        Parameters
+        ----------
+        rect: pygame.Rect
+            rect in field coordinates.
+
+        Returns
+        -------
+        tuple[slice, slice]
+            rows and columns covered by the rect.
+        """
+        left = min(max(int((rect.left - self.origin[0]) * self.scale[0]), 0), self.width - 1)
+        top = min(max(int((rect.top - self.origin[1]) * self.scale[1]), 0), self.height - 1)
+        right = max(int((rect.right - self.origin[0]) * self.scale[0]), left + 1)
+        bottom = max(int((rect.bottom - self.origin[1]) * self.scale[1]), top + 1)
+        return (slice(top, bottom), slice(left, right))
+
+    def render(self) -> np.ndarray:
+        """
+        Draws the current state of the environment.
+
+        Returns
+        -------
+        np.ndarray
+            view of the pixels, shaped (height, width) if grayscale,
+            (height, width, 3) otherwise. It is overwritten by the
+            next render.
+        """
+        self.pixels[...] = self.background
+        self.pixels[self.to_pixels(self.env.agent.rect)] = PADDLE_COLOR
+        self.pixels[self.to_pixels(self.env.opponent.rect)] = PADDLE_COLOR
+        self.pixels[self.to_pixels(self.env.ball.rect)] = BALL_COLOR
+        return self.pixels
+
+
+class FrameStack:
+    """
+    Keeps the last frames of a renderer in a preallocated ring buffer.
+    """
+    def __init__(self, renderer: PixelRenderer, size: int = FRAME_STACK):
+        """
+        Initialise the frame stack.
+
+        Parameters
+        ----------
+        renderer: PixelRenderer
+            renderer producing the frames.
+        size: int
+            number of frames kept.
+        """
+        self.renderer = renderer
+        self.size = size
+        self.frames = np.zeros((size,) + renderer.pixels.shape, dtype=np.uint8)
+        self.stacked = np.zeros_like(self.frames)
+        self.index = 0
+
+    def reset(self):
+        """
+        Fills the stack with the current frame.
+        """
+        self.frames[...] = self.renderer.render()
+        self.index = 0
+
+    def push(self):
+        """
+        Renders a frame and stores it in place of the oldest one.
+        """
+        self.frames[self.index] = self.renderer.render()
+        self.index = (self.index + 1) % self.size
+
+    def observation(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray
+            the frames from the oldest to the newest, shaped
+            (size, height, width[, 3]). The array is reused
+            by the next call.
+        """
+        order = (np.arange(self.size) + self.index) % self.size
+        np.take(self.frames, order, axis=0, out=self.stacked)
+        return self.stacked
+
+
+class PixelPongEnv:
+    """
+    PongEnv whose observations are stacked frames of pixels.
+    """
+    def __init__(self, resolution: tuple = OBSERVATION_RESOLUTION, grayscale: bool = True,
+        frame_stack: int = FRAME_STACK, **env_kwargs):
+        """
+        Initialise the environment.
+
+        Parameters
+        ----------
+        resolution: tuple
+            width and height of the frames.
+        grayscale: bool
+            True for single channel frames, False for RGB ones.
+        frame_stack: int
+            number of frames of every observation.
+        env_kwargs:
+            arguments of the PongEnv.
+        """
+        self.env = PongEnv(**env_kwargs)
+        self.frames = FrameStack(PixelRenderer(self.env, resolution, grayscale), frame_stack)
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """
+        Starts a new match.
+
+        Returns
+        -------
+        tuple[np.ndarray, dict]
+            the first observation and an empty info dictionary.
+        """
+        _, info = self.env.reset(seed)
+        self.frames.reset()
+        return self.frames.observation(), info
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        """
+        Applies the action and simulates one tick.
+
+        Returns
+        -------
+        tuple[np.ndarray, float, bool, bool, dict]
+            observation, reward, terminated, truncated and info.
+        """
+        reward, terminated, truncated, hitter = self.env.advance(action)
+        self.frames.push()
+        return self.frames.observation(), reward, terminated, truncated, {"hitter": hitter}
@@ -0,0 +1,206 @@
+import random
+import numpy as np
+from src.entities.ball import Ball
+from src.entities.player import Player, PlayerNPC
+from src.entities.scoreboard import BEST_OF_THREE, Score
+from src.match import Match
+from src.settings import DEFAULT_SETTINGS
+from src.utils.constants import UP, DOWN, STAY
+from src.utils.headless import init_headless
+
+# Actions of the agent, by index
+ACTIONS = [STAY, UP, DOWN]
+OBSERVATION_SIZE = 10
+HIT_REWARD = 0.1
+POINT_REWARD = 1.0
+MAX_STEPS = 20000
+
+
+class AgentPlayer(Player):
+    """
+    Player moved by the actions of an agent instead of the keyboard.
+    """
+    def __init__(self, is_player2: bool, field_dimensions: tuple):
+        """
+        Initialise the agent player.
+
+        Parameters
+        ----------
+        is_player2: bool
+            True if it is the second player,
+            False otherwise.
+        field_dimensions: tuple
+            dimension of the playing field.
+        """
+        super().__init__(is_player2, {UP: 0, DOWN: 0}, field_dimensions)
+        self.action = STAY
+
+    def movement(self):
+        """
+        Moves the player following the last action.
+        """
+        self.move(self.action)
+
+
+class PongEnv:
+    """
+    Environment where an agent controls the left player against the NPC.
+    It follows the reset()/step(action) interface of gym:
+        - actions: 0 stay, 1 up, 2 down.
+        - observation: float32 array with ball x, ball y, ball vector x,
+          ball vector y, agent y, opponent y, set score of the agent and of
+          the opponent, match score of the agent and of the opponent.
+          Positions are in pixels of the field.
+        - reward: HIT_REWARD when the agent hits the ball, +/- POINT_REWARD
+          when the agent wins or loses a point.
+        - terminated when the match is won, truncated after max_steps.
+    The serve happens as soon as the point starts.
+    """
+    def __init__(self, best_of: int = BEST_OF_THREE, set_points: int = 5,
+        max_steps: int = MAX_STEPS, field_dimensions: tuple = None, rally_log=None):
+        """
+        Initialise the environment.
+
+        Parameters
+        ----------
+        best_of: int
+            maximum number of matches to play.
+        set_points: int
+            maximum number of set per match.
+        max_steps: int
+            steps after which an episode is truncated.
+        field_dimensions: tuple
+            dimension of the playing field, the default one if None.
+        rally_log: RallyLog | None
+            log receiving the finished rallies, if any.
+        """
+        init_headless()
+        if field_dimensions is None:
+            field_dimensions = DEFAULT_SETTINGS["field_dimensions"]
+        self.agent = AgentPlayer(False, field_dimensions)
+        self.opponent = PlayerNPC(True, field_dimensions)
+        self.ball = Ball(field_dimensions, sound_effects=False)
+        self.score = Score(best_of, set_points)
+        self.max_steps = max_steps
+        self.rally_log = rally_log
+        self.random = random.Random()
+        self.match = None
+        self.steps = 0
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """
+        Starts a new match.
+
+        Parameters
+        ----------
+        seed: int | None
+            seed for the choice of the first server.
+
+        Returns
+        -------
+        tuple[np.ndarray, dict]
+            the first observation and an empty info dictionary.
+        """
+        if seed is not None:
+            self.random.seed(seed)
+        for player in (self.agent, self.opponent):
+            player.reset()
+            player.can_move = False
+        self.agent.action = STAY
+        self.ball.reset()
+        self.score.reset()
+        self.match = Match([self.agent, self.opponent], self.ball, self.score,
+            self.random.randint(0, 1), self.rally_log)
+        self.serve()
+        self.steps = 0
+        return self.observation(), {}
+
+    def serve(self):
+        """
+        Makes the serve of the current point.
+        """
+        self.match.serve()
+        self.match.serving_movement(False)
+
+    def advance(self, action: int) -> tuple[float, bool, bool, int]:
+        """
+        Applies the action and simulates one tick, without
+        building the observation.
+
+        Parameters
+        ----------
+        action: int
+            index of the action in ACTIONS.
+
+        Returns
+        -------
+        tuple[float, bool, bool, int]
+            reward, terminated, truncated and the player who hit the
+            ball during the tick (-1 if nobody).
+        """
+        self.agent.action = ACTIONS[action]
+        self.match.update()
+        hitter = self.match.check_collisions()
+        reward = HIT_REWARD if hitter == 0 else 0.0
+        terminated = False
+        if self.match.is_point_over():
+            scorer = self.match.end_point()
+            reward += POINT_REWARD if scorer == 0 else -POINT_REWARD
+            if self.score.match_win_state() != -1:
+                terminated = True
+            else:
+                self.match.soft_reset()
+                self.serve()
+        self.steps += 1
+        truncated = not terminated and self.steps >= self.max_steps
+        return reward, terminated, truncated, hitter
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        """
+        Applies the action and simulates one tick.
+
+        Parameters
+        ----------
+        action: int
+            index of the action in ACTIONS.
+
+        Returns
+        -------
+        tuple[np.ndarray, float, bool, bool, dict]
+            observation, reward, terminated, truncated and info,
+            where info contains the player who hit the ball.
+        """
+        reward, terminated, truncated, hitter = self.advance(action)
+        return self.observation(), reward, terminated, truncated, {"hitter": hitter}
+
+    def observe(self, out: np.ndarray):
+        """
+        Writes the observation in the given array.
+
+        Parameters
+        ----------
+        out: np.ndarray
+            float32 array of OBSERVATION_SIZE elements.
+        """
+        ball_vector = self.ball.get_ball_vector()
+        out[0] = self.ball.rect.centerx
+        out[1] = self.ball.rect.centery
+        out[2] = ball_vector[0]
+        out[3] = ball_vector[1]
+        out[4] = self.agent.rect.centery
+        out[5] = self.opponent.rect.centery
+        out[6] = self.score.set_score[0]
+        out[7] = self.score.set_score[1]
+        out[8] = self.score.match_score[0]
+        out[9] = self.score.match_score[1]
+
+    def observation(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray
+            the current observation.
+        """
+        out = np.empty(OBSERVATION_SIZE, dtype=np.float32)
+        self.observe(out)
+        return out
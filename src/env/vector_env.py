@@ -0,0 +1,235 @@
+import multiprocessing
+import os
+import time
+import numpy as np
+from src.env.pong_env import OBSERVATION_SIZE, PongEnv
+
+
+class SyncVectorEnv:
+    """
+    Steps N environments in the same process with a single call.
+    Finished environments are reset automatically, their last
+    observation is returned in info["final_observation"].
+    """
+    def __init__(self, num_envs: int, **env_kwargs):
+        """
+        Initialise the environments.
+
+        Parameters
+        ----------
+        num_envs: int
+            number of environments.
+        env_kwargs:
+            arguments of every PongEnv.
+        """
+        self.num_envs = num_envs
+        self.envs = [PongEnv(**env_kwargs) for _ in range(num_envs)]
+        self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """
+        Resets all the environments.
+
+        Parameters
+        ----------
+        seed: int | None
+            seed of the first environment, the following ones
+            get seed + 1, seed + 2...
+
+        Returns
+        -------
+        tuple[np.ndarray, dict]
+            the observations, shaped (num_envs, OBSERVATION_SIZE),
+            and an empty info dictionary.
+        """
+        for i, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + i)
+            env.observe(self.observations[i])
+        return self.observations.copy(), {}
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Steps every environment with its action.
+
+        Parameters
+        ----------
+        actions: Sequence[int]
+            one action per environment.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]
+            observations, rewards, terminated, truncated and info.
+        """
+        final_observations = {}
+        for i, env in enumerate(self.envs):
+            reward, terminated, truncated, _ = env.advance(int(actions[i]))
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            if terminated or truncated:
+                final_observations[i] = env.observation()
+                env.reset()
+            env.observe(self.observations[i])
+        return (self.observations.copy(), self.rewards.copy(), self.terminated.copy(),
+            self.truncated.copy(), {"final_observation": final_observations})
+
+    def close(self):
+        """
+        Nothing to release for the in-process environments.
+        """
+
+
+def subprocess_worker(connection, num_envs: int, env_kwargs: dict):
+    """
+    Runs a SyncVectorEnv in a subprocess, executing the
+    commands received through the connection.
+
+    Parameters
+    ----------
+    connection: multiprocessing.connection.Connection
+        end of the pipe towards the main process.
+    num_envs: int
+        number of environments of the worker.
+    env_kwargs: dict
+        arguments of every PongEnv.
+    """
+    envs = SyncVectorEnv(num_envs, **env_kwargs)
+    while True:
+        command, data = connection.recv()
+        if command == "step":
+            connection.send(envs.step(data))
+        elif command == "reset":
+            connection.send(envs.reset(data))
+        elif command == "close":
+            connection.close()
+            break
+
+
+class SubprocVectorEnv:
+    """
+    Steps N environments split across worker processes with a single call.
+    Every worker runs a SyncVectorEnv over its share of the environments.
+    """
+    def __init__(self, num_envs: int, num_workers: int | None = None, **env_kwargs):
+        """
+        Starts the workers.
+
+        Parameters
+        ----------
+        num_envs: int
+            number of environments.
+        num_workers: int | None
+            number of processes, one per CPU (at most num_envs) if None.
+        env_kwargs:
+            arguments of every PongEnv.
+        """
+        if num_workers is None:
+            num_workers = min(num_envs, os.cpu_count() or 1)
+        self.num_envs = num_envs
+        self.sizes = [num_envs // num_workers + (1 if i < num_envs % num_workers else 0)
+            for i in range(num_workers)]
+        # SDL does not survive a fork, every worker starts a fresh interpreter
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        for size in self.sizes:
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=subprocess_worker,
+                args=(worker_connection, size, env_kwargs), daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """
+        Resets all the environments.
+
+        Parameters
+        ----------
+        seed: int | None
+            seed of the first environment, the following ones
+            get seed + 1, seed + 2...
+
+        Returns
+        -------
+        tuple[np.ndarray, dict]
+            the observations, shaped (num_envs, OBSERVATION_SIZE),
+            and an empty info dictionary.
+        """
+        offset = 0
+        for connection, size in zip(self.connections, self.sizes):
+            connection.send(("reset", None if seed is None else seed + offset))
+            offset += size
+        observations = [connection.recv()[0] for connection in self.connections]
+        return np.concatenate(observations), {}
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Steps every environment with its action.
+
+        Parameters
+        ----------
+        actions: Sequence[int]
+            one action per environment.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]
+            observations, rewards, terminated, truncated and info.
+        """
+        actions = np.asarray(actions)
+        offset = 0
+        for connection, size in zip(self.connections, self.sizes):
+            connection.send(("step", actions[offset:offset + size]))
+            offset += size
+        results = [connection.recv() for connection in self.connections]
+        final_observations = {}
+        offset = 0
+        for result, size in zip(results, self.sizes):
+            for i, observation in result[4]["final_observation"].items():
+                final_observations[offset + i] = observation
+            offset += size
+        return (np.concatenate([result[0] for result in results]),
+            np.concatenate([result[1] for result in results]),
+            np.concatenate([result[2] for result in results]),
+            np.concatenate([result[3] for result in results]),
+            {"final_observation": final_observations})
+
+    def close(self):
+        """
+        Stops the workers.
+        """
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+
+
+def measure_throughput(envs, steps: int = 1000) -> float:
+    """
+    Steps the environments with random actions.
+
+    Parameters
+    ----------
+    envs: SyncVectorEnv | SubprocVectorEnv
+        environments to measure.
+    steps: int
+        number of vector steps.
+
+    Returns
+    -------
+    float
+        environment steps per second.
+    """
+    generator = np.random.default_rng(0)
+    actions = generator.integers(0, 3, size=(steps, envs.num_envs))
+    envs.reset(0)
+    start = time.perf_counter()
+    for i in range(steps):
+        envs.step(actions[i])
+    return steps * envs.num_envs / (time.perf_counter() - start)
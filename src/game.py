@@ -1,14 +1,22 @@
 import pygame
 from sys import exit
-from src.entities.player import Player, PlayerNPC
-from src.entities.ball import PLAYING_STATE, Ball, OUT_STATE, HOLDING_STATE
-from src.entities.scoreboard import Scoreboard
 import src.entities.ui as ui
-from src.game_settings import GameSettings
-from src.settings import load_settings
-from random import randint
+import src.utils.blur as blur
+from src.settings import DEFAULT_SETTINGS, SETTINGS_SERVICE, load_settings
+from src.utils.frame_pacer import FRAME_RATES, FramePacer
+from src.utils.gc_control import GCControl
+from src.utils.input_queue import INPUT
+from src.utils.display import Display
+from src.utils.scheduler import TICK_DURATION
+from src.utils.surface_pool import SCRATCH
 from src import game_status as status
+from src.scenes.scene import SceneStack
+from src.utils.assets import asset
 
+# Milliseconds waited for an event while the scenes are idle
+IDLE_TIMEOUT = 500
+# Longest frame time simulated, so a stall does not fast-forward the game
+MAX_FRAME_TIME = 0.1
 
 class Game:
     def __init__(self):
@@ -17,113 +25,120 @@ class Game:
         """
         pygame.display.set_caption('Pong')
         self.settings = load_settings()
-        self.field = pygame.image.load('assets/graphics/field.png')
-        self.screen = pygame.display.set_mode(self.settings["resolution"])
-        self.clock = pygame.time.Clock()
+        self.field = pygame.image.load(asset('assets/graphics/field.png'))
+        self.display = Display(self.settings)
+        self.screen = self.display.canvas
+        # the input is drained while the pacer waits, to stamp the key presses
+        self.pacer = FramePacer(DEFAULT_SETTINGS["target_fps"], INPUT.poll)
+        self.apply_settings()
+        # seconds elapsed during the last frame, and not simulated yet
+        self.frame_time = TICK_DURATION
+        self.accumulator = 0.0
         self.running = True
-        self.game_status = status.START_MENU
-        self.previous_status = status.PAUSED
-        self.start_menu = ui.Menu(
-            self.settings["keybindings"]["ui_movement"],
-            [ui.START_GAME, ui.EXIT_GAME],
-        )
-        self.start_menu.display(True)
-        self.in_game_menu = ui.InGameMenu(
-            self.settings["keybindings"]["ui_movement"],
-            [ui.RESTART_GAME, ui.EXIT_GAME]
-        )
-        self.game_settings = GameSettings(self.settings["keybindings"]["ui_movement"])
-        self.current_menu = self.start_menu
-        self.players = []
+        self.profiler = None
+        if self.settings["profiler"]:
+            self.install_profiler()
+        # the scenes, and the entities they use, are imported when first shown
+        self.scenes = SceneStack(self, {
+            status.START_MENU: "src.scenes.menus.StartMenuScene",
+            status.SETTINGS: "src.scenes.menus.SettingsScene",
+            status.PLAYING: "src.scenes.playing.PlayingScene",
+            status.PAUSED: "src.scenes.menus.PauseScene",
+            status.END_GAME: "src.scenes.menus.EndGameScene",
+            status.MULTI_BALL: "src.scenes.multiball.MultiBallScene",
+        })
+        self.scenes.push(status.START_MENU)
+        self.gc_control = None
+        if self.settings["gc_control"] or self.settings["frame_stats"]:
+            self.gc_control = GCControl(self.settings["gc_control"])
+            self.gc_control.start()
 
-        self.ball = pygame.sprite.GroupSingle(
-            Ball(
-                self.settings["field_dimensions"]),
-        )
-        self.last_hit = randint(0,1)
-        self.serving = self.last_hit
-        self.serving_timer = pygame.USEREVENT + 1
-        pygame.time.set_timer(self.serving_timer, 0)
+    def apply_settings(self):
+        """
+        Applies the settings that take effect without a restart:
+        the frame rate and the blur preset. Called again when the
+        settings file changes while the game runs; the display
+        settings are only read at startup.
+        """
+        target_fps = self.settings["target_fps"]
+        if target_fps not in FRAME_RATES:
+            target_fps = DEFAULT_SETTINGS["target_fps"]
+        self.pacer.set_target_fps(target_fps)
+        blur_preset = self.settings["blur"]
+        if blur_preset not in blur.BLUR_PRESETS:
+            blur_preset = DEFAULT_SETTINGS["blur"]
+        blur.configure(blur_preset)
 
-    def set_game_settings(self, settings: dict):
+    def reload_settings(self):
+        """
+        Applies the changes of the settings file, if any.
+        The keybindings are updated in place: the menus use them at once,
+        the players from the next game.
         """
-        Set the settings for the game:
-            - Number of players
-            - Set points
-            - Match wins
+        if SETTINGS_SERVICE.poll():
+            self.apply_settings()
 
-        Parameters
-        ----------
-        settings: dict
-            contains the selected settings for the current game.
-            It must contains the followings keys: players,
-            best_of and set_points
+    def install_profiler(self):
+        """
+        Instruments the main sections of the frame.
+        F3 toggles the overlay, the timings are exported on exit.
+        """
+        from src.utils.profiler import Profiler
+        from src.entities.scoreboard import Scoreboard, MessageEvent
+        from src.scenes.menus import MenuScene
+        from src.scenes.playing import PlayingScene
+        self.profiler = Profiler()
+        self.profiler.instrument(self, "handle_events", "events")
+        self.profiler.instrument(self, "update", "update")
+        self.profiler.instrument(self, "render", "render")
+        self.profiler.instrument(PlayingScene, "check_collisions", "collisions")
+        self.profiler.instrument(Scoreboard, "draw", "scoreboard")
+        self.profiler.instrument(MessageEvent, "render", "message")
+        self.profiler.instrument(MenuScene, "render", "menu")
+        self.profiler.instrument(MenuScene, "refresh_backdrop", "menu backdrop")
+        self.profiler.instrument(self.display, "present", "present")
 
+    @property
+    def game_status(self) -> int:
+        """
+        Returns
+        -------
+        int
+            the status of the scene on top of the stack.
         """
-        self.players = [
-            pygame.sprite.GroupSingle(Player(
-                False,
-                self.settings["keybindings"]["first_player"],
-                self.settings["field_dimensions"]))
-        ]
-        if settings["players"] > 1:
-            self.players.append(
-                        pygame.sprite.GroupSingle(Player(
-                            True,
-                            self.settings["keybindings"]["second_player"],
-                            self.settings["field_dimensions"])))
-        else:
-            self.players.append(
-                        pygame.sprite.GroupSingle(PlayerNPC(
-                            True,
-                            self.settings["field_dimensions"]))
-                    )
-        self.serving_movement(True)
-        self.ball.sprite.serve_positioning(self.players[self.serving].sprite.serve_position(self.ball.sprite.get_size()[1]))
-        self.scoreboard = Scoreboard(settings["best_of"], settings["set_points"], self.settings["field_dimensions"])
+        return self.scenes.top().status
 
-    def handle_events(self):
+    def handle_events(self, events: list[pygame.event.Event] | None = None):
         """
         Handles the pygames events, like:
             - quit
             - mouse clicks
             - keystrokes
             - timers
+        The events other than quit are handled by the top scene,
+        in the order they arrived, after the key state is updated.
+
+        Parameters
+        ----------
+        events: list[pygame.event.Event] | None
+            events just removed from SDL's queue, handled after the ones
+            queued by the input. If None, the pending events are handled.
         """
-        for event in pygame.event.get():
+        for event in INPUT.take(events):
             if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    self.menu_actions(
-                        self.current_menu.check_press(event.pos)
-                    )
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    self.menu_actions(
-                        self.current_menu.press()
-                    )
-                if (self.game_status != status.START_MENU):
-                    if event.key == pygame.K_r:
-                        self.soft_reset()
-                        self.game_status = status.PLAYING
-                    if event.key == pygame.K_SPACE and self.ball.sprite.state == HOLDING_STATE:
-                        self.serve()
-                        self.serving_movement(False)
-                        pygame.time.set_timer(self.serving_timer, 0)
-                    if event.key == pygame.K_p:
-                        self.in_game_menu.pause_button.press()
-                        self.menu_actions(ui.PAUSE)
-            if event.type == self.serving_timer and self.ball.sprite.state == HOLDING_STATE:
-                self.serve()
-                self.serving_movement(False)
-                pygame.time.set_timer(self.serving_timer, 0)
+                self.quit()
+            if (self.profiler is not None and event.type == pygame.KEYDOWN
+                and event.key == pygame.K_F3):
+                self.profiler.toggle_overlay()
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+                event.pos = self.display.to_logical(event.pos)
+            self.scenes.handle_event(event)
 
     def menu_actions(self, action: str):
         """
         Performs the requested menu action. The available actions are:
             - START_GAME
+            - MULTI_BALL
             - RESTART_GAME
             - GAME_SETTINGS
             - EXIT_GAME
@@ -136,148 +151,130 @@ class Game:
         """
         match action:
             case ui.START_GAME:
-                self.current_menu.display(False)
-                self.current_menu = self.game_settings
-                self.current_menu.display(True)
+                self.scenes.push(status.SETTINGS)
+            case ui.MULTI_BALL:
+                self.scenes.get(status.MULTI_BALL).start()
+                self.scenes.switch(status.MULTI_BALL)
             case ui.RESTART_GAME:
-                self.soft_reset()
-                self.scoreboard.reset()
+                playing = self.scenes.get(status.PLAYING)
+                playing.restart()
+                if self.game_status == status.END_GAME:
+                    playing.in_game_menu.pause_button.press()
+                    self.scenes.pop()
+                else:
+                    self.scenes.top().refresh_backdrop()
             case ui.GAME_SETTINGS:
-                self.set_game_settings(self.game_settings.get_settings())
-                self.game_status = status.PLAYING
-                self.current_menu.display(False)
-                self.current_menu = self.in_game_menu
-                self.current_menu.display(False)
-                pygame.time.set_timer(self.serving_timer, 3000)
+                playing = self.scenes.get(status.PLAYING)
+                playing.start(self.scenes.get(status.SETTINGS).menu.get_settings())
+                self.scenes.switch(status.PLAYING)
             case ui.EXIT_GAME:
-                if self.game_status == status.START_MENU:
-                    pygame.quit()
-                    exit()
+                if self.game_status in (status.START_MENU, status.SETTINGS):
+                    self.quit()
                 else:
-                    self.soft_reset()
-                    self.current_menu.reset()
-                    self.current_menu.display(False)
-                    self.current_menu = self.start_menu
-                    self.current_menu.display(True)
-                    self.game_status = status.START_MENU
-                    self.scoreboard.reset()
-                    pygame.time.set_timer(self.serving_timer, 0)
+                    self.scenes.switch(status.START_MENU)
             case ui.PAUSE:
-                if self.game_status != status.PAUSED:
-                    self.in_game_menu.display(True)
-                    self.previous_status = self.game_status
-                    pygame.time.set_timer(self.serving_timer, 0)
-                    self.game_status = status.PAUSED
-                else:
-                    self.in_game_menu.display(False)
-                    pygame.time.set_timer(self.serving_timer, 3000)
-                    self.game_status = self.previous_status
+                if self.game_status == status.PAUSED:
+                    self.scenes.pop()
+                elif self.game_status != status.END_GAME:
+                    self.scenes.push(status.PAUSED)
 
-    def serving_movement(self, is_serving: bool):
+    def update(self):
         """
-        Abilitate or disabilitate the serving player to move before serving.
-
-        Parameters
-        ----------
-        is_serving: bool
-            True if the serving player can move
-            False otherwise
+        Updates the active scenes of the game by one tick
+        of TICK_DURATION seconds
         """
-        if type(self.players[self.serving].sprite) == PlayerNPC:
-            self.players[self.serving].sprite.serving(is_serving)
-        if type(self.players[1-self.serving].sprite) == PlayerNPC:
-            self.players[1-self.serving].sprite.serving(False)
+        self.scenes.update()
+        INPUT.updated()
 
-    def serve(self):
+    def render(self):
         """
-        Makes the serve.
+        Render the visible scenes of the game
         """
-        self.players[1 - self.last_hit].sprite.can_move = True
-        self.ball.sprite.hit(
-            (2*self.ball.sprite.get_ball_vector()[0] * self.last_hit,
-                self.players[self.last_hit].sprite.get_vector()[1]))
-        self.scoreboard.increase_hit_counter()
+        self.scenes.render(self.screen)
+        if self.profiler is not None:
+            self.profiler.render(self.screen)
+        self.display.present()
+        INPUT.presented()
 
-    def update(self):
+    def quit(self):
         """
-        Updates all the elements of the game
+        Closes the game, reporting the frame pacing statistics
+        if requested by the settings.
         """
-        if self.game_status == status.PLAYING:
-            self.players[0].update()
-            self.players[1].update(self.ball.sprite.rect.center)
-            self.ball.update(self.players[self.last_hit].sprite.serve_position(self.ball.sprite.rect.w))
-        if self.game_status == status.UPDATING_SCORE:
-            self.scoreboard.update()
-        self.current_menu.update()
-        pygame.display.update()
+        playing = self.scenes.scenes.get(status.PLAYING)
+        if self.settings["frame_stats"]:
+            print(self.pacer.report())
+            print(self.display.report())
+            print(INPUT.report())
+            print(SCRATCH.report())
+            if self.gc_control is not None:
+                print(self.gc_control.report())
+            if playing is not None:
+                for controller in (playing.npc_search, playing.npc_worker):
+                    if controller is not None:
+                        print(controller.report())
+        if playing is not None and playing.npc_worker is not None:
+            playing.npc_worker.close()
+        if playing is not None and playing.rally_log is not None:
+            playing.rally_log.close()
+        if self.gc_control is not None:
+            self.gc_control.close()
+        if self.profiler is not None:
+            self.profiler.export()
+            self.profiler.uninstall()
+        SETTINGS_SERVICE.flush()
+        pygame.quit()
+        exit()
 
-    def render(self):
-        """
-        Render the active elements of the games
+    def wait_events(self) -> list[pygame.event.Event]:
         """
-        self.screen.blit(self.field, (0, 0))
-        if self.game_status != status.START_MENU:
-            self.players[0].draw(self.screen)
-            self.players[1].draw(self.screen)
-            self.ball.draw(self.screen)
-            self.scoreboard.draw(self.screen)
-        self.current_menu.render(self.screen)
+        Blocks until an event arrives, without updating or
+        rendering anything in the meanwhile.
 
-    def soft_reset(self):
+        Returns
+        -------
+        list[pygame.event.Event]
+            the event that woke up the game and the pending ones.
         """
-        Soft resets elements of the game.
-        Specifically, the players and the ball.
-        """
-        for player in self.players:
-            player.sprite.reset()
-        self.ball.sprite.reset()
-        self.serving = (self.serving + 1)%2
-        self.last_hit = self.serving
-        self.players[1-self.serving].sprite.can_move = True
-        self.players[self.serving].sprite.can_move = False
-        self.serving_movement(True)
-        self.ball.sprite.serve_positioning(self.players[self.serving].sprite.serve_position(self.ball.sprite.get_size()[1]))
+        while self.running:
+            event = pygame.event.wait(IDLE_TIMEOUT)
+            self.reload_settings()
+            if event.type != pygame.NOEVENT:
+                # the wait has just pumped the queue, the events that came with it are enough
+                return [event] + pygame.event.get(pump=False)
+        return []
 
     def run(self):
         """
-        Defines the game loop
+        Defines the game loop.
+        The scenes are updated in fixed ticks of TICK_DURATION, as many
+        as the time elapsed since the last frame covers, so the game
+        plays at the same speed at any target frame rate.
+        When no scene is animating, the loop sleeps until the next event.
         """
+        events = None
         while self.running:
-            self.handle_events()
-            self.update()
+            self.reload_settings()
+            self.handle_events(events)
+            self.accumulator += self.frame_time
+            while self.accumulator >= TICK_DURATION:
+                self.update()
+                self.accumulator -= TICK_DURATION
             self.render()
-            match self.game_status:
-                case status.START_MENU:
-                    pass
-                case status.PLAYING:
-                    for player in self.players:
-                        self.ball.sprite.is_over_player(player.sprite)
-                        if (self.ball.sprite.state == PLAYING_STATE and
-                            self.ball.sprite.is_player_collision(player.sprite) and
-                            str(self.players[self.last_hit].sprite) != str(player.sprite)):
-
-                            self.players[self.last_hit].sprite.can_move = not self.players[self.last_hit].sprite.can_move
-                            self.last_hit = (self.last_hit + 1) % 2
-                            self.players[self.last_hit].sprite.can_move = not self.players[self.last_hit].sprite.can_move
-                            self.ball.sprite.hit((2*self.ball.sprite.get_ball_vector()[0], player.sprite.get_vector()[1]))
-                            self.scoreboard.increase_hit_counter()
-                    if self.ball.sprite.state == OUT_STATE:
-                        self.scoreboard.update_score(self.last_hit)
-                        self.game_status = status.UPDATING_SCORE
-                        self.players[self.last_hit].sprite.can_move = False
-                        self.players[1-self.last_hit].sprite.can_move = False
-                case status.UPDATING_SCORE:
-                    if not self.scoreboard.is_animating():
-                        if self.scoreboard.match_win_state() == -1:
-                            self.soft_reset()
-                            pygame.time.set_timer(self.serving_timer, 3000)
-                            self.game_status = status.PLAYING
-                        else:
-                            self.in_game_menu.pause_button.press()
-                            self.menu_actions(ui.PAUSE)
-                            self.game_status = status.END_GAME
-                case status.PAUSED:
-                    pass
-                case status.END_GAME:
-                    pass
-            self.clock.tick(60)
+            if self.gc_control is not None:
+                # before the pacer, so that a collection uses the time left in the frame
+                self.gc_control.end_frame(self.game_status, self.scenes.is_idle_point())
+            self.frame_time = min(self.pacer.tick(), MAX_FRAME_TIME)
+            if self.profiler is not None:
+                self.profiler.end_frame()
+            events = None
+            # events drained while the pacer slept, and keys pressed since
+            # the last tick, are handled before waiting
+            if self.scenes.is_idle() and not INPUT.events and not INPUT.pressed:
+                events = self.wait_events()
+                self.pacer.reset()
+                # the time slept is not simulated, the event gets a tick at once
+                self.frame_time = TICK_DURATION
+                self.accumulator = 0.0
+                if self.profiler is not None:
+                    self.profiler.skip_frame()
@@ -2,7 +2,11 @@ import pygame
 
 from src.entities.scoreboard import BEST_OF_FIVE, BEST_OF_SEVEN, BEST_OF_THREE, Number
 from src.entities.ui import Button, Menu, SettingButton
+from src.utils.animation import Timeline
 from src.utils.constants import DOWN, LEFT, RIGHT, UP
+from src.utils.input_queue import INPUT
+from src.utils.sounds import load_sound
+from src.utils.assets import asset
 
 class GameSettings(Menu):
     """
@@ -22,20 +26,24 @@ class GameSettings(Menu):
             controls that allows the menu navigation
         """
         self.logo = None
-        self.background = pygame.image.load('assets/graphics/settings_bg.png')
+        self.background = pygame.image.load(asset('assets/graphics/settings_bg.png'))
         self.background_rect = self.background.get_rect(center=(400, 250))
         self.is_visible = False
         self.cursor = 0
         self.keybindings = keybindings
         self.mouse_last_pos = (0, 0)
         self.mouse_control = False
-        self.hover_sound = pygame.mixer.Sound("assets/audio/hover_sound.mp3")
-        self.confirm_sound = pygame.mixer.Sound("assets/audio/selection_sound.mp3")
+        self.hover_sound = load_sound("assets/audio/hover_sound.mp3")
+        self.confirm_sound = load_sound("assets/audio/selection_sound.mp3")
+        self.timeline = Timeline()
         self.buttons = [
-            Selection((self.background_rect.left, self.background_rect.top), "# players", [1, 2]),
-            Selection((self.background_rect.left, self.background_rect.top+100), "Best of ", [BEST_OF_THREE, BEST_OF_FIVE, BEST_OF_SEVEN]),
-            Selection((self.background_rect.left, self.background_rect.top+200), "Points per Set", [i for i in range(2,10)]),
-            Button((self.background_rect.centerx, self.background_rect.bottom - 50), "Confirm")
+            Selection((self.background_rect.left, self.background_rect.top), "# players", [1, 2],
+                timeline=self.timeline),
+            Selection((self.background_rect.left, self.background_rect.top+100), "Best of ", [BEST_OF_THREE, BEST_OF_FIVE, BEST_OF_SEVEN],
+                timeline=self.timeline),
+            Selection((self.background_rect.left, self.background_rect.top+200), "Points per Set", [i for i in range(2,10)],
+                timeline=self.timeline),
+            Button((self.background_rect.centerx, self.background_rect.bottom - 50), "Confirm", self.timeline)
         ]
 
     def selection_highlight(self):
@@ -47,18 +55,17 @@ class GameSettings(Menu):
         -------
         int - cursor of the highlighted button
         """
-        keys = pygame.key.get_just_pressed()
-        if keys[self.keybindings[UP]]:
+        if INPUT.just_pressed(self.keybindings[UP]):
             self.mouse_control = False
             return (self.cursor - 1)%len(self.buttons)
-        elif keys[self.keybindings[DOWN]]:
+        elif INPUT.just_pressed(self.keybindings[DOWN]):
             self.mouse_control = False
             return (self.cursor + 1)%len(self.buttons)
-        elif keys[self.keybindings[LEFT]] and self.cursor < 3:
+        elif INPUT.just_pressed(self.keybindings[LEFT]) and self.cursor < 3:
             self.mouse_control = False
             self.buttons[self.cursor].setting_buttons_index = 0
             return self.cursor
-        elif keys[self.keybindings[RIGHT]] and self.cursor < 3:
+        elif INPUT.just_pressed(self.keybindings[RIGHT]) and self.cursor < 3:
             self.mouse_control = False
             self.buttons[self.cursor].setting_buttons_index = 1
             return self.cursor
@@ -75,23 +82,20 @@ class GameSettings(Menu):
             "set_points": self.buttons[2].get_value()
         }
 
-    def render(self, surface: pygame.Surface):
+    def draw(self, surface: pygame.Surface):
         """
-        Renders the menu for selecting the settings.
+        Draws the menu for selecting the settings.
         """
-        if self.is_visible:
-            screen_background = pygame.transform.box_blur(surface, 10)
-            screen_background.blit(self.background, self.background_rect)
-            for button in self.buttons:
-                button.draw(screen_background)
-            surface.blit(screen_background, (0,0))
+        surface.blit(self.background, self.background_rect)
+        for button in self.buttons:
+            button.draw(surface)
 
 class Selection():
     """
     UI element that allows the user to select a
     number among a set of available options.
     """
-    def __init__(self, reference_pos: tuple, text:str, options:list[int], digits=1):
+    def __init__(self, reference_pos: tuple, text:str, options:list[int], digits=1, timeline: Timeline | None = None):
         """
         Initialise the selection options.
 
@@ -105,19 +109,21 @@ class Selection():
             Set of available options
         digits: int
             Max number of digits of the options
+        timeline: Timeline | None
+            timeline running the animations of the buttons.
         """
-        font = pygame.font.Font("assets/fonts/Jersey15-Regular.ttf", 40)
+        font = pygame.font.Font(asset("assets/fonts/Jersey15-Regular.ttf"), 40)
         self.text = font.render(text, False, "White")
         self.text_rect = self.text.get_rect(topleft=(reference_pos[0]+40, reference_pos[1]+60))
         self.action = text
-        self.setting_buttons = [SettingButton((reference_pos[0]+370, reference_pos[1]+60)),
-            SettingButton((reference_pos[0]+470,reference_pos[1]+60), False)]
+        self.setting_buttons = [SettingButton((reference_pos[0]+370, reference_pos[1]+60), timeline=timeline),
+            SettingButton((reference_pos[0]+470,reference_pos[1]+60), False, timeline)]
         self.setting_buttons_index = 0
-        self.box = [pygame.image.load(f"assets/graphics/settings_number_box{i}.png")
+        self.box = [pygame.image.load(asset(f"assets/graphics/settings_number_box{i}.png"))
             for i in range(2)]
         self.box_rect = self.box[0].get_rect(topleft=(reference_pos[0]+415, reference_pos[1]+60))
         self.box_frame_index = 0
-        self.number = Number([(reference_pos[0]+402, reference_pos[1]+42)], digits, 0.9)
+        self.number = Number([(reference_pos[0]+402, reference_pos[1]+42)], digits, 0.9, timeline)
         self.option_index = 0
         self.number.set_number(options[self.option_index])
         self.options = options
@@ -186,13 +192,6 @@ class Selection():
             % len(self.options))
         self.number.set_number(self.options[self.option_index])
 
-    def update(self):
-        """
-        Updates the selection
-        """
-        for button in self.setting_buttons:
-            button.update()
-
     def draw(self, surface: pygame.Surface):
         """
         Draws the selection on the given surface
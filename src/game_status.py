@@ -1,7 +1,10 @@
 # AVAILABLE STATUS FOR THE GAME
+# Each status, except UPDATING_SCORE, identifies a scene of the SceneStack.
+# UPDATING_SCORE is a phase of the PLAYING scene.
 START_MENU = 0
 SETTINGS = 1
 PAUSED = 2
 PLAYING = 3
 UPDATING_SCORE = 4
 END_GAME = 5
+MULTI_BALL = 6
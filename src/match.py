@@ -0,0 +1,166 @@
+from random import randint
+from src.entities.player import Player, PlayerNPC
+from src.entities.ball import PLAYING_STATE, Ball, OUT_STATE
+from src.entities.scoreboard import Score
+
+
+class Match:
+    """
+    Defines the rules of a match between two players:
+    serve, movement, collisions and points.
+    It does not draw anything, so it is shared by the game
+    and by the headless simulations.
+    """
+    def __init__(self, players: list[Player], ball: Ball, score: Score, serving: int | None = None,
+        rally_log=None):
+        """
+        Initialise the match and puts the ball in the serve position.
+
+        Parameters
+        ----------
+        players: list[Player]
+            the two players, the first one on the left.
+        ball: Ball
+            the ball of the match.
+        score: Score
+            the score of the match.
+        serving: int | None
+            the player who serves first. If None, it is random.
+        rally_log: RallyLog | None
+            log receiving the finished rallies, if any.
+        """
+        self.rally_log = rally_log
+        # rally in progress, while it is logged
+        self.rally = None
+        self.players = players
+        self.ball = ball
+        self.score = score
+        self.last_hit = randint(0, 1) if serving is None else serving
+        self.serving = self.last_hit
+        self.serving_movement(True)
+        self.ball.serve_positioning(self.players[self.serving].serve_position(self.ball.get_size()[1]))
+
+    def serving_movement(self, is_serving: bool):
+        """
+        Abilitate or disabilitate the serving player to move before serving.
+
+        Parameters
+        ----------
+        is_serving: bool
+            True if the serving player can move
+            False otherwise
+        """
+        if type(self.players[self.serving]) == PlayerNPC:
+            self.players[self.serving].serving(is_serving)
+        if type(self.players[1-self.serving]) == PlayerNPC:
+            self.players[1-self.serving].serving(False)
+
+    def serve(self):
+        """
+        Makes the serve.
+        """
+        self.players[1 - self.last_hit].can_move = True
+        self.ball.hit(
+            (2*self.ball.get_ball_vector()[0] * self.last_hit,
+                self.players[self.last_hit].get_vector()[1]))
+        self.score.increase_hit_counter()
+        if self.rally_log is not None:
+            self.rally = self.rally_log.start(self.last_hit)
+            self.record_contact(self.last_hit)
+
+    def update(self):
+        """
+        Moves the players and the ball.
+        """
+        for player in self.players:
+            player.update(self.ball.rect.center)
+        self.ball.update(self.players[self.last_hit].serve_position(self.ball.rect.w))
+        if self.rally is not None:
+            self.rally.frames += 1
+
+    def check_collisions(self) -> int:
+        """
+        Checks the collisions between the ball and the players.
+        When a player hits the ball, the ball bounces back.
+
+        Returns
+        -------
+        int
+            the player who hit the ball.
+            -1 if the ball was not hit.
+        """
+        hitter = -1
+        for i in range(len(self.players)):
+            player = self.players[i]
+            self.ball.is_over_player(player)
+            if (self.ball.state == PLAYING_STATE and
+                self.ball.is_player_collision(player) and
+                str(self.players[self.last_hit]) != str(player)):
+
+                self.players[self.last_hit].can_move = not self.players[self.last_hit].can_move
+                self.last_hit = (self.last_hit + 1) % 2
+                self.players[self.last_hit].can_move = not self.players[self.last_hit].can_move
+                self.ball.hit((2*self.ball.get_ball_vector()[0], player.get_vector()[1]))
+                self.score.increase_hit_counter()
+                self.record_contact(i)
+                hitter = i
+        return hitter
+
+    def record_contact(self, hitter: int):
+        """
+        Adds the hit to the rally in progress, if logged.
+
+        Parameters
+        ----------
+        hitter: int
+            the player who hit the ball.
+        """
+        if self.rally is not None:
+            self.rally.contact(hitter, self.players[hitter].speed,
+                self.players[1 - hitter].speed, self.ball.direction)
+
+    def is_point_over(self) -> bool:
+        """
+        Returns
+        -------
+        bool
+            True if the ball went out of the field.
+            False otherwise.
+        """
+        return self.ball.state == OUT_STATE
+
+    def end_point(self) -> int:
+        """
+        Assigns the point to the last player who hit the ball
+        and stops the players.
+
+        Returns
+        -------
+        int
+            the player who scored.
+        """
+        set_winner = self.score.update_score(self.last_hit)
+        if self.rally is not None:
+            self.rally_log.finish(self.rally, self.last_hit, set_winner,
+                self.score.match_win_state() != -1)
+            self.rally = None
+        self.players[self.last_hit].can_move = False
+        self.players[1-self.last_hit].can_move = False
+        return self.last_hit
+
+    def soft_reset(self):
+        """
+        Soft resets elements of the game.
+        Specifically, the players and the ball.
+        A rally in progress is not logged.
+        """
+        self.rally = None
+        for player in self.players:
+            player.reset()
+        self.ball.reset()
+        self.serving = (self.serving + 1)%2
+        self.last_hit = self.serving
+        self.players[1-self.serving].can_move = True
+        self.players[self.serving].can_move = False
+        self.serving_movement(True)
+        self.ball.serve_positioning(self.players[self.serving].serve_position(self.ball.get_size()[1]))
@@ -0,0 +1,122 @@
+import pygame
+import src.entities.ui as ui
+import src.utils.blur as blur
+from src.utils.surface_pool import SCRATCH
+from src import game_status as status
+from src.scenes.scene import Scene
+from src.utils.scheduler import TICK_DURATION
+
+
+class MenuScene(Scene):
+    """
+    Scene showing a menu over a blurred backdrop.
+    The backdrop is blurred once when the scene is entered, the scenes
+    below are then frozen and covered until the menu is closed.
+    """
+    is_opaque = True
+    freezes_below = True
+
+    def __init__(self, game, menu: ui.Menu):
+        """
+        Initialise the menu scene.
+
+        Parameters
+        ----------
+        game: Game
+            the game owning the scene.
+        menu: ui.Menu
+            the menu to display.
+        """
+        super().__init__(game)
+        self.menu = menu
+        self.backdrop = None
+
+    def enter(self):
+        self.menu.display(True)
+        self.refresh_backdrop()
+
+    def exit(self):
+        self.menu.display(False)
+
+    def refresh_backdrop(self):
+        """
+        Renders and blurs the scenes below the menu.
+        """
+        screen = self.game.screen
+        surface = SCRATCH.get(screen.get_size(), screen)
+        surface.blit(self.game.field, (0, 0))
+        self.game.scenes.render_below(self, surface)
+        if self.backdrop is None or self.backdrop.get_size() != screen.get_size():
+            self.backdrop = pygame.Surface(screen.get_size(), 0, screen)
+        blur.blur(surface, 10, dest=self.backdrop)
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.game.menu_actions(self.menu.check_press(event.pos))
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            self.game.menu_actions(self.menu.press())
+
+    def update(self):
+        self.menu.update(self.game.display.mouse_position(), TICK_DURATION)
+
+    def is_idle(self) -> bool:
+        return not self.menu.is_animating()
+
+    def is_idle_point(self) -> bool:
+        return True
+
+    def render(self, surface: pygame.Surface):
+        surface.blit(self.backdrop, (0, 0))
+        self.menu.draw(surface)
+
+
+class StartMenuScene(MenuScene):
+    """
+    First screen of the game.
+    """
+    def __init__(self, game):
+        super().__init__(game, ui.Menu(
+            game.settings["keybindings"]["ui_movement"],
+            [ui.START_GAME, ui.MULTI_BALL, ui.EXIT_GAME],
+        ))
+        self.status = status.START_MENU
+
+
+class SettingsScene(MenuScene):
+    """
+    Screen where the settings of the next game are chosen.
+    """
+    def __init__(self, game):
+        # imported with the scene, the start menu does not need it
+        from src.game_settings import GameSettings
+        super().__init__(game, GameSettings(game.settings["keybindings"]["ui_movement"]))
+        self.status = status.SETTINGS
+
+
+class PauseScene(MenuScene):
+    """
+    In game menu shown over the frozen match.
+    """
+    def __init__(self, game):
+        self.playing = game.scenes.get(status.PLAYING)
+        super().__init__(game, self.playing.in_game_menu)
+        self.status = status.PAUSED
+
+    def handle_event(self, event: pygame.event.Event):
+        super().handle_event(event)
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            self.menu.pause_button.press()
+            self.game.menu_actions(ui.PAUSE)
+
+
+class EndGameScene(PauseScene):
+    """
+    In game menu shown when a player wins the match.
+    """
+    def __init__(self, game):
+        super().__init__(game)
+        self.status = status.END_GAME
+
+    def handle_event(self, event: pygame.event.Event):
+        # the match is over, p has nothing to resume
+        MenuScene.handle_event(self, event)
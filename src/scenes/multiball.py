@@ -0,0 +1,89 @@
+import pygame
+import src.entities.ui as ui
+from src import game_status as status
+from src.entities.player import Player, PlayerNPC
+from src.scenes.scene import Scene
+from src.utils.assets import asset
+
+
+class MultiBallScene(Scene):
+    """
+    Arcade mode against the NPC with hundreds of balls on the field.
+    Every ball leaving the field is a point for the other player,
+    there are no sets: the match goes on until ESC is pressed.
+    """
+    is_opaque = True
+
+    def __init__(self, game):
+        """
+        Initialise the arcade scene.
+
+        Parameters
+        ----------
+        game: Game
+            the game owning the scene.
+        """
+        super().__init__(game)
+        # numpy is only needed by this mode
+        from src.entities.ball_swarm import BallSwarm
+        self.status = status.MULTI_BALL
+        self.settings = game.settings
+        field_dimensions = self.settings["field_dimensions"]
+        self.players = [
+            Player(False, self.settings["keybindings"]["first_player"], field_dimensions),
+            PlayerNPC(True, field_dimensions),
+        ]
+        self.balls = BallSwarm(self.settings["multiball_count"], field_dimensions)
+        self.points = [0, 0]
+        self.font = pygame.font.Font(asset("assets/fonts/Jersey15-Regular.ttf"), 40)
+        self.score_text = None
+
+    def start(self):
+        """
+        Starts a new arcade match.
+        """
+        for player in self.players:
+            player.reset()
+            player.can_move = True
+        self.balls.reset()
+        self.points = [0, 0]
+        self.score_text = None
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.game.menu_actions(ui.EXIT_GAME)
+
+    def target(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            center of the ball the NPC follows: the nearest one
+            coming towards it, the middle of the field if none.
+        """
+        positions = self.balls.positions
+        npc = self.players[1]
+        coming = (self.balls.velocities[:, 0] > 0) & (positions[:, 0] < npc.rect.left)
+        if not coming.any():
+            return npc.starting_position
+        x = positions[coming, 0]
+        nearest = x.argmax()
+        return (x[nearest], positions[coming, 1][nearest])
+
+    def update(self):
+        self.players[0].update()
+        self.players[1].update(self.target())
+        scored = self.balls.update(self.players)
+        if any(scored):
+            self.points[0] += scored[0]
+            self.points[1] += scored[1]
+            self.score_text = None
+
+    def render(self, surface: pygame.Surface):
+        surface.blit(self.game.field, (0, 0))
+        for player in self.players:
+            surface.blit(player.image, player.rect)
+        self.balls.draw(surface)
+        if self.score_text is None:
+            self.score_text = self.font.render(f"{self.points[0]} - {self.points[1]}", False, "White")
+        surface.blit(self.score_text, self.score_text.get_rect(midtop=(surface.get_width() // 2, 30)))
@@ -0,0 +1,262 @@
+import pygame
+import src.entities.ui as ui
+from src import game_status as status
+from src.entities.player import Player, PlayerNPC
+from src.entities.ball import Ball, HOLDING_STATE
+from src.entities.scoreboard import Scoreboard
+from src.match import Match
+from src.scenes.scene import Scene
+from src.utils.scheduler import TICK_DURATION, Scheduler
+from src.utils.sounds import preload_sounds
+
+# Seconds of game time before the automatic serve
+SERVE_DELAY = 3.0
+
+
+class PlayingScene(Scene):
+    """
+    Scene of the match.
+    Controls the players, the ball and the scoreboard.
+    Its status is PLAYING during the rallies and UPDATING_SCORE
+    while the score animation is going on.
+    """
+    is_opaque = True
+
+    def __init__(self, game):
+        """
+        Initialise the match scene.
+
+        Parameters
+        ----------
+        game: Game
+            the game owning the scene.
+        """
+        super().__init__(game)
+        self.status = status.PLAYING
+        self.settings = game.settings
+        self.in_game_menu = ui.InGameMenu(
+            self.settings["keybindings"]["ui_movement"],
+            [ui.RESTART_GAME, ui.EXIT_GAME]
+        )
+        self.ball = Ball(self.settings["field_dimensions"])
+        self.match = None
+        self.scoreboard = None
+        # the players and the ball, in drawing order
+        self.drawables = []
+        self.npc_policy = None
+        self.npc_search = None
+        self.npc_worker = None
+        search_budget = None
+        if self.settings["npc_difficulty"] == "hard":
+            search_budget = self.settings["npc_search_budget_ms"] / 1000
+        if self.settings["npc_worker"]:
+            # the controller runs in another process, fed through shared memory
+            from src.ai.worker import WorkerController
+            self.npc_worker = WorkerController(self.ball, True, self.settings["field_dimensions"],
+                self.settings["npc_policy"], search_budget,
+                self.settings["npc_worker_deadline_ms"] / 1000)
+        elif self.settings["npc_policy"] is not None:
+            # numpy is only needed by the learned policies
+            from src.ai.policy import load_policy
+            self.npc_policy = load_policy(self.settings["npc_policy"])
+        elif search_budget is not None:
+            from src.ai.lookahead import LookaheadController
+            self.npc_search = LookaheadController(self.ball, self.settings["field_dimensions"],
+                search_budget)
+        self.rally_log = None
+        if self.settings["rally_log"]:
+            # numpy is only needed to log the rallies
+            from src.utils.rally_log import RallyLog
+            self.rally_log = RallyLog()
+        # driven by update, so it stops while the scene is paused
+        self.scheduler = Scheduler()
+        self.serve_timer = None
+
+    def start(self, settings: dict):
+        """
+        Set the settings for the game:
+            - Number of players
+            - Set points
+            - Match wins
+
+        Parameters
+        ----------
+        settings: dict
+            contains the selected settings for the current game.
+            It must contains the followings keys: players,
+            best_of and set_points
+
+        """
+        players = [
+            Player(
+                False,
+                self.settings["keybindings"]["first_player"],
+                self.settings["field_dimensions"])
+        ]
+        if settings["players"] > 1:
+            players.append(
+                        Player(
+                            True,
+                            self.settings["keybindings"]["second_player"],
+                            self.settings["field_dimensions"]))
+        else:
+            players.append(
+                        PlayerNPC(
+                            True,
+                            self.settings["field_dimensions"],
+                            self.npc_controller())
+                    )
+        self.ball.reset()
+        self.scoreboard = Scoreboard(settings["best_of"], settings["set_points"], self.settings["field_dimensions"])
+        self.match = Match(players, self.ball, self.scoreboard, rally_log=self.rally_log)
+        self.drawables = [*players, self.ball]
+        self.status = status.PLAYING
+
+    def npc_controller(self):
+        """
+        Returns
+        -------
+        PolicyController
+            controller of the NPC, if a policy is set in the settings.
+        WorkerController
+            controller running in a worker process, if enabled.
+        LookaheadController
+            searching controller, if the difficulty is hard.
+        None
+            if the NPC follows the default heuristic.
+        """
+        if self.npc_worker is not None:
+            return self.npc_worker
+        if self.npc_policy is not None:
+            from src.ai.policy import PolicyController
+            return PolicyController(self.npc_policy)
+        return self.npc_search
+
+    def enter(self):
+        # before the serve, so the first hit does not decode its sound
+        preload_sounds()
+        self.schedule_serve()
+
+    def exit(self):
+        self.cancel_serve()
+        self.match.soft_reset()
+        self.in_game_menu.reset()
+        self.scoreboard.reset()
+
+    def restart(self):
+        """
+        Restarts the match from zero.
+        """
+        self.match.soft_reset()
+        self.scoreboard.reset()
+        self.status = status.PLAYING
+        self.schedule_serve()
+
+    def schedule_serve(self):
+        """
+        Serves automatically after SERVE_DELAY seconds of game time,
+        unless the player serves before.
+        """
+        self.cancel_serve()
+        self.serve_timer = self.scheduler.schedule(SERVE_DELAY, self.auto_serve)
+
+    def cancel_serve(self):
+        """
+        Cancels the automatic serve.
+        """
+        if self.serve_timer is not None:
+            self.serve_timer.cancel()
+            self.serve_timer = None
+
+    def auto_serve(self):
+        """
+        Serves if the ball is still held.
+        """
+        self.serve_timer = None
+        if self.status == status.PLAYING and self.ball.state == HOLDING_STATE:
+            self.serve()
+
+    def handle_event(self, event: pygame.event.Event):
+        """
+        Handles the match events, like:
+            - mouse clicks on the pause button
+            - keystrokes
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.game.menu_actions(
+                self.in_game_menu.check_press(event.pos)
+            )
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_r:
+                self.match.soft_reset()
+                self.status = status.PLAYING
+                self.schedule_serve()
+            if event.key == pygame.K_SPACE and self.ball.state == HOLDING_STATE:
+                self.serve()
+            if event.key == pygame.K_p:
+                self.in_game_menu.pause_button.press()
+                self.game.menu_actions(ui.PAUSE)
+
+    def serve(self):
+        """
+        Makes the serve and cancels the automatic one.
+        """
+        self.match.serve()
+        self.match.serving_movement(False)
+        self.cancel_serve()
+
+    def check_collisions(self):
+        """
+        Checks the collisions between the ball and the players
+        and if the ball went out of the field.
+        """
+        self.match.check_collisions()
+        if self.match.is_point_over():
+            self.match.end_point()
+            self.status = status.UPDATING_SCORE
+
+    def check_score_update(self):
+        """
+        Once the score animation ends, starts the next point
+        or ends the match.
+        """
+        if not self.scoreboard.is_animating():
+            if self.scoreboard.match_win_state() == -1:
+                self.match.soft_reset()
+                self.status = status.PLAYING
+                self.schedule_serve()
+            else:
+                self.in_game_menu.pause_button.press()
+                self.game.scenes.push(status.END_GAME)
+
+    def update(self):
+        """
+        Updates all the elements of the match
+        """
+        self.scheduler.advance()
+        if self.status == status.PLAYING:
+            self.match.update()
+            self.check_collisions()
+        elif self.status == status.UPDATING_SCORE:
+            self.scoreboard.update(TICK_DURATION)
+            self.check_score_update()
+        self.in_game_menu.update(seconds=TICK_DURATION)
+
+    def is_idle_point(self) -> bool:
+        """
+        Between points: while the score updates or the ball waits to be served.
+        """
+        return self.status == status.UPDATING_SCORE or self.ball.state == HOLDING_STATE
+
+    def render(self, surface: pygame.Surface):
+        self.render_backdrop(surface)
+        self.in_game_menu.pause_button.draw(surface)
+
+    def render_backdrop(self, surface: pygame.Surface):
+        """
+        Draws the field, the players, the ball and the scoreboard,
+        without the pause button.
+        """
+        surface.blit(self.game.field, (0, 0))
+        surface.fblits([(entity.image, entity.rect) for entity in self.drawables])
+        self.scoreboard.draw(surface)
@@ -0,0 +1,309 @@
+import importlib
+import pygame
+
+
+class Scene:
+    """
+    Defines a screen of the game (menus, match, pause...).
+    Scenes live on a SceneStack and the flags of a scene decide
+    how much of the stack below it has to work:
+        - is_opaque: the scenes below are not rendered.
+        - freezes_below: the scenes below are not updated.
+    """
+    is_opaque = False
+    freezes_below = False
+
+    def __init__(self, game):
+        """
+        Initialise the scene.
+
+        Parameters
+        ----------
+        game: Game
+            the game owning the scene.
+        """
+        self.game = game
+        self.status = None
+
+    def enter(self):
+        """
+        Called when the scene is pushed on the stack.
+        """
+
+    def exit(self):
+        """
+        Called when the scene is popped from the stack.
+        """
+
+    def pause(self):
+        """
+        Called when another scene is pushed over this one.
+        """
+
+    def resume(self):
+        """
+        Called when the scene over this one is popped.
+        """
+
+    def handle_event(self, event: pygame.event.Event):
+        """
+        Handles a pygame event. Only the top scene receives events.
+
+        Parameters
+        ----------
+        event: pygame.event.Event
+            event to handle.
+        """
+
+    def update(self):
+        """
+        Updates the scene.
+        """
+
+    def is_idle(self) -> bool:
+        """
+        Verifies if the scene would look the same on the next frame
+        unless an event arrives.
+
+        Returns
+        -------
+        bool
+            True if the scene is idle
+            False otherwise.
+        """
+        return False
+
+    def is_idle_point(self) -> bool:
+        """
+        Verifies if a short hitch would go unnoticed on this frame
+        (e.g. menus, pause, between points), so that deferred work like
+        the garbage collection can run.
+
+        Returns
+        -------
+        bool
+            True if the scene is at an idle point
+            False otherwise.
+        """
+        return False
+
+    def render(self, surface: pygame.Surface):
+        """
+        Draws the scene over the given surface.
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface to be drawn over.
+        """
+
+    def render_backdrop(self, surface: pygame.Surface):
+        """
+        Draws the scene as seen behind an overlay scene.
+        By default it is the same as render.
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface to be drawn over.
+        """
+        self.render(surface)
+
+
+class SceneStack:
+    """
+    Stack of the active scenes.
+    Scenes are imported and built lazily, the first time they are
+    requested, and then kept for the following pushes.
+    """
+    def __init__(self, game, scene_types: dict):
+        """
+        Initialise the scene stack.
+
+        Parameters
+        ----------
+        game: Game
+            the game owning the scenes.
+        scene_types: dict
+            maps every game status to the dotted path of the Scene class
+            that implements it (e.g. "src.scenes.menus.PauseScene").
+        """
+        self.game = game
+        self.scene_types = scene_types
+        self.scenes = {}
+        self.stack = []
+
+    def get(self, scene_status: int) -> Scene:
+        """
+        Returns the scene of the given status, building it if needed.
+
+        Parameters
+        ----------
+        scene_status: int
+            status of the scene.
+
+        Returns
+        -------
+        Scene
+            the scene relative to the status.
+        """
+        if scene_status not in self.scenes:
+            module_name, class_name = self.scene_types[scene_status].rsplit(".", 1)
+            scene_type = getattr(importlib.import_module(module_name), class_name)
+            self.scenes[scene_status] = scene_type(self.game)
+        return self.scenes[scene_status]
+
+    def top(self) -> Scene | None:
+        """
+        Returns
+        -------
+        Scene
+            the scene on top of the stack.
+        None
+            if the stack is empty.
+        """
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene_status: int):
+        """
+        Pushes the scene of the given status over the current one.
+
+        Parameters
+        ----------
+        scene_status: int
+            status of the scene to push.
+        """
+        scene = self.get(scene_status)
+        if self.stack:
+            self.stack[-1].pause()
+        self.stack.append(scene)
+        scene.enter()
+
+    def pop(self) -> Scene:
+        """
+        Pops the scene on top of the stack.
+
+        Returns
+        -------
+        Scene
+            the popped scene.
+        """
+        scene = self.stack.pop()
+        scene.exit()
+        if self.stack:
+            self.stack[-1].resume()
+        return scene
+
+    def switch(self, scene_status: int):
+        """
+        Empties the stack and pushes the scene of the given status.
+
+        Parameters
+        ----------
+        scene_status: int
+            status of the scene to push.
+        """
+        while self.stack:
+            self.stack.pop().exit()
+        self.push(scene_status)
+
+    def handle_event(self, event: pygame.event.Event):
+        """
+        Sends the event to the scene on top of the stack.
+
+        Parameters
+        ----------
+        event: pygame.event.Event
+            event to handle.
+        """
+        if self.stack:
+            self.stack[-1].handle_event(event)
+
+    def update(self):
+        """
+        Updates the scenes from the top down to the first
+        scene that freezes the ones below.
+        """
+        for scene in reversed(self.stack.copy()):
+            scene.update()
+            if scene.freezes_below:
+                break
+
+    def is_idle(self) -> bool:
+        """
+        Verifies if all the scenes that get updated are idle.
+
+        Returns
+        -------
+        bool
+            True if the stack is idle
+            False otherwise.
+        """
+        for scene in reversed(self.stack):
+            if not scene.is_idle():
+                return False
+            if scene.freezes_below:
+                break
+        return True
+
+    def is_idle_point(self) -> bool:
+        """
+        Verifies if all the scenes that get updated are at an idle point.
+
+        Returns
+        -------
+        bool
+            True if the stack is at an idle point
+            False otherwise.
+        """
+        for scene in reversed(self.stack):
+            if not scene.is_idle_point():
+                return False
+            if scene.freezes_below:
+                break
+        return True
+
+    def render(self, surface: pygame.Surface):
+        """
+        Renders the scenes from the last opaque one up to the top.
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface to be drawn over.
+        """
+        for scene in SceneStack.visible_scenes(self.stack):
+            scene.render(surface)
+
+    def render_below(self, scene: Scene, surface: pygame.Surface):
+        """
+        Renders the scenes under the given one, as backdrop.
+
+        Parameters
+        ----------
+        scene: Scene
+            scene whose backdrop has to be rendered.
+        surface: pygame.Surface
+            surface to be drawn over.
+        """
+        below = self.stack[:self.stack.index(scene)]
+        for scene_below in SceneStack.visible_scenes(below):
+            scene_below.render_backdrop(surface)
+
+    @staticmethod
+    def visible_scenes(scenes: list[Scene]) -> list[Scene]:
+        """
+        Parameters
+        ----------
+        scenes: list[Scene]
+            scenes ordered from the bottom to the top.
+
+        Returns
+        -------
+        list[Scene]
+            the scenes from the last opaque one up to the top.
+        """
+        for i in range(len(scenes) - 1, -1, -1):
+            if scenes[i].is_opaque:
+                return scenes[i:]
+        return scenes
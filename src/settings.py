@@ -1,12 +1,30 @@
-import json, pygame
-from pathlib import Path
+import atexit, copy, json, os, threading, time, pygame
+from src.utils.assets import DATA_PATH
 
-SETTINGS_PATH = Path(__file__).parent.parent / 'config' / 'settings.json'
+SETTINGS_PATH = DATA_PATH / 'config' / 'settings.json'
+# Seconds without a new save before the settings are written
+SAVE_DELAY = 0.5
+# Seconds between two checks of the settings file for external changes
+POLL_INTERVAL = 1.0
 
 DEFAULT_SETTINGS = {
     "resolution": [800, 500],
     "field_dimensions": [[0, 800], [100, 500]],
     "fullscreen": False,
+    "scaling": "software",
+    "target_fps": 60,
+    "vsync": False,
+    "frame_stats": False,
+    "profiler": False,
+    "gc_control": False,
+    "blur": "high",
+    "rally_log": False,
+    "npc_policy": None,
+    "npc_difficulty": "normal",
+    "npc_search_budget_ms": 2,
+    "npc_worker": False,
+    "npc_worker_deadline_ms": 40,
+    "multiball_count": 500,
     "music_volume": 0.6,
     "sfx_volume": 0.8,
     "keybindings": {
@@ -28,6 +46,284 @@ DEFAULT_SETTINGS = {
     },
 }
 
+
+def is_valid(value, default) -> bool:
+    """
+    Checks a value of the settings file against its default value.
+
+    Parameters
+    ----------
+    value
+        value read from the file.
+    default
+        default value of the same key, None accepts any value.
+
+    Returns
+    -------
+    bool
+        True if the value has the type of the default.
+    """
+    if default is None:
+        return True
+    if isinstance(default, bool) or isinstance(value, bool):
+        return isinstance(value, bool) and isinstance(default, bool)
+    if isinstance(default, float):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(default))
+
+
+def merge(defaults: dict, data: dict, errors: list, prefix: str = "") -> dict:
+    """
+    Merges the settings read from the file into the defaults, key by key
+    down the nested dictionaries, so that a partial keybindings object
+    keeps the default bindings it does not list.
+
+    Parameters
+    ----------
+    defaults: dict
+        default settings.
+    data: dict
+        settings read from the file.
+    errors: list
+        list receiving the keys replaced by their default, invalid.
+    prefix: str
+        path of the merged dictionaries, for the errors.
+
+    Returns
+    -------
+    dict
+        new settings, sharing nothing with the defaults.
+    """
+    merged = {key: value for key, value in data.items() if key not in defaults}
+    for key, default in defaults.items():
+        if key not in data:
+            merged[key] = copy.deepcopy(default)
+        elif isinstance(default, dict) and isinstance(data[key], dict):
+            merged[key] = merge(default, data[key], errors, f"{prefix}{key}.")
+        elif is_valid(data[key], default):
+            merged[key] = data[key]
+        else:
+            errors.append(f"{prefix}{key}")
+            merged[key] = copy.deepcopy(default)
+    return merged
+
+
+def update(target: dict, source: dict) -> bool:
+    """
+    Updates the settings in place, the nested dictionaries too, so that
+    whoever holds a part of them (e.g. the keybindings of a player)
+    sees the new values.
+
+    Parameters
+    ----------
+    target: dict
+        settings updated.
+    source: dict
+        new settings.
+
+    Returns
+    -------
+    bool
+        True if a value changed.
+    """
+    changed = False
+    for key in [key for key in target if key not in source]:
+        del target[key]
+        changed = True
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            changed = update(target[key], value) or changed
+        elif key not in target or target[key] != value:
+            target[key] = value
+            changed = True
+    return changed
+
+
+class SettingsService:
+    """
+    Settings of the game, read once and kept in memory.
+    The saves are coalesced: the file is written by a background thread
+    once no save came for SAVE_DELAY seconds, through a temporary file
+    renamed over the settings, so a crash never leaves half a file.
+    The file is polled for changes made outside the game, which are
+    applied to the settings in memory.
+    """
+    def __init__(self, path=SETTINGS_PATH, defaults: dict = DEFAULT_SETTINGS):
+        """
+        Parameters
+        ----------
+        path: Path
+            path of the settings file.
+        defaults: dict
+            default settings, completing the file.
+        """
+        self.path = path
+        self.defaults = defaults
+        self.settings = None
+        # modification time of the file when last read or written
+        self.mtime = None
+        self.next_poll = 0
+        self.lock = threading.Condition()
+        # held from taking the pending save to the end of its write,
+        # so that flush waits for a write in progress
+        self.write_lock = threading.Lock()
+        # content waiting to be written and when to write it
+        self.pending = None
+        self.deadline = 0
+        self.writer = None
+
+    def read(self) -> dict | None:
+        """
+        Returns
+        -------
+        dict | None
+            the settings of the file merged into the defaults,
+            None if the file is missing or cannot be parsed.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        # a file that cannot be read is not read again until it changes
+        self.mtime = mtime
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"settings: cannot read {self.path}: {e}")
+            return None
+        if not isinstance(data, dict):
+            print(f"settings: {self.path} does not hold an object, defaults used")
+            data = {}
+        errors = []
+        merged = merge(self.defaults, data, errors)
+        if errors:
+            print(f"settings: invalid {', '.join(errors)}, defaults used")
+        return merged
+
+    def load(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            the settings, read from the file the first time only.
+            The same dictionary is returned on every call and is
+            updated in place by the reloads.
+        """
+        if self.settings is None:
+            self.next_poll = time.monotonic() + POLL_INTERVAL
+            self.settings = self.read()
+            if self.settings is None:
+                self.settings = merge(self.defaults, {}, [])
+                if not self.path.exists():
+                    self.save()
+        return self.settings
+
+    def poll(self) -> bool:
+        """
+        Reloads the settings if the file changed since it was last read
+        or written. The file is checked once every POLL_INTERVAL seconds,
+        so this is cheap enough to be called every frame.
+
+        Returns
+        -------
+        bool
+            True if the settings changed.
+        """
+        now = time.monotonic()
+        if self.settings is None or now < self.next_poll:
+            return False
+        self.next_poll = now + POLL_INTERVAL
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        with self.lock:
+            if mtime == self.mtime or self.pending is not None:
+                return False
+        settings = self.read()
+        return settings is not None and update(self.settings, settings)
+
+    def save(self, settings: dict | None = None):
+        """
+        Requests a write of the settings. Saves coming within SAVE_DELAY
+        seconds of each other are written once, off the calling thread.
+
+        Parameters
+        ----------
+        settings: dict | None
+            new settings, merged into the ones in memory.
+            If None, the settings in memory are saved.
+        """
+        self.load()
+        if settings is not None and settings is not self.settings:
+            update(self.settings, merge(self.defaults, settings, []))
+        content = json.dumps(self.settings, indent=2)
+        with self.lock:
+            self.pending = content
+            self.deadline = time.monotonic() + SAVE_DELAY
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.write_loop, name="settings writer", daemon=True)
+                self.writer.start()
+                # the thread is a daemon, the last save is written at exit
+                atexit.register(self.flush)
+            self.lock.notify()
+
+    def write_loop(self):
+        """
+        Body of the writer thread: waits for a save to settle, then writes it.
+        """
+        while True:
+            with self.lock:
+                while self.pending is None or time.monotonic() < self.deadline:
+                    self.lock.wait(None if self.pending is None else self.deadline - time.monotonic())
+            self.flush()
+
+    def write(self, content: str):
+        """
+        Writes the settings atomically: a temporary file in the same
+        directory is flushed to disk, then renamed over the settings.
+        Called with write_lock held.
+
+        Parameters
+        ----------
+        content: str
+            settings serialized.
+        """
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            print(f"settings: cannot write {self.path}: {e}")
+            return
+        with self.lock:
+            self.mtime = mtime
+
+    def flush(self):
+        """
+        Writes the pending save now, on the calling thread (e.g. on exit).
+        A write in progress on the writer thread is waited for first.
+        """
+        with self.write_lock:
+            with self.lock:
+                content = self.pending
+                self.pending = None
+            if content is not None:
+                self.write(content)
+
+
+# Settings of the game, shared by the whole process
+SETTINGS_SERVICE = SettingsService()
+
+
 def load_settings() -> dict:
     """
     Loads the settings.
@@ -37,28 +333,17 @@ def load_settings() -> dict:
     Returns
     -------
     dict
-        settings for the game and application.
+        settings for the game and application, cached by SETTINGS_SERVICE.
     """
-    SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    print(f"path: {SETTINGS_PATH}")
-    if SETTINGS_PATH.exists():
-        with SETTINGS_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        merged = DEFAULT_SETTINGS | data
-        return merged
-    else:
-        save_settings(DEFAULT_SETTINGS)
-        return DEFAULT_SETTINGS.copy()
+    return SETTINGS_SERVICE.load()
 
 def save_settings(settings: dict):
     """
-    Save the settings given.
+    Save the settings given, in the background.
 
     Parameters
     ----------
     settings: dict
         settings to be saved
     """
-    SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with SETTINGS_PATH.open("w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
+    SETTINGS_SERVICE.save(settings)
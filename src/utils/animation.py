@@ -0,0 +1,103 @@
+# Duration of a frame at the frame rate the animations were drawn for,
+# used when the elapsed time is not known
+FRAME_DURATION = 1 / 60
+# Tolerance on the duration, so that summing frames does not add one
+TIME_EPSILON = 1e-9
+
+
+class Animation:
+    """
+    Animation driven by the elapsed time: at every step it reports
+    its progress, from 0 to 1, to the animated object.
+    """
+    def __init__(self, duration: float, step, on_finish=None):
+        """
+        Initialise the animation.
+
+        Parameters
+        ----------
+        duration: float
+            seconds from the start to the end.
+        step: Callable[[float], None]
+            called with the progress at every advance.
+        on_finish: Callable[[], None] | None
+            called once the animation ends.
+        """
+        self.duration = duration
+        self.step = step
+        self.on_finish = on_finish
+        self.elapsed = 0.0
+
+    def advance(self, seconds: float) -> bool:
+        """
+        Moves the animation forward.
+
+        Parameters
+        ----------
+        seconds: float
+            time elapsed since the last advance.
+
+        Returns
+        -------
+        bool
+            True if the animation ended.
+        """
+        self.elapsed += seconds
+        if self.elapsed + TIME_EPSILON >= self.duration:
+            self.step(1.0)
+            if self.on_finish is not None:
+                self.on_finish()
+            return True
+        self.step(self.elapsed / self.duration)
+        return False
+
+
+class Timeline:
+    """
+    Owns the running animations of a group of widgets and advances
+    them by the elapsed time, dropping the finished ones.
+    Widgets without a running animation are never visited.
+    """
+    def __init__(self):
+        self.animations = []
+
+    def play(self, animation: Animation):
+        """
+        Starts an animation, from the beginning if it was running.
+
+        Parameters
+        ----------
+        animation: Animation
+            the animation to start.
+        """
+        animation.elapsed = 0.0
+        if animation not in self.animations:
+            self.animations.append(animation)
+
+    def stop(self, animation: Animation):
+        """
+        Stops an animation where it is, without finishing it.
+
+        Parameters
+        ----------
+        animation: Animation
+            the animation to stop.
+        """
+        if animation in self.animations:
+            self.animations.remove(animation)
+
+    def advance(self, seconds: float = FRAME_DURATION):
+        """
+        Advances every running animation.
+
+        Parameters
+        ----------
+        seconds: float
+            time elapsed since the last advance.
+        """
+        if self.animations:
+            self.animations = [animation for animation in self.animations
+                if not animation.advance(seconds)]
+
+    def __bool__(self) -> bool:
+        return bool(self.animations)
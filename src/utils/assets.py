@@ -0,0 +1,72 @@
+import io
+import zipfile
+import zipimport
+from pathlib import Path
+import src
+
+
+def find_archive() -> Path | None:
+    """
+    Returns
+    -------
+    Path | None
+        the zipapp the game is imported from,
+        None if it runs from the source tree.
+    """
+    loader = src.__spec__.loader
+    if isinstance(loader, zipimport.zipimporter):
+        return Path(loader.archive)
+    return None
+
+
+# Root of the source tree, where the assets are when not zipped
+ROOT_PATH = Path(__file__).parent.parent.parent
+# Zipapp holding the code and the assets, None from the source tree
+ARCHIVE_PATH = find_archive()
+ARCHIVE = zipfile.ZipFile(ARCHIVE_PATH) if ARCHIVE_PATH is not None else None
+# Directory of the files written by the game (config, profile):
+# the repository, or the directory of the zipapp
+DATA_PATH = ARCHIVE_PATH.parent if ARCHIVE_PATH is not None else ROOT_PATH
+
+
+def asset(path: str) -> str | io.BytesIO:
+    """
+    Opens an asset for pygame, which loads images, fonts and sounds
+    from paths as well as from file objects.
+
+    Parameters
+    ----------
+    path: str
+        path of the asset, relative to the repository (e.g. 'assets/graphics/ball.png').
+
+    Returns
+    -------
+    str | io.BytesIO
+        the path in the source tree, whatever the working directory,
+        the content read from the zipapp otherwise, without extracting
+        it to disk.
+    """
+    if ARCHIVE is None:
+        return str(ROOT_PATH / path)
+    return io.BytesIO(ARCHIVE.read(path))
+
+
+def list_assets(directory: str) -> list[str]:
+    """
+    Lists the files of an assets directory.
+
+    Parameters
+    ----------
+    directory: str
+        path of the directory, relative to the repository.
+
+    Returns
+    -------
+    list[str]
+        names of the files in the directory.
+    """
+    if ARCHIVE is None:
+        return [path.name for path in (ROOT_PATH / directory).iterdir() if path.is_file()]
+    prefix = directory.rstrip("/") + "/"
+    return [name[len(prefix):] for name in ARCHIVE.namelist()
+        if name.startswith(prefix) and "/" not in name[len(prefix):] and name != prefix]
@@ -0,0 +1,104 @@
+import pygame
+from src.utils.surface_pool import SCRATCH
+
+# Quality presets: factor by which the surface is downsampled before
+# blurring, None draws the backdrops unblurred
+BLUR_PRESETS = {
+    "off": None,
+    "low": 8,
+    "high": 4,
+}
+DEFAULT_PRESET = "high"
+
+# Preset used by blur, set from the settings by configure
+current_preset = DEFAULT_PRESET
+
+
+def configure(preset: str):
+    """
+    Selects the quality of every blur.
+
+    Parameters
+    ----------
+    preset: str
+        one of BLUR_PRESETS.
+    """
+    global current_preset
+    if preset not in BLUR_PRESETS:
+        raise ValueError(f"unknown blur preset {preset!r}, expected one of {list(BLUR_PRESETS)}")
+    current_preset = preset
+
+
+def blur(surface: pygame.Surface, radius: int, preset: str | None = None,
+        dest: pygame.Surface | None = None) -> pygame.Surface:
+    """
+    Approximates pygame.transform.box_blur(surface, radius) at a fraction
+    of its cost: the surface is downsampled, blurred at the low resolution
+    with the scaled down radius and upsampled back to its size.
+    The downsampling averages the pixels it merges and the upsampling
+    interpolates them, so both smooth the result like the passes of a
+    dual filter blur.
+    The low resolution surfaces come from the scratch pool, so with a
+    destination the blur allocates no surface; the destination can be
+    the blurred surface itself.
+
+    Parameters
+    ----------
+    surface: pygame.Surface
+        surface to blur, 24 or 32 bits.
+    radius: int
+        radius of the box blur approximated.
+    preset: str | None
+        one of BLUR_PRESETS, the configured one by default.
+    dest: pygame.Surface | None
+        surface of the same size receiving the result,
+        a new surface if None.
+
+    Returns
+    -------
+    pygame.Surface
+        the blurred surface, unblurred if the blur is off.
+    """
+    factor = BLUR_PRESETS[preset or current_preset]
+    if factor is None:
+        if dest is None:
+            return surface.copy()
+        if dest is not surface:
+            dest.blit(surface, (0, 0))
+        return dest
+    width, height = surface.get_size()
+    small_size = (max(width // factor, 1), max(height // factor, 1))
+    small = pygame.transform.smoothscale(surface, small_size, SCRATCH.get(small_size, surface))
+    small_radius = round(radius / factor)
+    if small_radius > 0:
+        small = pygame.transform.box_blur(small, small_radius,
+            dest_surface=SCRATCH.get(small_size, surface, slot=1))
+    if dest is None:
+        return pygame.transform.smoothscale(small, (width, height))
+    return pygame.transform.smoothscale(small, (width, height), dest)
+
+
+def blur_difference(surface: pygame.Surface, radius: int, preset: str) -> float:
+    """
+    Mean absolute difference, per colour channel, between blur
+    and box_blur over the same surface.
+
+    Parameters
+    ----------
+    surface: pygame.Surface
+        surface to blur.
+    radius: int
+        radius of the blur.
+    preset: str
+        one of BLUR_PRESETS.
+
+    Returns
+    -------
+    float
+        the difference, from 0 to 255.
+    """
+    # numpy is only needed by the benchmarks
+    import numpy as np
+    reference = pygame.surfarray.pixels3d(pygame.transform.box_blur(surface, radius))
+    approximation = pygame.surfarray.pixels3d(blur(surface, radius, preset))
+    return float(np.abs(reference.astype(np.int16) - approximation).mean())
@@ -1,5 +1,8 @@
 FILE_NAME_SEPARATOR = "_"
 
+# Size of the canvas where the game is drawn, independent of the window size
+LOGICAL_RESOLUTION = (800, 500)
+
 # KEYBINDINGS
 UP="up"
 DOWN="down"
@@ -0,0 +1,97 @@
+import time
+import pygame
+from src.utils.constants import LOGICAL_RESOLUTION
+
+# Ways to bring the logical canvas to the window
+SOFTWARE_SCALING = "software"
+SCALED_RENDERER = "scaled"
+
+
+class Display:
+    """
+    Owns the window and the logical canvas where the game is drawn.
+    The canvas has always the LOGICAL_RESOLUTION, so the hard-coded
+    positions of the entities do not depend on the window size.
+    The canvas is brought to the window once per frame, either by a
+    software scale or by the SDL SCALED renderer.
+    """
+    def __init__(self, settings: dict):
+        """
+        Opens the window.
+
+        Parameters
+        ----------
+        settings: dict
+            settings of the game. Uses the keys resolution,
+            fullscreen, scaling and vsync.
+        """
+        flags = pygame.FULLSCREEN if settings["fullscreen"] else 0
+        # vsync is only available with the SCALED or OPENGL renderers
+        self.is_scaled_renderer = (settings["scaling"] == SCALED_RENDERER
+            or settings["vsync"])
+        if self.is_scaled_renderer:
+            self.window = pygame.display.set_mode(LOGICAL_RESOLUTION,
+                flags | pygame.SCALED, vsync=int(settings["vsync"]))
+        else:
+            self.window = pygame.display.set_mode(settings["resolution"], flags)
+        if self.window.get_size() == LOGICAL_RESOLUTION:
+            self.canvas = self.window
+        else:
+            self.canvas = pygame.Surface(LOGICAL_RESOLUTION).convert()
+        self.scale_time = 0
+        self.scale_count = 0
+
+    def to_logical(self, position: tuple) -> tuple:
+        """
+        Converts a window position into a canvas position.
+
+        Parameters
+        ----------
+        position: tuple
+            position on the window.
+
+        Returns
+        -------
+        tuple
+            position on the logical canvas.
+        """
+        if self.canvas is self.window:
+            return position
+        width, height = self.window.get_size()
+        return (position[0] * LOGICAL_RESOLUTION[0] // width,
+            position[1] * LOGICAL_RESOLUTION[1] // height)
+
+    def mouse_position(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            position of the mouse pointer on the logical canvas.
+        """
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def present(self):
+        """
+        Scales the canvas to the window, if needed, and updates
+        the display.
+        """
+        if self.canvas is not self.window:
+            start = time.perf_counter()
+            pygame.transform.scale(self.canvas, self.window.get_size(), self.window)
+            self.scale_time += time.perf_counter() - start
+            self.scale_count += 1
+        pygame.display.update()
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the average cost of the software scaling.
+        """
+        if self.is_scaled_renderer:
+            return "scaling: SDL SCALED renderer"
+        if self.scale_count == 0:
+            return "scaling: none, window at logical resolution"
+        return (f"scaling to {self.window.get_size()}: "
+            f"{self.scale_time / self.scale_count * 1000:.3f} ms per frame")
@@ -0,0 +1,172 @@
+import time
+
+# Frame rates selectable from the settings, 0 means uncapped
+FRAME_RATES = [30, 60, 120, 144, 0]
+# Seconds before the deadline where sleeping is replaced by busy waiting
+BUSY_WAIT_TAIL = 0.002
+# Seconds slept between two calls of the wait callback (e.g. input polling)
+WAIT_SLICE = 0.004
+# Width of a histogram bin and number of bins, in milliseconds
+HISTOGRAM_BIN_MS = 0.1
+HISTOGRAM_BINS = 1000
+
+
+class FramePacer:
+    """
+    Keeps the game loop at the target frame rate.
+    Sleeps for most of the remaining frame time and busy waits the last
+    part, which is more precise than pygame.time.Clock.tick.
+    Frame times and jitter are recorded in fixed size histograms.
+    """
+    def __init__(self, target_fps: int, on_wait=None):
+        """
+        Initialise the frame pacer.
+
+        Parameters
+        ----------
+        target_fps: int
+            frames per second to keep, 0 for uncapped.
+        on_wait: Callable[[], None] | None
+            called every WAIT_SLICE seconds while the pacer sleeps.
+        """
+        self.on_wait = on_wait
+        self.set_target_fps(target_fps)
+        self.frame_times = FrameHistogram()
+        self.jitters = FrameHistogram()
+        self.reset()
+
+    def set_target_fps(self, target_fps: int):
+        """
+        Changes the target frame rate.
+
+        Parameters
+        ----------
+        target_fps: int
+            frames per second to keep, 0 for uncapped.
+        """
+        self.target_fps = target_fps
+        self.period = 1 / target_fps if target_fps > 0 else 0
+
+    def reset(self):
+        """
+        Restarts the pacing from now, without recording the elapsed time.
+        Used after the loop was blocked on purpose (e.g. idle mode).
+        """
+        self.last_frame = time.perf_counter()
+        self.deadline = self.last_frame + self.period
+        self.last_frame_time = self.period
+
+    def tick(self) -> float:
+        """
+        Waits until the end of the current frame.
+
+        Returns
+        -------
+        float
+            duration of the frame in seconds.
+        """
+        if self.period > 0:
+            remaining = self.deadline - time.perf_counter()
+            if remaining > BUSY_WAIT_TAIL:
+                self.sleep(remaining - BUSY_WAIT_TAIL)
+            while time.perf_counter() < self.deadline:
+                pass
+        now = time.perf_counter()
+        frame_time = now - self.last_frame
+        self.record(frame_time)
+        self.last_frame = now
+        # a late frame does not make the following ones run faster
+        self.deadline = max(self.deadline + self.period, now)
+        return frame_time
+
+    def sleep(self, seconds: float):
+        """
+        Sleeps, calling on_wait between slices of the sleep.
+
+        Parameters
+        ----------
+        seconds: float
+            duration of the sleep.
+        """
+        if self.on_wait is None:
+            time.sleep(seconds)
+            return
+        end = time.perf_counter() + seconds
+        while (left := end - time.perf_counter()) > 0:
+            self.on_wait()
+            time.sleep(min(left, WAIT_SLICE))
+
+    def record(self, frame_time: float):
+        """
+        Adds the frame time and its jitter to the histograms.
+        The jitter is the distance from the target period or,
+        if uncapped, from the previous frame time.
+
+        Parameters
+        ----------
+        frame_time: float
+            duration of the frame in seconds.
+        """
+        expected = self.period if self.period > 0 else self.last_frame_time
+        self.frame_times.add(frame_time * 1000)
+        self.jitters.add(abs(frame_time - expected) * 1000)
+        self.last_frame_time = frame_time
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the frame time and jitter percentiles, in milliseconds.
+        """
+        target = f"{self.target_fps} fps" if self.target_fps > 0 else "uncapped"
+        return (f"target: {target} - frames: {self.frame_times.count}\n"
+            f"frame time p50: {self.frame_times.percentile(50):.2f} ms"
+            f" - p99: {self.frame_times.percentile(99):.2f} ms\n"
+            f"jitter p50: {self.jitters.percentile(50):.2f} ms"
+            f" - p99: {self.jitters.percentile(99):.2f} ms")
+
+
+class FrameHistogram:
+    """
+    Histogram of durations in milliseconds with fixed width bins.
+    The last bin collects every duration over the range.
+    """
+    def __init__(self):
+        self.bins = [0] * HISTOGRAM_BINS
+        self.count = 0
+
+    def add(self, milliseconds: float):
+        """
+        Adds a duration to the histogram.
+
+        Parameters
+        ----------
+        milliseconds: float
+            duration to add.
+        """
+        self.bins[min(int(milliseconds / HISTOGRAM_BIN_MS), HISTOGRAM_BINS - 1)] += 1
+        self.count += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Parameters
+        ----------
+        percent: float
+            percentile to compute, between 0 and 100.
+
+        Returns
+        -------
+        float
+            upper bound of the bin containing the percentile,
+            in milliseconds.
+        """
+        if self.count == 0:
+            return 0
+        threshold = self.count * percent / 100
+        total = 0
+        for i in range(HISTOGRAM_BINS):
+            total += self.bins[i]
+            if total >= threshold:
+                return (i + 1) * HISTOGRAM_BIN_MS
+        return HISTOGRAM_BINS * HISTOGRAM_BIN_MS
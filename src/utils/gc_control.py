@@ -0,0 +1,166 @@
+import gc
+import time
+from src.utils.frame_pacer import FrameHistogram
+
+# GC pauses longer than this are reported with their frame, in milliseconds
+LONG_PAUSE_MS = 2
+# Long pauses kept for the report, the oldest are dropped
+LONG_PAUSES_KEPT = 100
+# Tracked allocations over the generation 0 threshold after which a
+# deferred collection runs even far from an idle point
+MAX_DEFERRED_FACTOR = 100
+
+
+class GCControl:
+    """
+    Instruments the garbage collector and, if deferring, moves the
+    cyclic collections to the idle points of the game.
+    Through gc.callbacks every collection is timed and tied to the frame
+    it hit; the tracked allocations (container objects created minus
+    the ones freed) are counted per frame.
+    Deferring freezes the objects alive after startup, so the
+    collections never walk the assets and the menus again, and disables
+    the automatic collections: they run at the end of the frames where
+    the game can afford a pause (menus, pause, between points).
+    """
+    def __init__(self, defer: bool):
+        """
+        Initialise the instrumentation.
+
+        Parameters
+        ----------
+        defer: bool
+            True to run the collections only at idle points.
+        """
+        self.defer = defer
+        self.frame = 0
+        self.frame_status = None
+        self.pauses = FrameHistogram()
+        self.long_pauses = []
+        self.collections = [0, 0, 0]
+        self.collection_start = 0
+        self.frame_allocations = 0
+        self.frame_start_count = gc.get_count()[0]
+        self.total_allocations = 0
+        self.max_allocations = 0
+        self.frames = 0
+        self.deferred_frames = 0
+
+    def on_collection(self, phase: str, info: dict):
+        """
+        Callback of the garbage collector, times the collection.
+
+        Parameters
+        ----------
+        phase: str
+            "start" or "stop".
+        info: dict
+            generation collected, collected and uncollectable objects.
+        """
+        if phase == "start":
+            # the count of generation 0 restarts from 0 after the collection
+            self.frame_allocations += gc.get_count()[0] - self.frame_start_count
+            self.frame_start_count = 0
+            self.collection_start = time.perf_counter()
+            return
+        milliseconds = (time.perf_counter() - self.collection_start) * 1000
+        generation = info["generation"]
+        self.collections[generation] += 1
+        self.pauses.add(milliseconds)
+        if milliseconds > LONG_PAUSE_MS:
+            self.long_pauses.append((self.frame, self.frame_status, generation, milliseconds))
+            del self.long_pauses[:-LONG_PAUSES_KEPT]
+
+    def start(self):
+        """
+        Starts recording the collections. If deferring, first collects
+        once, moves every object alive to the permanent generation and
+        disables the automatic collections.
+        Called when the startup is over.
+        """
+        if self.defer:
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+        self.frame_start_count = gc.get_count()[0]
+        gc.callbacks.append(self.on_collection)
+
+    def end_frame(self, status: int, is_idle_point: bool):
+        """
+        Closes the allocation count of the frame and, if deferring,
+        runs the collections that are due.
+
+        Parameters
+        ----------
+        status: int
+            game status of the frame.
+        is_idle_point: bool
+            True if a pause would not be noticed (menus, pause,
+            between points).
+        """
+        self.frame_status = status
+        count = gc.get_count()[0]
+        allocations = self.frame_allocations + count - self.frame_start_count
+        self.total_allocations += allocations
+        self.max_allocations = max(self.max_allocations, allocations)
+        self.frames += 1
+        if self.defer:
+            self.collect_deferred(is_idle_point)
+        self.frame += 1
+        self.frame_allocations = 0
+        self.frame_start_count = gc.get_count()[0]
+
+    def collect_deferred(self, is_idle_point: bool):
+        """
+        Collects the oldest generation over its threshold, as the
+        automatic collection would, if the frame is an idle point or
+        too many allocations were deferred.
+
+        Parameters
+        ----------
+        is_idle_point: bool
+            True if a pause would not be noticed.
+        """
+        counts = gc.get_count()
+        thresholds = gc.get_threshold()
+        if counts[0] <= thresholds[0]:
+            return
+        if not is_idle_point:
+            self.deferred_frames += 1
+            if counts[0] <= thresholds[0] * MAX_DEFERRED_FACTOR:
+                return
+        generation = 0
+        for i in (2, 1):
+            if counts[i] > thresholds[i]:
+                generation = i
+                break
+        gc.collect(generation)
+
+    def close(self):
+        """
+        Removes the callback and restores the automatic collections.
+        """
+        if self.on_collection in gc.callbacks:
+            gc.callbacks.remove(self.on_collection)
+        if self.defer:
+            gc.enable()
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the collections, their pauses, the tracked allocations per
+            frame and the frames hit by the long pauses.
+        """
+        mean = self.total_allocations / self.frames if self.frames else 0
+        lines = [f"gc ({'deferred to idle points' if self.defer else 'automatic'}): "
+            f"collections per generation {self.collections}"
+            f" - pause p50: {self.pauses.percentile(50):.2f} ms"
+            f" - p99: {self.pauses.percentile(99):.2f} ms",
+            f"tracked allocations per frame: mean {mean:.1f} - max {self.max_allocations}"
+            f" - frames deferring a collection: {self.deferred_frames}"]
+        for frame, status, generation, milliseconds in self.long_pauses:
+            lines.append(f"gc pause of {milliseconds:.2f} ms (generation {generation})"
+                f" at frame {frame}, status {status}")
+        return "\n".join(lines)
@@ -0,0 +1,18 @@
+import os
+from src.utils.assets import ROOT_PATH
+
+
+def init_headless():
+    """
+    Initialises pygame with the SDL dummy drivers.
+    Used by the simulations and the benchmarks, which run without a window;
+    the working directory of the caller is left as it is.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from src.utils.startup import init_pygame
+    init_pygame()
+    if pygame.display.get_surface() is None:
+        # images are converted to the display format, so one is needed
+        pygame.display.set_mode((1, 1))
@@ -0,0 +1,25 @@
+import pygame
+from src.utils.assets import asset
+
+# Images already loaded, by path
+IMAGES = {}
+
+
+def load_image(path: str) -> pygame.Surface:
+    """
+    Loads an image with alpha once, every entity using it shares
+    the same surface, so the images must not be modified.
+
+    Parameters
+    ----------
+    path: str
+        path of the image.
+
+    Returns
+    -------
+    pygame.Surface
+        the image, converted to the display format.
+    """
+    if path not in IMAGES:
+        IMAGES[path] = pygame.image.load(asset(path)).convert_alpha()
+    return IMAGES[path]
@@ -0,0 +1,143 @@
+import time
+import pygame
+from src.utils.frame_pacer import FrameHistogram
+
+# Events that leave the window without keyboard, the held keys are released
+FOCUS_LOST_EVENTS = (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED)
+
+
+class InputQueue:
+    """
+    Events of the game, stamped when they leave SDL's queue.
+    pygame does not expose the timestamps of SDL, so the queue is drained
+    while the frame pacer waits as well as at the start of the frame:
+    a key press is stamped within a few milliseconds of its arrival
+    instead of at the next frame.
+    The key events of a frame are applied in order: the state of a key
+    is the one of its last event, and a key pressed and released within
+    the same frame still counts as pressed until the next update, which
+    may come a few frames later when the frame rate is above the tick rate.
+    The delay from every key press to the display update showing its
+    effect is recorded in a histogram.
+    """
+    def __init__(self):
+        self.events = []
+        self.stamps = []
+        # number of key presses so far, orders the presses stamped together
+        self.presses = 0
+        # keys held down, with the number of their press
+        self.held = {}
+        # keys pressed since the last update, even if already released
+        self.pressed = {}
+        # stamps of the key presses not shown on the display yet
+        self.unpresented = []
+        self.latencies = FrameHistogram()
+
+    def poll(self):
+        """
+        Moves the events waiting in SDL's queue to this queue, stamped now.
+        """
+        events = pygame.event.get()
+        if events:
+            now = time.perf_counter()
+            self.events.extend(events)
+            self.stamps.extend([now] * len(events))
+
+    def take(self, events: list[pygame.event.Event] | None = None) -> list[pygame.event.Event]:
+        """
+        Returns the events of the frame, in arrival order, and applies
+        the key events to the state of the keys.
+
+        Parameters
+        ----------
+        events: list[pygame.event.Event] | None
+            events already removed from SDL's queue (e.g. by a wait),
+            stamped now. If None, SDL's queue is drained.
+
+        Returns
+        -------
+        list[pygame.event.Event]
+            the events queued since the last frame.
+        """
+        if events is None:
+            self.poll()
+        elif events:
+            now = time.perf_counter()
+            self.events.extend(events)
+            self.stamps.extend([now] * len(events))
+        events, stamps = self.events, self.stamps
+        self.events, self.stamps = [], []
+        for event, stamp in zip(events, stamps):
+            if event.type == pygame.KEYDOWN:
+                self.presses += 1
+                self.held[event.key] = self.presses
+                self.pressed[event.key] = self.presses
+                self.unpresented.append(stamp)
+            elif event.type == pygame.KEYUP:
+                self.held.pop(event.key, None)
+            elif event.type in FOCUS_LOST_EVENTS:
+                self.held.clear()
+        return events
+
+    def updated(self):
+        """
+        Forgets the keys pressed, once an update has seen them.
+        """
+        self.pressed.clear()
+
+    def just_pressed(self, key: int) -> bool:
+        """
+        Returns
+        -------
+        bool
+            True if the key was pressed since the last update.
+        """
+        return key in self.pressed
+
+    def latest(self, keys: tuple) -> int | None:
+        """
+        Parameters
+        ----------
+        keys: tuple
+            keys competing for the same action (e.g. up and down).
+
+        Returns
+        -------
+        int | None
+            the key held or pressed since the last update that was
+            pressed last, None if there is none.
+        """
+        latest = None
+        latest_press = 0
+        for key in keys:
+            press = self.held.get(key, self.pressed.get(key))
+            if press is not None and press > latest_press:
+                latest, latest_press = key, press
+        return latest
+
+    def presented(self):
+        """
+        Records the latency of the key presses applied in the frame
+        just shown. To be called right after the display update.
+        """
+        if self.unpresented:
+            now = time.perf_counter()
+            for stamp in self.unpresented:
+                self.latencies.add((now - stamp) * 1000)
+            self.unpresented.clear()
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the percentiles of the latency from key press to display update.
+        """
+        return (f"input latency: {self.latencies.count} key presses"
+            f" - p50: {self.latencies.percentile(50):.1f} ms"
+            f" - p95: {self.latencies.percentile(95):.1f} ms"
+            f" - p99: {self.latencies.percentile(99):.1f} ms")
+
+
+# Input of the game, shared by the scenes and the players
+INPUT = InputQueue()
@@ -0,0 +1,199 @@
+import csv
+import json
+import time
+from array import array
+from functools import wraps
+from pathlib import Path
+import pygame
+from src.utils.assets import DATA_PATH, asset
+
+PROFILE_PATH = DATA_PATH / 'profile'
+# Number of frames kept for every section
+RING_SIZE = 240
+FRAME_SECTION = "frame"
+# Milliseconds corresponding to the full width of a bar
+OVERLAY_SCALE_MS = 1000 / 60
+OVERLAY_BAR_WIDTH = 160
+
+
+class Profiler:
+    """
+    Measures the time spent in the sections of the frame.
+    The sections are methods wrapped by instrument, so nothing is
+    measured (and nothing is paid) unless a profiler is installed.
+    The timings of the last RING_SIZE frames are kept in preallocated
+    ring buffers.
+    """
+    def __init__(self):
+        """
+        Initialise the profiler, without sections.
+        """
+        self.sections = [FRAME_SECTION]
+        self.samples = {FRAME_SECTION: array('d', bytes(8 * RING_SIZE))}
+        self.current = {FRAME_SECTION: 0.0}
+        self.originals = []
+        self.index = 0
+        self.frames = 0
+        self.last_frame = time.perf_counter()
+        self.overlay_visible = False
+        self.font = None
+
+    def instrument(self, owner, method_name: str, section: str):
+        """
+        Wraps the method of the owner so that its execution time
+        is added to the given section.
+
+        Parameters
+        ----------
+        owner: object
+            class or instance owning the method.
+        method_name: str
+            name of the method to measure.
+        section: str
+            name of the section.
+        """
+        method = getattr(owner, method_name)
+        current = self.current
+        if section not in current:
+            self.sections.append(section)
+            self.samples[section] = array('d', bytes(8 * RING_SIZE))
+            current[section] = 0.0
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[section] += time.perf_counter() - start
+
+        self.originals.append((owner, method_name, owner.__dict__.get(method_name)))
+        setattr(owner, method_name, timed)
+
+    def uninstall(self):
+        """
+        Restores the original methods.
+        """
+        for owner, method_name, original in reversed(self.originals):
+            if original is None:
+                delattr(owner, method_name)
+            else:
+                setattr(owner, method_name, original)
+        self.originals = []
+
+    def end_frame(self):
+        """
+        Stores the timings of the frame in the ring buffers
+        and starts a new frame.
+        """
+        now = time.perf_counter()
+        self.current[FRAME_SECTION] = now - self.last_frame
+        self.last_frame = now
+        for section in self.sections:
+            self.samples[section][self.index] = self.current[section]
+            self.current[section] = 0.0
+        self.index = (self.index + 1) % RING_SIZE
+        self.frames += 1
+
+    def skip_frame(self):
+        """
+        Starts a new frame without storing the current one.
+        Used when the loop was blocked on purpose (e.g. idle mode).
+        """
+        self.last_frame = time.perf_counter()
+
+    def history(self, section: str) -> list[float]:
+        """
+        Parameters
+        ----------
+        section: str
+            name of the section.
+
+        Returns
+        -------
+        list[float]
+            the stored timings of the section in milliseconds,
+            from the oldest to the newest frame.
+        """
+        samples = self.samples[section]
+        if self.frames < RING_SIZE:
+            ordered = samples[:self.frames]
+        else:
+            ordered = samples[self.index:] + samples[:self.index]
+        return [sample * 1000 for sample in ordered]
+
+    def average(self, section: str) -> float:
+        """
+        Parameters
+        ----------
+        section: str
+            name of the section.
+
+        Returns
+        -------
+        float
+            the average timing of the section in milliseconds.
+        """
+        stored = min(self.frames, RING_SIZE)
+        if stored == 0:
+            return 0
+        return sum(self.samples[section]) * 1000 / stored
+
+    def toggle_overlay(self):
+        """
+        Shows or hides the overlay.
+        """
+        self.overlay_visible = not self.overlay_visible
+
+    def render(self, surface: pygame.Surface):
+        """
+        If visible, draws the average timing of each section
+        as a bar graph over the given surface.
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            surface to be drawn over.
+        """
+        if not self.overlay_visible:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(asset("assets/fonts/Jersey15-Regular.ttf"), 18)
+        y_position = 110
+        for section in self.sections:
+            average = self.average(section)
+            width = min(int(average / OVERLAY_SCALE_MS * OVERLAY_BAR_WIDTH), OVERLAY_BAR_WIDTH)
+            pygame.draw.rect(surface, "Black", (10, y_position, OVERLAY_BAR_WIDTH, 14))
+            pygame.draw.rect(surface, "Red" if average > OVERLAY_SCALE_MS else "Green",
+                (10, y_position, width, 14))
+            text = self.font.render(f"{section}: {average:.2f} ms", False, "White")
+            surface.blit(text, (OVERLAY_BAR_WIDTH + 16, y_position - 2))
+            y_position += 18
+
+    def export(self, path: Path = PROFILE_PATH):
+        """
+        Writes the stored timings as CSV, one row per frame,
+        and a JSON summary with the statistics of every section.
+
+        Parameters
+        ----------
+        path: Path
+            directory where the files are written.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        histories = {section: self.history(section) for section in self.sections}
+        with (path / "frame_profile.csv").open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.sections)
+            writer.writerows(zip(*histories.values()))
+        summary = {}
+        for section, history in histories.items():
+            ordered = sorted(history)
+            summary[section] = {
+                "mean": sum(history) / len(history) if history else 0,
+                "p50": ordered[len(ordered) // 2] if ordered else 0,
+                "p95": ordered[int(len(ordered) * 0.95)] if ordered else 0,
+                "max": ordered[-1] if ordered else 0,
+            }
+        with (path / "frame_profile.json").open("w", encoding="utf-8") as f:
+            json.dump({"frames": self.frames, "sections": summary}, f, indent=2)
@@ -0,0 +1,302 @@
+"""
+Per-rally records of the matches, for the analysis of the game
+and of the simulations.
+
+Two tables are written, column by column:
+    - rallies: one row per finished rally.
+    - contacts: one row per hit of the ball (serve included),
+      linked to its rally by the rally column.
+The rows are buffered in arrays of CHUNK_ROWS rows; a full buffer is
+handed to a writer thread, which saves every column as an .npy file of
+the chunk directory. Loading a session is one np.load per column and chunk.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+import numpy as np
+from src.entities.scoreboard import ACE, SCORE, WIN
+from src.utils.assets import DATA_PATH
+
+# Directory of the sessions, one subdirectory each
+RALLIES_PATH = DATA_PATH / 'rallies'
+# Rows of a chunk, kept in memory until the chunk is written
+CHUNK_ROWS = 4096
+# Codes of the event column
+EVENTS = [ACE, SCORE, WIN]
+RALLIES = "rallies"
+CONTACTS = "contacts"
+# Columns of the tables and their types
+COLUMNS = {
+    RALLIES: {
+        "rally": np.int64,
+        "server": np.int8,
+        "scorer": np.int8,
+        "hits": np.int16,
+        # frames between the serve and the point
+        "frames": np.int32,
+        # index in EVENTS: ace, score or match won
+        "event": np.int8,
+        # player who won the set with the point, -1 if the set goes on
+        "set_winner": np.int8,
+    },
+    CONTACTS: {
+        "rally": np.int64,
+        # frame of the rally
+        "frame": np.int32,
+        "player": np.int8,
+        # paddle speeds in pixels per frame, positive downwards
+        "speed": np.int16,
+        "opponent_speed": np.int16,
+        # direction of the ball in radians, after adjust_direction
+        "direction": np.float32,
+    },
+}
+
+
+class Rally:
+    """
+    Rally in progress, kept by the match until its point.
+    """
+    def __init__(self, server: int):
+        """
+        Parameters
+        ----------
+        server: int
+            player who serves.
+        """
+        self.server = server
+        self.frames = 0
+        self.contacts = []
+
+    def contact(self, player: int, speed: int, opponent_speed: int, direction: float):
+        """
+        Records a hit of the ball.
+
+        Parameters
+        ----------
+        player: int
+            player who hit the ball.
+        speed: int
+            speed of the paddle of the player.
+        opponent_speed: int
+            speed of the other paddle.
+        direction: float
+            new direction of the ball.
+        """
+        self.contacts.append((self.frames, player, speed, opponent_speed, direction))
+
+
+class ColumnBuffer:
+    """
+    Rows of a table, stored in one array per column.
+    """
+    def __init__(self, columns: dict, rows: int):
+        """
+        Parameters
+        ----------
+        columns: dict
+            type of every column, by name.
+        rows: int
+            capacity of the buffer.
+        """
+        self.columns = columns
+        self.rows = rows
+        self.arrays = {name: np.empty(rows, dtype) for name, dtype in columns.items()}
+        self.count = 0
+
+    def append(self, row: tuple) -> bool:
+        """
+        Parameters
+        ----------
+        row: tuple
+            values of the row, in the order of the columns.
+
+        Returns
+        -------
+        bool
+            True if the buffer is full.
+        """
+        for array, value in zip(self.arrays.values(), row):
+            array[self.count] = value
+        self.count += 1
+        return self.count == self.rows
+
+    def take(self) -> dict:
+        """
+        Empties the buffer.
+
+        Returns
+        -------
+        dict
+            the arrays of the rows appended, by column.
+        """
+        arrays = {name: array[:self.count] for name, array in self.arrays.items()}
+        self.arrays = {name: np.empty(self.rows, dtype) for name, dtype in self.columns.items()}
+        self.count = 0
+        return arrays
+
+
+class RallyLog:
+    """
+    Collects the finished rallies of a session and writes them in chunks.
+    The frame thread only fills arrays: the files are written by a
+    background thread. A log is used by one process; close() writes the
+    last, partial chunks.
+    """
+    def __init__(self, path=None, chunk_rows: int = CHUNK_ROWS):
+        """
+        Parameters
+        ----------
+        path: Path | None
+            directory of the session. If None, a new directory
+            named after the current time in RALLIES_PATH.
+        chunk_rows: int
+            rows of every chunk.
+        """
+        if path is None:
+            path = RALLIES_PATH / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.path = path
+        self.rallies = ColumnBuffer(COLUMNS[RALLIES], chunk_rows)
+        self.contacts = ColumnBuffer(COLUMNS[CONTACTS], chunk_rows)
+        self.chunks = {RALLIES: 0, CONTACTS: 0}
+        self.count = 0
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, name="rally log writer", daemon=True)
+        self.writer.start()
+        self.closed = False
+        atexit.register(self.close)
+
+    def start(self, server: int) -> Rally:
+        """
+        Parameters
+        ----------
+        server: int
+            player who serves.
+
+        Returns
+        -------
+        Rally
+            the new rally, recorded once finished.
+        """
+        return Rally(server)
+
+    def finish(self, rally: Rally, scorer: int, set_winner: int, match_won: bool):
+        """
+        Records a finished rally and its contacts.
+
+        Parameters
+        ----------
+        rally: Rally
+            the rally.
+        scorer: int
+            player who won the point.
+        set_winner: int
+            player who won the set with the point, -1 if none.
+        match_won: bool
+            True if the point won the match.
+        """
+        hits = len(rally.contacts)
+        if match_won:
+            event = WIN
+        else:
+            event = ACE if hits == 1 else SCORE
+        index = self.count
+        self.count += 1
+        for contact in rally.contacts:
+            if self.contacts.append((index, *contact)):
+                self.flush(CONTACTS, self.contacts)
+        if self.rallies.append((index, rally.server, scorer, hits, rally.frames,
+            EVENTS.index(event), set_winner)):
+            self.flush(RALLIES, self.rallies)
+
+    def flush(self, table: str, buffer: ColumnBuffer):
+        """
+        Hands the rows of a buffer to the writer thread.
+
+        Parameters
+        ----------
+        table: str
+            RALLIES or CONTACTS.
+        buffer: ColumnBuffer
+            buffer of the table.
+        """
+        if buffer.count > 0:
+            self.queue.put((table, self.chunks[table], buffer.take()))
+            self.chunks[table] += 1
+
+    def write_loop(self):
+        """
+        Body of the writer thread: writes the chunks until close.
+        """
+        while (item := self.queue.get()) is not None:
+            table, chunk, arrays = item
+            write_chunk(self.path / table / f"chunk_{chunk:06d}", arrays)
+
+    def close(self):
+        """
+        Writes the rows left and waits for the writer thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.flush(RALLIES, self.rallies)
+        self.flush(CONTACTS, self.contacts)
+        self.queue.put(None)
+        self.writer.join()
+
+
+def write_chunk(path, arrays: dict):
+    """
+    Writes the columns of a chunk in a temporary directory renamed once
+    complete, so a chunk being written is never loaded.
+
+    Parameters
+    ----------
+    path: Path
+        directory of the chunk.
+    arrays: dict
+        array of every column, by name.
+    """
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(temporary / f"{name}.npy", array)
+    os.replace(temporary, path)
+
+
+def load_table(path, table: str) -> dict:
+    """
+    Loads a table of a session.
+
+    Parameters
+    ----------
+    path: Path
+        directory of the session.
+    table: str
+        RALLIES or CONTACTS.
+
+    Returns
+    -------
+    dict
+        the column arrays of every complete chunk, concatenated.
+    """
+    chunks = sorted(chunk for chunk in (path / table).glob("chunk_*") if chunk.suffix != ".tmp")
+    return {name: np.concatenate([np.load(chunk / f"{name}.npy") for chunk in chunks])
+        if chunks else np.empty(0, dtype) for name, dtype in COLUMNS[table].items()}
+
+
+def load_rallies(path) -> tuple[dict, dict]:
+    """
+    Parameters
+    ----------
+    path: Path
+        directory of the session.
+
+    Returns
+    -------
+    tuple[dict, dict]
+        the rallies and contacts tables, as column arrays by name.
+    """
+    return load_table(path, RALLIES), load_table(path, CONTACTS)
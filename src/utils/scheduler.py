@@ -0,0 +1,89 @@
+import heapq
+
+# Seconds of game time simulated by every update
+TICK_DURATION = 1 / 60
+# Tolerance on the due time, so that summing ticks does not delay a timer
+TIME_EPSILON = 1e-9
+
+
+class TimerHandle:
+    """
+    Handle of a scheduled callback, used to cancel it.
+    """
+    def __init__(self, time: float, callback):
+        """
+        Parameters
+        ----------
+        time: float
+            game time when the callback fires.
+        callback: Callable[[], None]
+            function to call.
+        """
+        self.time = time
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Prevents the callback from firing.
+        """
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Fires callbacks after delays of game time.
+    The time only moves when the owner advances it, so the timers stop
+    while the owner is not updated (e.g. paused) and fire at the same tick
+    in every run, whatever the frame rate.
+    The timers are kept in a heap ordered by time and then by scheduling
+    order; cancelled timers are discarded when they reach the top.
+    """
+    def __init__(self):
+        self.time = 0.0
+        self.timers = []
+        self.sequence = 0
+
+    def schedule(self, delay: float, callback) -> TimerHandle:
+        """
+        Schedules a callback.
+
+        Parameters
+        ----------
+        delay: float
+            seconds of game time before the callback fires.
+        callback: Callable[[], None]
+            function to call.
+
+        Returns
+        -------
+        TimerHandle
+            handle to cancel the callback.
+        """
+        handle = TimerHandle(self.time + delay, callback)
+        heapq.heappush(self.timers, (handle.time, self.sequence, handle))
+        self.sequence += 1
+        return handle
+
+    def advance(self, seconds: float = TICK_DURATION):
+        """
+        Moves the game time forward, firing the callbacks that are due.
+
+        Parameters
+        ----------
+        seconds: float
+            game time elapsed.
+        """
+        self.time += seconds
+        while self.timers and self.timers[0][0] <= self.time + TIME_EPSILON:
+            handle = heapq.heappop(self.timers)[2]
+            if not handle.cancelled:
+                handle.callback()
+
+    def clear(self):
+        """
+        Cancels every timer.
+        """
+        for timer in self.timers:
+            timer[2].cancel()
+        self.timers = []
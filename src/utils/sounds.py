@@ -0,0 +1,96 @@
+import pygame
+from src.utils.assets import asset
+
+# Sounds already requested, by path
+SOUNDS = {}
+# False once the mixer failed to start, the sounds are then silent
+mixer_available = True
+
+
+class LazySound:
+    """
+    Sound loaded the first time it is played, unless preloaded before.
+    The mixer is started by the first sound loaded, so a game that is
+    never heard (or not yet) pays neither the audio device nor the
+    decoding of the files at startup.
+    """
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path: str
+            path of the sound file.
+        """
+        self.path = path
+        self.sound = None
+
+    def load(self) -> bool:
+        """
+        Starts the mixer and decodes the file, if not done yet.
+
+        Returns
+        -------
+        bool
+            True if the sound can be played
+            False otherwise (e.g. no audio device).
+        """
+        if self.sound is None and init_mixer():
+            self.sound = pygame.mixer.Sound(asset(self.path))
+        return self.sound is not None
+
+    def play(self):
+        """
+        Plays the sound, loading it if needed.
+        Without an audio device the sound stays silent.
+        """
+        if self.load():
+            self.sound.play()
+
+
+def init_mixer() -> bool:
+    """
+    Starts the mixer, once.
+
+    Returns
+    -------
+    bool
+        True if the mixer is available
+        False otherwise (e.g. no audio device).
+    """
+    global mixer_available
+    if mixer_available and not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            mixer_available = False
+    return mixer_available
+
+
+def load_sound(path: str) -> LazySound:
+    """
+    Returns the sound of the given path, shared by everyone requesting it.
+
+    Parameters
+    ----------
+    path: str
+        path of the sound file.
+
+    Returns
+    -------
+    LazySound
+        the sound, loaded when first played.
+    """
+    if path not in SOUNDS:
+        SOUNDS[path] = LazySound(path)
+    return SOUNDS[path]
+
+
+def preload_sounds():
+    """
+    Loads every sound requested so far, so that none is decoded when
+    first played. To be called where a pause goes unnoticed
+    (e.g. before the serve), not during the rallies.
+    """
+    for sound in SOUNDS.values():
+        if not sound.load():
+            return
@@ -0,0 +1,12 @@
+import pygame
+
+
+def init_pygame():
+    """
+    Starts only the SDL subsystems the game uses, instead of every one
+    as pygame.init does (joystick, camera, ...): the display, which also
+    brings the events, the keyboard and the mouse, and the fonts.
+    The mixer is started by the first sound played (see src.utils.sounds).
+    """
+    pygame.display.init()
+    pygame.font.init()
@@ -0,0 +1,61 @@
+import pygame
+
+
+class SurfacePool:
+    """
+    Scratch surfaces allocated once and reused at every frame.
+    A scratch surface is identified by its size, the format of the
+    surface it is made like and a slot, so that a transform needing
+    two surfaces of the same size asks for two slots.
+    The content of a scratch surface is only valid until the next
+    request of the same key: callers write it, draw it and forget it.
+    """
+    def __init__(self):
+        self.surfaces = {}
+        self.requests = 0
+        self.allocations = 0
+        self.allocated_bytes = 0
+
+    def get(self, size: tuple, like: pygame.Surface, slot: int = 0) -> pygame.Surface:
+        """
+        Returns the scratch surface of the given key, allocating it
+        the first time.
+
+        Parameters
+        ----------
+        size: tuple
+            width and height of the surface.
+        like: pygame.Surface
+            surface whose pixel format and per pixel alpha are copied.
+        slot: int
+            index distinguishing surfaces of the same size and format.
+
+        Returns
+        -------
+        pygame.Surface
+            the scratch surface, with undefined content.
+        """
+        flags = like.get_flags() & pygame.SRCALPHA
+        key = (tuple(size), flags, like.get_bitsize(), like.get_masks(), slot)
+        self.requests += 1
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, flags, like)
+            self.surfaces[key] = surface
+            self.allocations += 1
+            self.allocated_bytes += surface.get_pitch() * surface.get_height()
+        return surface
+
+    def report(self) -> str:
+        """
+        Returns
+        -------
+        str
+            the surfaces allocated against the requests served.
+        """
+        return (f"scratch surfaces: {self.allocations} allocated "
+            f"({self.allocated_bytes / 1024:.0f} KiB) for {self.requests} requests")
+
+
+# Pool shared by the transforms of every entity
+SCRATCH = SurfacePool()
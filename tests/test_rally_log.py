@@ -0,0 +1,74 @@
+import numpy as np
+from src.utils.rally_log import CONTACTS, EVENTS, RALLIES, RallyLog, load_rallies
+from src.entities.scoreboard import ACE, SCORE, WIN
+
+# Rows of a chunk, small so that the rallies span several chunks
+CHUNK_ROWS = 3
+
+
+def play(rally_log: RallyLog, count: int) -> list[tuple]:
+    """
+    Records rallies of 1 to 3 hits, the last one winning the match.
+
+    Returns
+    -------
+    list[tuple]
+        (server, hits, frames, event) of every rally.
+    """
+    expected = []
+    for index in range(count):
+        server = index % 2
+        rally = rally_log.start(server)
+        hits = index % 3 + 1
+        for hit in range(hits):
+            rally.contact((server + hit) % 2, hit, -hit, hit / 10)
+            rally.frames += 10
+        match_won = index == count - 1
+        rally_log.finish(rally, 1 - server, -1, match_won)
+        event = WIN if match_won else ACE if hits == 1 else SCORE
+        expected.append((server, hits, rally.frames, event))
+    return expected
+
+
+def test_round_trip_with_partial_last_chunk(tmp_path):
+    rally_log = RallyLog(tmp_path, CHUNK_ROWS)
+    expected = play(rally_log, 7)
+    rally_log.close()
+
+    # 7 rallies and 14 contacts: the last chunk of both tables is partial
+    assert len(list((tmp_path / RALLIES).iterdir())) == 3
+    assert len(list((tmp_path / CONTACTS).iterdir())) == 5
+    rallies, contacts = load_rallies(tmp_path)
+    np.testing.assert_array_equal(rallies["rally"], np.arange(7))
+    np.testing.assert_array_equal(rallies["server"], [server for server, _, _, _ in expected])
+    np.testing.assert_array_equal(rallies["scorer"], [1 - server for server, _, _, _ in expected])
+    np.testing.assert_array_equal(rallies["hits"], [hits for _, hits, _, _ in expected])
+    np.testing.assert_array_equal(rallies["frames"], [frames for _, _, frames, _ in expected])
+    np.testing.assert_array_equal(rallies["event"], [EVENTS.index(event) for _, _, _, event in expected])
+    np.testing.assert_array_equal(rallies["set_winner"], -1)
+    # every contact belongs to its rally, in order
+    np.testing.assert_array_equal(np.bincount(contacts["rally"]), rallies["hits"])
+    np.testing.assert_array_equal(contacts["frame"][:3], [0, 0, 10])
+    np.testing.assert_array_equal(contacts["speed"][:3], [0, 0, 1])
+    np.testing.assert_array_equal(contacts["opponent_speed"][:3], [0, 0, -1])
+    np.testing.assert_allclose(contacts["direction"][:3], [0, 0, 0.1])
+    assert contacts["direction"].dtype == np.float32
+
+
+def test_incomplete_chunks_are_not_loaded(tmp_path):
+    rally_log = RallyLog(tmp_path, CHUNK_ROWS)
+    play(rally_log, 3)
+    rally_log.close()
+    (tmp_path / RALLIES / "chunk_000001.tmp").mkdir()
+
+    rallies, _ = load_rallies(tmp_path)
+    assert len(rallies["rally"]) == 3
+
+
+def test_empty_session(tmp_path):
+    rally_log = RallyLog(tmp_path, CHUNK_ROWS)
+    rally_log.close()
+
+    rallies, contacts = load_rallies(tmp_path)
+    assert len(rallies["rally"]) == 0 and len(contacts["rally"]) == 0
+    assert rallies["event"].dtype == np.int8